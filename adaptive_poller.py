@@ -0,0 +1,89 @@
+# adaptive_poller.py
+
+"""
+재난문자 폴링 주기를 상황에 맞게 조절합니다.
+
+- 새 메시지가 들어오면 주기를 최소값으로 줄여 연속으로 들어오는 메시지를 빠르게 잡고,
+- 조용하면 폴링할 때마다 backoff 배수만큼 늘려 최대값까지 부하를 줄입니다.
+
+현재 주기와 탐지 지연(발송 시각 → 수집 시각)을 metrics() 로 확인할 수 있습니다.
+"""
+import os
+import time
+import threading
+from datetime import datetime, timezone, timedelta
+
+POLL_MIN_INTERVAL = int(os.getenv("POLL_MIN_INTERVAL", "10"))
+POLL_MAX_INTERVAL = int(os.getenv("POLL_MAX_INTERVAL", "600"))
+POLL_BACKOFF = float(os.getenv("POLL_BACKOFF", "2.0"))
+
+KST = timezone(timedelta(hours=9))
+
+
+class AdaptivePoller:
+    def __init__(self, min_interval: int = POLL_MIN_INTERVAL, max_interval: int = POLL_MAX_INTERVAL,
+                 backoff: float = POLL_BACKOFF):
+        self._lock = threading.Lock()
+        self.set_bounds(min_interval, max_interval)
+        self.backoff = max(backoff, 1.0)
+        self.interval = self.min_interval
+
+        self.polls = 0
+        self.quiet_streak = 0
+        self.last_poll_at = None
+        self.last_new_at = None
+        self.last_latency = None
+        self.max_latency = None
+        self._latency_sum = 0.0
+        self._latency_count = 0
+
+    def set_bounds(self, min_interval: int, max_interval: int):
+        with self._lock:
+            self.min_interval = max(int(min_interval), 1)
+            self.max_interval = max(int(max_interval), self.min_interval)
+            if hasattr(self, "interval"):
+                self.interval = min(max(self.interval, self.min_interval), self.max_interval)
+
+    def record(self, issued_times: list) -> int:
+        """
+        한 번의 폴링 결과를 반영하고 다음 폴링 주기(초)를 반환합니다.
+        issued_times: 이번 폴링에서 새로 수집한 메시지의 발송 시각(KST naive datetime) 목록
+        """
+        now = time.time()
+        with self._lock:
+            self.polls += 1
+            self.last_poll_at = now
+
+            if issued_times:
+                self.quiet_streak = 0
+                self.last_new_at = now
+                self.interval = self.min_interval
+
+                collected_at = datetime.now(KST).replace(tzinfo=None)
+                for issued_at in issued_times:
+                    latency = max((collected_at - issued_at).total_seconds(), 0.0)
+                    self.last_latency = latency
+                    self.max_latency = latency if self.max_latency is None else max(self.max_latency, latency)
+                    self._latency_sum += latency
+                    self._latency_count += 1
+            else:
+                self.quiet_streak += 1
+                self.interval = min(int(round(self.interval * self.backoff)), self.max_interval)
+                self.interval = max(self.interval, self.min_interval)
+
+            return self.interval
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "interval": self.interval,
+                "min_interval": self.min_interval,
+                "max_interval": self.max_interval,
+                "polls": self.polls,
+                "quiet_streak": self.quiet_streak,
+                "last_poll_at": self.last_poll_at,
+                "last_new_at": self.last_new_at,
+                "detection_latency_last": self.last_latency,
+                "detection_latency_avg": (self._latency_sum / self._latency_count) if self._latency_count else None,
+                "detection_latency_max": self.max_latency,
+            }
@@ -1,7 +1,7 @@
 # address_utils.py
 
 import re
-from ner_utils import extracted_regions
+from ner_utils import extracted_regions, extract_locations_batch
 
 # 1) 시·군·구 + 읍·면·동 + 산번호(예: 하남시 하산곡동 산51-2)
 pattern_hill_full = re.compile(
@@ -16,17 +16,8 @@ pattern_partial = re.compile(
     r'([가-힣]+(?:시|군|구)\s+[가-힣]+(?:읍|면|동))'
 )
 
-def extract_best_address(text: str) -> str | None:
-    """
-    본문에서 가능한 한 가장 세부적인 주소(산번지 포함)를 추출.
-    1) 시·군·구 + 읍·면·동 + 산번호
-    2) 읍·면·동 + 산번호
-    3) 시·군·구 + 읍·면·동
-    4) 위 패턴이 없으면 기존 extracted_regions() 첫 번째 값
-    """
-    if not text:
-        return None
-
+def _match_detailed_address(text: str) -> str | None:
+    """정규식 1)~3) 순서로 가장 세부적인 주소를 찾습니다. 없으면 None."""
     # 1) 시·군·구 + 읍·면·동 + 산번호
     m = pattern_hill_full.search(text)
     if m:
@@ -42,6 +33,47 @@ def extract_best_address(text: str) -> str | None:
     if m:
         return m.group(1)
 
+    return None
+
+
+def extract_best_address(text: str) -> str | None:
+    """
+    본문에서 가능한 한 가장 세부적인 주소(산번지 포함)를 추출.
+    1) 시·군·구 + 읍·면·동 + 산번호
+    2) 읍·면·동 + 산번호
+    3) 시·군·구 + 읍·면·동
+    4) 위 패턴이 없으면 기존 extracted_regions() 첫 번째 값
+    """
+    if not text:
+        return None
+
+    addr = _match_detailed_address(text)
+    if addr:
+        return addr
+
     # 4) fallback: ner_utils.extracted_regions() 첫 번째 결과
     regions = extracted_regions(text)
     return regions[0] if regions else None
+
+
+def extract_best_addresses(texts: list) -> list:
+    """
+    extract_best_address 의 배치 버전. 정규식으로 찾지 못한 본문만 모아
+    extract_locations_batch 로 한 번에 NER 추론합니다. 반환값은 texts 와 같은 순서입니다.
+    """
+    results = [None] * len(texts)
+    ner_targets = []
+    for i, text in enumerate(texts):
+        if not text:
+            continue
+        addr = _match_detailed_address(text)
+        if addr:
+            results[i] = addr
+        else:
+            ner_targets.append(i)
+
+    if ner_targets:
+        regions_list = extract_locations_batch([texts[i] for i in ner_targets])
+        for i, regions in zip(ner_targets, regions_list):
+            results[i] = regions[0] if regions else None
+    return results
@@ -0,0 +1,211 @@
+# backfill_indexes.py
+
+"""
+원본 테이블의 기존 데이터로 조회용 테이블을 채우는 백필 명령입니다.
+새로 쓰는 데이터는 저장 경로에서 이중 기록되므로, 테이블을 처음 만든 뒤 한 번만 실행하면 됩니다.
+모든 쓰기는 멱등(같은 키 덮어쓰기 또는 IF NOT EXISTS)이므로 중단 후 다시 실행해도 안전합니다.
+
+사용법:
+    python backfill_indexes.py buckets        # rtd_db → rtd_by_day, user_report → user_report_by_day
+    python backfill_indexes.py cells          # rtd_db → rtd_by_cell, user_report → user_report_by_cell (좌표가 있는 행만)
+    python backfill_indexes.py votes          # vote_user_ids 리스트 → event_votes 투표자 행 + event_vote_counts
+    python backfill_indexes.py report_ids     # user_report → user_report_by_report_id
+    python backfill_indexes.py device_tokens  # user_device → user_device_by_token (토큰 중복은 로그로 보고)
+"""
+import os
+import time
+import argparse
+import logging
+from datetime import datetime, timezone
+from itertools import islice
+
+from cassandra.auth import PlainTextAuthProvider
+from cassandra.cluster import Cluster
+from cassandra.query import SimpleStatement
+from cassandra_async import write_many
+from time_buckets import ensure_schema, day_of, rtd_by_day_params
+from geo_cells import ensure_geo_schema, cell_of, rtd_by_cell_params
+from votes import ensure_vote_schema, VOTE_MARKER_CQL, VOTE_INCREMENT_CQL
+from report_lookup import ensure_report_lookup_schema
+from device_tokens import ensure_device_token_schema, TOKEN_CLAIM_CQL
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+CASSANDRA_HOST = os.getenv("CASSANDRA_HOST", "127.0.0.1")
+BACKFILL_FETCH_SIZE = int(os.getenv("BACKFILL_FETCH_SIZE", "1000"))
+BACKFILL_CONCURRENCY = int(os.getenv("BACKFILL_CONCURRENCY", "128"))
+
+
+def copy_rows(session, label: str, select_cql: str, insert_cql: str, to_params):
+    """select_cql 의 모든 행을 to_params 로 변환해 insert_cql 로 동시에 기록합니다. (to_params 가 None 이면 건너뜀)"""
+    started = time.time()
+    rows = session.execute(SimpleStatement(select_cql, fetch_size=BACKFILL_FETCH_SIZE))
+    insert_stmt = session.prepare(insert_cql)
+    params_iter = (params for params in (to_params(row) for row in rows) if params is not None)
+    result = write_many(session, insert_stmt, params_iter,
+                        concurrency=BACKFILL_CONCURRENCY, keep_results=False)
+    for params, e in result.errors[:10]:
+        logging.error(f"[{label}] 기록 실패 {params[:3]}: {e}")
+    elapsed = time.time() - started
+    rate = len(result) / elapsed if elapsed > 0 else 0.0
+    logging.info(f"[{label}] {result.succeeded}건 기록, 실패 {result.failed}건 ({elapsed:.1f}초, {rate:.1f} rows/sec)")
+
+
+def backfill_buckets(session):
+    copy_rows(
+        session, "rtd_by_day",
+        "SELECT rtd_code, rtd_time, id, rtd_loc, rtd_details, regioncode, latitude, longitude, "
+        "visible, vote_count FROM rtd_db",
+        """
+        INSERT INTO rtd_by_day (
+          day, rtd_time, id, rtd_code, rtd_loc, rtd_details,
+          regioncode, latitude, longitude, visible, vote_count
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        lambda row: rtd_by_day_params(row.rtd_code, row.rtd_time, row.id, row.rtd_loc, row.rtd_details,
+                                      row.regioncode, row.latitude, row.longitude) + (row.visible, row.vote_count)
+    )
+    copy_rows(
+        session, "user_report_by_day",
+        "SELECT report_by_id, report_at, report_id, middle_type, small_type, report_location, "
+        "report_content, report_lat, report_lot, visible, delete_vote FROM user_report",
+        """
+        INSERT INTO user_report_by_day (
+          day, report_at, report_id, report_by_id, middle_type, small_type,
+          report_location, report_content, report_lat, report_lot, visible, delete_vote
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        lambda row: (day_of(row.report_at), row.report_at, row.report_id, row.report_by_id,
+                     row.middle_type, row.small_type, row.report_location, row.report_content,
+                     row.report_lat, row.report_lot, row.visible, row.delete_vote)
+    )
+
+
+def backfill_cells(session):
+    def rtd_params(row):
+        params = rtd_by_cell_params(row.rtd_code, row.rtd_time, row.id, row.rtd_loc, row.rtd_details,
+                                    row.regioncode, row.latitude, row.longitude)
+        return params + (row.visible, row.vote_count) if params is not None else None
+
+    def report_params(row):
+        cell = cell_of(row.report_lat, row.report_lot)
+        if cell is None:
+            return None
+        return (cell, day_of(row.report_at), row.report_at, row.report_id, row.report_by_id,
+                row.middle_type, row.small_type, row.report_location, row.report_content,
+                row.report_lat, row.report_lot, row.visible, row.delete_vote)
+
+    copy_rows(
+        session, "rtd_by_cell",
+        "SELECT rtd_code, rtd_time, id, rtd_loc, rtd_details, regioncode, latitude, longitude, "
+        "visible, vote_count FROM rtd_db",
+        """
+        INSERT INTO rtd_by_cell (
+          cell, day, rtd_time, id, rtd_code, rtd_loc, rtd_details,
+          regioncode, latitude, longitude, visible, vote_count
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        rtd_params
+    )
+    copy_rows(
+        session, "user_report_by_cell",
+        "SELECT report_by_id, report_at, report_id, middle_type, small_type, report_location, "
+        "report_content, report_lat, report_lot, visible, delete_vote FROM user_report",
+        """
+        INSERT INTO user_report_by_cell (
+          cell, day, report_at, report_id, report_by_id, middle_type, small_type,
+          report_location, report_content, report_lat, report_lot, visible, delete_vote
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        report_params
+    )
+
+
+def backfill_votes(session):
+    """
+    기존 vote_user_ids 리스트의 투표자를 투표자 행으로 옮기고, 새로 기록된 투표자 수만큼 counter 를 올립니다.
+    이미 있는 투표자 행은 적용되지 않으므로 다시 실행해도 counter 가 중복 증가하지 않습니다.
+    """
+    marker_stmt = session.prepare(VOTE_MARKER_CQL)
+    increment_stmt = session.prepare(VOTE_INCREMENT_CQL)
+    voted_at = datetime.now(timezone.utc)
+
+    for kind, select_cql in (("rtd", "SELECT id AS event_id, vote_user_ids FROM rtd_db"),
+                             ("report", "SELECT report_id AS event_id, vote_user_ids FROM user_report")):
+        started = time.time()
+        rows = session.execute(SimpleStatement(select_cql, fetch_size=BACKFILL_FETCH_SIZE))
+        voters = ((kind, row.event_id, user_id, voted_at) for row in rows for user_id in (row.vote_user_ids or []))
+        moved = 0
+        while chunk := list(islice(voters, BACKFILL_FETCH_SIZE)):
+            result = write_many(session, marker_stmt, chunk, concurrency=BACKFILL_CONCURRENCY)
+            applied = [(p[0], p[1]) for p, (success, rs) in zip(chunk, result) if success and rs and rs[0].applied]
+            for p, e in result.errors[:10]:
+                logging.error(f"[{kind} votes] 투표자 기록 실패 {p[1]}: {e}")
+            counted = write_many(session, increment_stmt, applied, concurrency=BACKFILL_CONCURRENCY, keep_results=False)
+            for p, e in counted.errors[:10]:
+                logging.error(f"[{kind} votes] counter 증가 실패 {p[1]}: {e}")
+            moved += counted.succeeded
+        logging.info(f"[{kind} votes] 투표 {moved}건 이전 ({time.time() - started:.1f}초)")
+
+
+def backfill_report_ids(session):
+    copy_rows(
+        session, "user_report_by_report_id",
+        "SELECT report_by_id, report_at, report_id FROM user_report",
+        "INSERT INTO user_report_by_report_id (report_id, report_by_id, report_at) VALUES (?, ?, ?)",
+        lambda row: (row.report_id, row.report_by_id, row.report_at)
+    )
+
+
+def backfill_device_tokens(session):
+    """
+    토큰을 IF NOT EXISTS 로 선점하므로, 여러 사용자에 같은 토큰이 등록되어 있으면 먼저 기록된 사용자만 연결되고
+    나머지는 중복으로 보고합니다. (정리는 수동)
+    """
+    started = time.time()
+    rows = [(row.device_token, row.user_id)
+            for row in session.execute(SimpleStatement("SELECT user_id, device_token FROM user_device",
+                                                       fetch_size=BACKFILL_FETCH_SIZE))
+            if row.device_token]
+    result = write_many(session, session.prepare(TOKEN_CLAIM_CQL), rows, concurrency=BACKFILL_CONCURRENCY)
+    duplicates = 0
+    for (token, user_id), (success, rs) in zip(rows, result):
+        if success and rs and not rs[0].applied and rs[0].user_id != user_id:
+            duplicates += 1
+            logging.warning(f"[user_device_by_token] 중복 토큰: {user_id} (이미 {rs[0].user_id} 에 연결됨) {token[:16]}...")
+    for params, e in result.errors[:10]:
+        logging.error(f"[user_device_by_token] 기록 실패 {params[1]}: {e}")
+    logging.info(f"[user_device_by_token] {len(rows)}건 처리, 중복 {duplicates}건, 실패 {result.failed}건 "
+                 f"({time.time() - started:.1f}초)")
+
+
+COMMANDS = {
+    "buckets": backfill_buckets,
+    "cells": backfill_cells,
+    "votes": backfill_votes,
+    "report_ids": backfill_report_ids,
+    "device_tokens": backfill_device_tokens,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="조회용 테이블 백필")
+    parser.add_argument("target", choices=sorted(COMMANDS), help="백필할 대상")
+    args = parser.parse_args()
+
+    auth = PlainTextAuthProvider(username="andy013", password="1212")
+    cluster = Cluster([CASSANDRA_HOST], port=9042, auth_provider=auth)
+    session = cluster.connect("disaster_service")
+    try:
+        ensure_schema(session)
+        ensure_geo_schema(session)
+        ensure_vote_schema(session)
+        ensure_report_lookup_schema(session)
+        ensure_device_token_schema(session)
+        COMMANDS[args.target](session)
+    finally:
+        cluster.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# bench_api.py
+
+"""
+push_service API 부하 테스트.
+
+동시 클라이언트 수를 바꿔 가며 같은 엔드포인트를 반복 호출하고 처리량(req/sec)과 지연 시간(p50/p99)을 출력합니다.
+클라이언트 쪽 부하 생성기일 뿐이므로, 로컬 Cassandra 에 연결해 실행 중인 push_service 를 그대로 측정합니다.
+다른 버전과 비교하려면 해당 버전의 서버를 띄워 같은 옵션으로 다시 실행합니다. (예: 이전 커밋을 checkout 해 실행)
+
+사용법:
+    uvicorn push_service:app --port 8000
+    python bench_api.py [--url http://127.0.0.1:8000] [--path "/rtd/search?days=1"] \\
+                        [--concurrency 1,16,64] [--requests 500]
+"""
+import time
+import argparse
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+
+def run(url: str, concurrency: int, total: int):
+    http = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=concurrency, pool_maxsize=concurrency)
+    http.mount("http://", adapter)
+
+    def call(_):
+        start = time.perf_counter()
+        resp = http.get(url, timeout=60)
+        return time.perf_counter() - start, resp.status_code
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(call, range(total)))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(r[0] for r in results)
+    errors = sum(1 for r in results if r[1] != 200)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(
+        f"c={concurrency:<4} req={total:<6} {total / elapsed:8.1f} req/sec  "
+        f"p50={statistics.median(latencies) * 1000:8.1f} ms  p99={p99 * 1000:8.1f} ms  errors={errors}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="push_service API 부하 테스트")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--path", default="/rtd/search?days=1")
+    parser.add_argument("--concurrency", default="1,16,64")
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    url = args.url.rstrip("/") + args.path
+    requests.get(url, timeout=60)  # warm-up
+    for concurrency in [int(c) for c in args.concurrency.split(",") if c.strip()]:
+        run(url, concurrency, args.requests)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# bench_buckets.py
+
+"""
+시간 범위 조회 지연 시간 비교: ALLOW FILTERING 전체 스캔 vs 날짜 버킷 파티션 조회.
+
+임시 테이블 두 개에 합성 RTD 행을 단계적으로 채우면서(기본 10만 → 50만 → 100만 행),
+각 단계마다 최근 1일 범위 조회의 지연 시간을 측정합니다.
+  scan   : bench_rtd_scan  PRIMARY KEY ((id), rtd_time)   + rtd_time 범위 ALLOW FILTERING
+  bucket : bench_rtd_day   PRIMARY KEY ((day), rtd_time, id) + BucketQueries 방식의 날짜 파티션 조회
+버킷 조회는 전체 행 수와 무관하게 일정해야 합니다. 끝나면 임시 테이블을 삭제합니다.
+
+사용법:
+    python bench_buckets.py [--sizes 100000,500000,1000000] [--days 365] [--rounds 5]
+"""
+import os
+import time
+import random
+import argparse
+import logging
+import statistics
+from uuid import uuid4
+from datetime import datetime, timedelta, timezone
+
+from cassandra.auth import PlainTextAuthProvider
+from cassandra.cluster import Cluster
+from cassandra_async import write_many
+from time_buckets import day_of, days_between
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+CASSANDRA_HOST = os.getenv("CASSANDRA_HOST", "127.0.0.1")
+SCAN_TABLE = "bench_rtd_scan"
+DAY_TABLE = "bench_rtd_day"
+
+
+def create_tables(session):
+    session.execute(f"""
+        CREATE TABLE IF NOT EXISTS {SCAN_TABLE} (
+            id uuid, rtd_time timestamp, rtd_code int, rtd_loc text,
+            PRIMARY KEY ((id), rtd_time)
+        )
+    """)
+    session.execute(f"""
+        CREATE TABLE IF NOT EXISTS {DAY_TABLE} (
+            day date, rtd_time timestamp, id uuid, rtd_code int, rtd_loc text,
+            PRIMARY KEY ((day), rtd_time, id)
+        ) WITH CLUSTERING ORDER BY (rtd_time DESC, id ASC)
+    """)
+
+
+def load_rows(session, count: int, now: datetime, days: int):
+    scan_stmt = session.prepare(f"INSERT INTO {SCAN_TABLE} (id, rtd_time, rtd_code, rtd_loc) VALUES (?, ?, ?, ?)")
+    day_stmt = session.prepare(f"INSERT INTO {DAY_TABLE} (day, rtd_time, id, rtd_code, rtd_loc) VALUES (?, ?, ?, ?, ?)")
+    rows = []
+    for _ in range(count):
+        ts = now - timedelta(seconds=random.randint(0, days * 86400))
+        rows.append((uuid4(), ts, random.choice((21, 31, 51, 71)), "서울특별시"))
+    write_many(session, scan_stmt, rows, concurrency=256, keep_results=False)
+    write_many(session, day_stmt, ((day_of(ts), ts, rec_id, code, loc) for rec_id, ts, code, loc in rows),
+               concurrency=256, keep_results=False)
+
+
+def time_query(fn, rounds: int):
+    timings, count = [], 0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        count = sum(1 for _ in fn())
+        timings.append(time.perf_counter() - start)
+    return count, statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="날짜 버킷 조회 벤치마크")
+    parser.add_argument("--sizes", default="100000,500000,1000000", help="누적 행 수 단계")
+    parser.add_argument("--days", type=int, default=365, help="합성 데이터의 시간 범위(일)")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    auth = PlainTextAuthProvider(username="andy013", password="1212")
+    cluster = Cluster([CASSANDRA_HOST], port=9042, auth_provider=auth)
+    session = cluster.connect("disaster_service")
+    session.default_timeout = 600
+    create_tables(session)
+
+    now = datetime.now(timezone.utc)
+    start, end = now - timedelta(days=1), now
+    scan_stmt = session.prepare(
+        f"SELECT * FROM {SCAN_TABLE} WHERE rtd_time >= ? AND rtd_time <= ? ALLOW FILTERING"
+    )
+    day_stmt = session.prepare(f"SELECT * FROM {DAY_TABLE} WHERE day = ? AND rtd_time >= ? AND rtd_time <= ?")
+
+    def bucket_query():
+        futures = [session.execute_async(day_stmt, (d, start, end)) for d in days_between(start, end, True)]
+        for f in futures:
+            yield from f.result()
+
+    loaded = 0
+    try:
+        for size in [int(s) for s in args.sizes.split(",") if s.strip()]:
+            load_rows(session, size - loaded, now, args.days)
+            loaded = size
+            scan_count, scan_ms = time_query(lambda: session.execute(scan_stmt, (start, end)), args.rounds)
+            day_count, day_ms = time_query(bucket_query, args.rounds)
+            print(f"rows={loaded:<8} scan: {scan_count:>5}건 {scan_ms:9.1f} ms   bucket: {day_count:>5}건 {day_ms:9.1f} ms")
+    finally:
+        session.execute(f"DROP TABLE IF EXISTS {SCAN_TABLE}")
+        session.execute(f"DROP TABLE IF EXISTS {DAY_TABLE}")
+        cluster.shutdown()
+
+
+if __name__ == "__main__":
+    main()
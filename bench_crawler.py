@@ -0,0 +1,67 @@
+# bench_crawler.py
+
+"""
+재난문자 목록 추출 방식별 소요 시간을 비교합니다.
+
+  legacy : driver.get → time.sleep(5) → 행마다 find_element 6회
+  script : driver.get → 행이 나타날 때까지 명시적 대기 → execute_script 1회
+  http   : 브라우저 없이 DisasterSmsList.do 직접 호출
+
+사용법:
+    python bench_crawler.py [--rounds 5] [--modes legacy,script,http]
+"""
+import os
+import time
+import argparse
+import logging
+import statistics
+
+from safekorea_client import SafeKoreaClient
+from webdriver_pool import create_chrome_driver, extract_rows_legacy, extract_rows_script
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+CHROME_DRIVER_PATH = os.getenv("CHROME_DRIVER_PATH", "/usr/local/bin/chromedriver")
+
+
+def measure(name, fn, rounds: int):
+    timings = []
+    row_count = 0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        rows = fn()
+        timings.append(time.perf_counter() - start)
+        row_count = len(rows)
+    print(
+        f"{name:<7} rows={row_count:<4} "
+        f"mean={statistics.mean(timings) * 1000:8.1f} ms  "
+        f"min={min(timings) * 1000:8.1f} ms  max={max(timings) * 1000:8.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="재난문자 목록 추출 방식 벤치마크")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--modes", default="legacy,script,http")
+    args = parser.parse_args()
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+
+    driver = None
+    try:
+        if "legacy" in modes or "script" in modes:
+            driver = create_chrome_driver(CHROME_DRIVER_PATH)
+            extract_rows_script(driver)  # warm-up (브라우저 캐시)
+        if "legacy" in modes:
+            measure("legacy", lambda: extract_rows_legacy(driver), args.rounds)
+        if "script" in modes:
+            measure("script", lambda: extract_rows_script(driver), args.rounds)
+        if "http" in modes:
+            client = SafeKoreaClient()
+            measure("http", client.fetch, args.rounds)
+    finally:
+        if driver is not None:
+            driver.quit()
+
+
+if __name__ == "__main__":
+    main()
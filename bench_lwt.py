@@ -0,0 +1,83 @@
+# bench_lwt.py
+
+"""
+결정적 uuid5 ID 레코드 저장 시 LWT(IF NOT EXISTS) 와 일반 INSERT 의 처리량을 비교합니다.
+
+  lwt   : INSERT ... IF NOT EXISTS (Paxos 왕복)
+  plain : INSERT (멱등 쓰기) + RecentIdCache 로 신규 여부 판별
+
+로컬 Cassandra 의 임시 테이블(bench_lwt_insert)에 쓰고, 끝나면 테이블을 삭제합니다.
+각 모드는 같은 ID 집합을 두 번 씁니다(1회차 = 신규, 2회차 = 재수집 중복).
+두 모드 모두 회차마다 rows 건의 INSERT 를 실행하므로, 차이는 쓰기 방식(LWT 여부)에서만 생깁니다.
+
+사용법:
+    python bench_lwt.py [--rows 5000] [--concurrency 1,32]
+"""
+import os
+import time
+import argparse
+import logging
+from uuid import uuid5, NAMESPACE_DNS
+
+from cassandra.auth import PlainTextAuthProvider
+from cassandra.cluster import Cluster
+from cassandra_async import write_many
+from recent_ids import RecentIdCache
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+CASSANDRA_HOST = os.getenv("CASSANDRA_HOST", "127.0.0.1")
+BENCH_TABLE = "bench_lwt_insert"
+
+
+def run_mode(session, mode: str, ids: list, concurrency: int):
+    cql = f"INSERT INTO {BENCH_TABLE} (id, payload) VALUES (?, ?)"
+    if mode == "lwt":
+        cql += " IF NOT EXISTS"
+    stmt = session.prepare(cql)
+    session.execute(f"TRUNCATE {BENCH_TABLE}")
+    cache = RecentIdCache(path=None, capacity=len(ids))
+
+    for round_name in ("new", "dup"):
+        start = time.perf_counter()
+        # 두 모드 모두 회차마다 같은 수의 INSERT 를 실행 (plain 은 신규 여부만 캐시로 판별)
+        params = [(rec_id, "payload") for rec_id in ids]
+        results = write_many(session, stmt, params, concurrency=concurrency)
+        new_count = 0
+        for (success, result), (rec_id, _) in zip(results, params):
+            if not success:
+                continue
+            if mode == "lwt":
+                new_count += 1 if result and result[0].applied else 0
+            elif cache.add(rec_id):
+                new_count += 1
+        elapsed = time.perf_counter() - start
+        print(
+            f"{mode:<5} c={concurrency:<3} {round_name}: rows={len(ids):<6} new={new_count:<6} "
+            f"{elapsed:7.2f}s  {len(ids) / elapsed:9.1f} rows/sec"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LWT vs 일반 INSERT 처리량 벤치마크")
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--concurrency", default="1,32")
+    args = parser.parse_args()
+
+    auth = PlainTextAuthProvider(username="andy013", password="1212")
+    cluster = Cluster([CASSANDRA_HOST], port=9042, auth_provider=auth)
+    session = cluster.connect("disaster_service")
+    session.execute(f"CREATE TABLE IF NOT EXISTS {BENCH_TABLE} (id uuid PRIMARY KEY, payload text)")
+
+    ids = [uuid5(NAMESPACE_DNS, f"bench_{i}") for i in range(args.rows)]
+    try:
+        for concurrency in [int(c) for c in args.concurrency.split(",") if c.strip()]:
+            for mode in ("lwt", "plain"):
+                run_mode(session, mode, ids, concurrency)
+    finally:
+        session.execute(f"DROP TABLE IF EXISTS {BENCH_TABLE}")
+        cluster.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# bench_payload.py
+
+"""
+/rtd/search 응답 직렬화/압축 방식별 크기와 소요 시간을 비교합니다. (Cassandra 불필요)
+
+search_rtd_item / search_report_item 과 같은 모양의 합성 이벤트 N건(기본 10,000건)으로
+  - 인코더: 표준 json(JSONResponse 와 같은 설정) / encode_json(orjson 또는 공백 없는 json)
+  - 형태: 기본(row) / columnar
+  - 압축: 없음 / gzip / br(brotli 설치 시)
+조합마다 응답 바이트 수와 직렬화+압축 시간(중앙값)을 출력합니다.
+
+사용법:
+    python bench_payload.py [--events 10000] [--rounds 5]
+"""
+import time
+import uuid
+import json
+import random
+import argparse
+import statistics
+from datetime import datetime, timedelta
+
+from payloads import encode_json, to_columnar, compress, orjson, brotli
+
+LOCATIONS = ["서울특별시 강남구", "부산광역시 해운대구", "대구광역시 중구", "경기도 수원시", "강원특별자치도 춘천시"]
+
+
+def synthetic_events(n: int) -> list:
+    rnd = random.Random(42)
+    now = datetime.utcnow()
+    events = []
+    for i in range(n):
+        t = (now - timedelta(seconds=i * 7)).isoformat()
+        if rnd.random() < 0.8:
+            events.append({
+                "type": "rtd",
+                "id": str(uuid.UUID(int=rnd.getrandbits(128))),
+                "time": t,
+                "rtd_loc": rnd.choice(LOCATIONS),
+                "rtd_details": [
+                    f"level: {rnd.choice(['안전안내', '긴급재난', '위급재난'])}",
+                    f"type: {rnd.choice(['호우', '강풍', '폭염', '지진'])}",
+                    f"content: [행정안전부] {rnd.choice(LOCATIONS)} 일대 주의 바랍니다. 외출 자제 {i}",
+                ],
+                "rtd_code": rnd.choice([21, 31, 51, 71, 72]),
+                "regioncode": rnd.randrange(1100000000, 5000000000),
+                "latitude": 33 + rnd.random() * 5,
+                "longitude": 126 + rnd.random() * 4,
+                "vote_count": rnd.randrange(0, 5),
+                "visible": True,
+            })
+        else:
+            events.append({
+                "type": "report",
+                "id": str(uuid.UUID(int=rnd.getrandbits(128))),
+                "time": t,
+                "report_location": rnd.choice(LOCATIONS),
+                "middle_type": "30",
+                "small_type": rnd.choice(["31", "32", "33"]),
+                "content": f"도로가 침수되었습니다 {i}",
+                "report_by": f"user{rnd.randrange(1000)}",
+                "latitude": 33 + rnd.random() * 5,
+                "longitude": 126 + rnd.random() * 4,
+                "visible": True,
+                "delete_vote": 0,
+            })
+    return events
+
+
+def stdlib_json(content) -> bytes:
+    # starlette JSONResponse.render 와 같은 설정
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None,
+                      separators=(",", ":")).encode("utf-8")
+
+
+def measure(encoder, shape: str, encoding, events: list, rounds: int):
+    timings = []
+    size = 0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        results = to_columnar(events) if shape == "columnar" else events
+        body = encoder({"count": len(events), "results": results})
+        if encoding:
+            body = compress(body, encoding)
+        timings.append(time.perf_counter() - start)
+        size = len(body)
+    return size, statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="응답 직렬화/압축 방식 비교")
+    parser.add_argument("--events", type=int, default=10000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    events = synthetic_events(args.events)
+    encoders = [("json", stdlib_json), ("orjson" if orjson is not None else "json-compact", encode_json)]
+    encodings = [None, "gzip"] + (["br"] if brotli is not None else [])
+
+    baseline = None
+    print(f"{args.events} events, median of {args.rounds} rounds")
+    for enc_name, encoder in encoders:
+        for shape in ("row", "columnar"):
+            for encoding in encodings:
+                size, elapsed = measure(encoder, shape, encoding, events, args.rounds)
+                baseline = baseline or size
+                print(f"{enc_name:<12} {shape:<9} {encoding or '-':<5} "
+                      f"{size / 1024:9.1f} KiB ({size / baseline:6.1%})  {elapsed * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
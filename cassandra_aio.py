@@ -0,0 +1,64 @@
+# cassandra_aio.py
+
+"""
+Cassandra 드라이버의 execute_async(ResponseFuture)를 asyncio 에서 await 할 수 있게 잇는 도우미입니다.
+
+드라이버 콜백은 드라이버 I/O 스레드에서 호출되므로 loop.call_soon_threadsafe 로 이벤트 루프에 결과를 넘깁니다.
+async 엔드포인트는 이 함수들로 쿼리를 기다리는 동안 스레드를 점유하지 않고, 서로 독립적인 쿼리는
+asyncio.gather 로 동시에 실행할 수 있습니다.
+
+    row = await afirst(session, "SELECT ... WHERE id = %s", (id,))
+    rows = await aexecute_all(session, stmt, params)
+    async for row in aiter_rows(session, stmt, params): ...
+"""
+import asyncio
+
+
+def _page(response_future, loop) -> asyncio.Future:
+    """response_future 의 현재 페이지(행 목록)를 돌려주는 asyncio Future"""
+    fut = loop.create_future()
+
+    def resolve(rows):
+        if not fut.done():
+            fut.set_result(rows)
+
+    def reject(exc):
+        if not fut.done():
+            fut.set_exception(exc)
+
+    response_future.add_callbacks(
+        callback=lambda rows: loop.call_soon_threadsafe(resolve, rows),
+        errback=lambda exc: loop.call_soon_threadsafe(reject, exc)
+    )
+    return fut
+
+
+async def aexecute(session, query, params=None) -> list:
+    """쿼리를 실행하고 첫 페이지 행 목록을 반환합니다. (쓰기 / 단건 / LIMIT 조회용)"""
+    loop = asyncio.get_running_loop()
+    return await _page(session.execute_async(query, params), loop)
+
+
+async def afirst(session, query, params=None):
+    """첫 행 또는 None"""
+    rows = await aexecute(session, query, params)
+    return rows[0] if rows else None
+
+
+async def aiter_rows(session, query, params=None):
+    """모든 페이지의 행을 차례로 돌려주는 async generator (다음 페이지는 필요할 때 요청)"""
+    loop = asyncio.get_running_loop()
+    response_future = session.execute_async(query, params)
+    while True:
+        rows = await _page(response_future, loop)
+        for row in rows:
+            yield row
+        if not response_future.has_more_pages:
+            return
+        response_future.clear_callbacks()
+        response_future.start_fetching_next_page()
+
+
+async def aexecute_all(session, query, params=None) -> list:
+    """모든 페이지의 행을 목록으로 반환합니다."""
+    return [row async for row in aiter_rows(session, query, params)]
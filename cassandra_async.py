@@ -0,0 +1,91 @@
+# cassandra_async.py
+
+"""
+execute_async 기반 Cassandra 동시 쓰기 도우미입니다.
+
+session.execute 는 행마다 한 번의 왕복(RTT)을 기다리지만, AsyncWriter 는 동시에 날아가는 요청 수를
+concurrency 개로 제한한 채 execute_async future 를 계속 채워 넣고, 결과와 오류를 모아 돌려줍니다.
+
+    writer = AsyncWriter(session, concurrency=64)
+    result = writer.write_many(prepared_stmt, params_iter)
+    for (success, res), params in zip(result, params_list): ...
+
+params_iter 는 제너레이터여도 되며(전부 메모리에 올리지 않음), keep_results=False 로 호출하면
+건별 결과 대신 성공/실패 건수와 오류 목록만 유지합니다. (대량 마이그레이션용)
+"""
+import os
+import logging
+import threading
+
+ASYNC_WRITE_CONCURRENCY = int(os.getenv("ASYNC_WRITE_CONCURRENCY", "64"))
+
+
+class WriteResult:
+    """write_many 결과. 순회하면 입력 순서대로 (success, result_or_exc) 를 돌려줍니다."""
+
+    def __init__(self):
+        self.results = []
+        self.succeeded = 0
+        self.failed = 0
+        self.errors = []  # (params, exception)
+
+    def __iter__(self):
+        return iter(self.results)
+
+    def __len__(self):
+        return self.succeeded + self.failed
+
+
+class AsyncWriter:
+    def __init__(self, session, concurrency: int = ASYNC_WRITE_CONCURRENCY):
+        self.session = session
+        self.concurrency = max(concurrency, 1)
+
+    def write_many(self, statement, params_iter, keep_results: bool = True) -> WriteResult:
+        """
+        statement 를 params_iter 의 각 파라미터로 실행합니다.
+        동시에 진행 중인 요청은 최대 concurrency 개이며, 모든 요청이 끝난 뒤 반환합니다.
+        """
+        out = WriteResult()
+        permits = threading.BoundedSemaphore(self.concurrency)
+        lock = threading.Lock()
+
+        def finish(index, params, success, result):
+            with lock:
+                if success:
+                    out.succeeded += 1
+                else:
+                    out.failed += 1
+                    out.errors.append((params, result))
+                if keep_results:
+                    out.results[index] = (success, result)
+            permits.release()
+
+        for index, params in enumerate(params_iter):
+            permits.acquire()
+            if keep_results:
+                out.results.append(None)
+            try:
+                future = self.session.execute_async(statement, params)
+            except Exception as e:
+                finish(index, params, False, e)
+                continue
+            future.add_callbacks(
+                callback=lambda res, i=index, p=params: finish(i, p, True, res),
+                errback=lambda exc, i=index, p=params: finish(i, p, False, exc)
+            )
+
+        # 남은 요청이 모두 끝날 때까지 대기 (모든 permit 회수)
+        for _ in range(self.concurrency):
+            permits.acquire()
+        for _ in range(self.concurrency):
+            permits.release()
+
+        if out.failed:
+            logging.warning(f"[async write] {len(out)}건 중 {out.failed}건 실패 (첫 오류: {out.errors[0][1]})")
+        return out
+
+
+def write_many(session, statement, params_iter, concurrency: int = ASYNC_WRITE_CONCURRENCY,
+               keep_results: bool = True) -> WriteResult:
+    return AsyncWriter(session, concurrency).write_many(statement, params_iter, keep_results)
@@ -0,0 +1,148 @@
+# change_log.py
+
+"""
+이벤트 변경 로그와 델타 동기화.
+
+RTD 저장, 사용자 제보 등록/삭제, 투표가 일어날 때마다 event_changes 에 (변경 시각 timeuuid, 종류, 작업, 이벤트 키)를 기록합니다.
+앱은 /sync 에 since(ISO 시각) 또는 이전 응답의 sync token 을 주고, 그 이후에 생기거나 바뀐 이벤트만 받습니다.
+
+  - 파티션은 변경이 일어난 UTC 날짜이고 파티션 안은 change_id(timeuuid) 오름차순입니다.
+  - 행은 CHANGE_LOG_RETENTION_DAYS 일 뒤 TTL 로 지워지므로, 그보다 오래된 위치에서는 이어받을 수 없습니다.
+    (ChangeLogExpired → 앱은 /rtd/search 로 전체를 다시 받음)
+  - sync token 은 마지막으로 읽은 change_id 를 base64 로 감싼 불투명 토큰입니다.
+  - change_id 는 쓰는 쪽이 기록 직전에 만든 시각이라, 여러 프로세스가 동시에 쓰면 작은 change_id 가 늦게 보일 수 있습니다.
+    그래서 now - CHANGE_SYNC_SAFETY_LAG 초 이전의 변경만 돌려줍니다. (그보다 최근 변경은 다음 동기화에서 전달)
+  - 변경 행은 이벤트 행 기록이 끝난 뒤에 기록합니다. (변경을 읽고 현재 행을 조회할 때 행이 있도록)
+"""
+import os
+import base64
+import asyncio
+from uuid import UUID
+from datetime import datetime, timedelta, timezone
+
+from cassandra.util import uuid_from_time, min_uuid_from_time, max_uuid_from_time, datetime_from_uuid1
+from cassandra_aio import aexecute
+from time_buckets import day_of, days_between
+
+CHANGE_LOG_RETENTION_DAYS = int(os.getenv("CHANGE_LOG_RETENTION_DAYS", "7"))
+CHANGE_FETCH_CONCURRENCY = int(os.getenv("CHANGE_FETCH_CONCURRENCY", "32"))  # 변경된 이벤트 현재 상태 동시 조회 수
+CHANGE_SYNC_SAFETY_LAG = float(os.getenv("CHANGE_SYNC_SAFETY_LAG", "10"))  # 초, 이보다 최근 변경은 아직 돌려주지 않음
+
+SCHEMA_CQL = [
+    f"""
+    CREATE TABLE IF NOT EXISTS event_changes (
+        day date,
+        change_id timeuuid,
+        kind text,
+        op text,
+        event_time timestamp,
+        event_id uuid,
+        PRIMARY KEY ((day), change_id)
+    ) WITH CLUSTERING ORDER BY (change_id ASC)
+      AND default_time_to_live = {CHANGE_LOG_RETENTION_DAYS * 86400}
+    """,
+]
+
+CHANGE_INSERT_CQL = """
+    INSERT INTO event_changes (day, change_id, kind, op, event_time, event_id)
+    VALUES (%s,%s,%s,%s,%s,%s)
+    """
+
+
+class ChangeLogExpired(Exception):
+    """요청한 위치가 변경 로그 보관 기간보다 오래됨"""
+
+
+def ensure_change_log_schema(session):
+    for cql in SCHEMA_CQL:
+        session.execute(cql)
+
+
+def change_params(kind: str, op: str, event_time: datetime, event_id: UUID) -> tuple:
+    """
+    CHANGE_INSERT_CQL 파라미터. kind: "rtd" | "report", op: "insert" | "update" | "vote" | "delete"
+    이벤트 키는 날짜 버킷 테이블의 키(event_time, event_id) 입니다.
+    """
+    now = datetime.now(timezone.utc)
+    return (day_of(now), uuid_from_time(now), kind, op, event_time, event_id)
+
+
+def encode_token(change_id: UUID) -> str:
+    return base64.urlsafe_b64encode(change_id.bytes).decode("ascii").rstrip("=")
+
+
+def decode_token(token: str) -> UUID:
+    """잘못된 토큰이면 ValueError"""
+    try:
+        change_id = UUID(bytes=base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except Exception as e:
+        raise ValueError(f"잘못된 sync token: {e}")
+    if change_id.version != 1:
+        raise ValueError("잘못된 sync token: timeuuid 가 아닙니다")
+    return change_id
+
+
+def since_position(since: datetime) -> UUID:
+    """since 시각 이후의 변경부터 읽도록 하는 위치 (그 시각의 가장 작은 timeuuid)"""
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return min_uuid_from_time(since.timestamp())
+
+
+class ChangeFeed:
+    def __init__(self, session):
+        self.session = session
+        self.select_stmt = session.prepare(
+            "SELECT change_id, kind, op, event_time, event_id FROM event_changes "
+            "WHERE day = ? AND change_id > ? AND change_id < ? LIMIT ?"
+        )
+        self.rtd_stmt = session.prepare("SELECT * FROM rtd_by_day WHERE day = ? AND rtd_time = ? AND id = ?")
+        self.report_stmt = session.prepare(
+            "SELECT * FROM user_report_by_day WHERE day = ? AND report_at = ? AND report_id = ?"
+        )
+
+    async def changes_after(self, position: UUID, limit: int) -> tuple:
+        """
+        position 이후 ~ now - CHANGE_SYNC_SAFETY_LAG 의 변경을 최대 limit 건 읽어 (변경 행 목록, 더 남았는지) 를 반환합니다.
+        보관 기간보다 오래된 위치면 ChangeLogExpired.
+        """
+        now = datetime.now(timezone.utc)
+        position_time = datetime_from_uuid1(position).replace(tzinfo=timezone.utc)
+        if position_time < now - timedelta(days=CHANGE_LOG_RETENTION_DAYS):
+            raise ChangeLogExpired(position_time.isoformat())
+        horizon = now - timedelta(seconds=CHANGE_SYNC_SAFETY_LAG)
+        if horizon <= position_time:
+            return [], False
+        upper = max_uuid_from_time(horizon.timestamp())
+
+        changes = []
+        for day in days_between(position_time, horizon):
+            rows = await aexecute(self.session, self.select_stmt, (day, position, upper, limit + 1 - len(changes)))
+            changes.extend(rows)
+            if len(changes) > limit:
+                return changes[:limit], True
+        return changes, False
+
+    async def current_rows(self, changes: list) -> dict:
+        """
+        변경된 이벤트마다 마지막 변경과 현재 행을 모읍니다. (같은 이벤트가 여러 번 바뀌었으면 한 번만 조회)
+        반환값: (kind, event_id) -> (마지막 변경 행, 현재 행 또는 None) — 마지막 변경 순서
+        """
+        latest = {}
+        for change in changes:
+            key = (change.kind, change.event_id)
+            latest.pop(key, None)
+            latest[key] = change
+        limiter = asyncio.Semaphore(CHANGE_FETCH_CONCURRENCY)
+
+        async def fetch(change):
+            if change.op == "delete":
+                return None
+            stmt = self.rtd_stmt if change.kind == "rtd" else self.report_stmt
+            async with limiter:
+                rows = await aexecute(self.session, stmt, (day_of(change.event_time), change.event_time,
+                                                           change.event_id))
+            return rows[0] if rows else None
+
+        rows = await asyncio.gather(*(fetch(change) for change in latest.values()))
+        return {key: (change, row) for (key, change), row in zip(latest.items(), rows)}
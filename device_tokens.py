@@ -0,0 +1,59 @@
+# device_tokens.py
+
+"""
+device_token → user_id 역색인.
+
+user_device 의 기본 키는 user_id 라서 토큰 중복 확인과 토큰으로 삭제할 때 ALLOW FILTERING 전체 스캔이 필요했고,
+설치 수가 늘수록 등록이 느려졌습니다. user_device_by_token 은 토큰을 기본 키로 가지며
+
+  - 등록/수정: INSERT IF NOT EXISTS 로 토큰을 선점합니다. 한 파티션의 경량 트랜잭션이므로 동시에 같은 토큰을
+    등록해도 한 사용자만 성공하고, 비용은 전체 기기 수와 무관합니다.
+  - 수정/삭제: 이전 토큰은 DELETE IF user_id = 본인 으로 해제합니다. (다른 사용자가 가진 토큰은 지우지 않음)
+
+기존 기기는 backfill_indexes.py device_tokens 로 채웁니다.
+"""
+from cassandra_aio import afirst
+
+SCHEMA_CQL = [
+    """
+    CREATE TABLE IF NOT EXISTS user_device_by_token (
+        device_token text PRIMARY KEY,
+        user_id text
+    )
+    """,
+]
+
+TOKEN_CLAIM_CQL = "INSERT INTO user_device_by_token (device_token, user_id) VALUES (?, ?) IF NOT EXISTS"
+
+
+def ensure_device_token_schema(session):
+    for cql in SCHEMA_CQL:
+        session.execute(cql)
+
+
+class DeviceTokenIndex:
+    def __init__(self, session):
+        self.session = session
+        self.claim_stmt = session.prepare(TOKEN_CLAIM_CQL)
+        self.release_stmt = session.prepare(
+            "DELETE FROM user_device_by_token WHERE device_token = ? IF user_id = ?"
+        )
+        self.owner_stmt = session.prepare("SELECT user_id FROM user_device_by_token WHERE device_token = ?")
+
+    async def claim(self, device_token: str, user_id: str):
+        """
+        토큰을 user_id 에 연결합니다. 성공(이미 본인 토큰인 경우 포함)하면 None,
+        다른 사용자가 가지고 있으면 그 user_id 를 반환합니다.
+        """
+        row = await afirst(self.session, self.claim_stmt, (device_token, user_id))
+        if row is None or row.applied or row.user_id == user_id:
+            return None
+        return row.user_id
+
+    async def release(self, device_token: str, user_id: str):
+        """user_id 가 가진 토큰이면 연결을 지웁니다."""
+        await afirst(self.session, self.release_stmt, (device_token, user_id))
+
+    async def owner(self, device_token: str):
+        row = await afirst(self.session, self.owner_stmt, (device_token,))
+        return row.user_id if row is not None else None
@@ -0,0 +1,263 @@
+# event_cache.py
+
+"""
+최근 N일 RTD / 사용자 제보 이벤트의 프로세스 내 캐시.
+
+앱 클라이언트 대부분이 /rtd/search 를 기본값(days=1, 필터 없음)으로 호출해 같은 날짜 파티션을 반복해서 읽으므로,
+최근 EVENT_CACHE_DAYS 일치 날짜 버킷 행을 메모리에 두고 조회 구간이 그 안에 들어오면 메모리에서 응답합니다.
+
+  - 시간순 정렬 목록(bisect)으로 구간을 자르고, RTD 는 rtd_loc / regioncode / rtd_code 색인으로 필터링합니다.
+    필터는 Cassandra 조회 경로와 같이 주어진 것 중 첫 번째(rtd_loc > regioncode > rtd_code) 하나만 적용합니다.
+  - 같은 프로세스의 쓰기(제보 등록/삭제, 투표)는 즉시 캐시에 반영합니다.
+  - 다른 프로세스의 쓰기(수집기 main.py 의 RTD 저장, 다른 워커의 투표)는 마지막 적재 후
+    EVENT_CACHE_MAX_STALENESS 초가 지나면 백그라운드 작업으로 날짜 버킷을 다시 읽어 반영합니다.
+    재적재 중에는 요청을 기다리게 하지 않고 이전 스냅샷으로 응답하며, 스냅샷이 EVENT_CACHE_MAX_SERVE_STALENESS 초보다
+    오래되면(재적재 실패 등) Cassandra 로 조회합니다. (일관성 상한)
+  - EVENT_CACHE_DAYS=0 이면 캐시를 쓰지 않습니다.
+
+모든 메서드는 이벤트 루프 스레드에서만 호출합니다.
+"""
+import os
+import time
+import heapq
+import asyncio
+import logging
+from bisect import bisect_left, bisect_right, insort
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+
+EVENT_CACHE_DAYS = int(os.getenv("EVENT_CACHE_DAYS", "2"))
+EVENT_CACHE_MAX_STALENESS = float(os.getenv("EVENT_CACHE_MAX_STALENESS", "10"))  # 초, 넘으면 백그라운드 재적재
+EVENT_CACHE_MAX_SERVE_STALENESS = float(os.getenv("EVENT_CACHE_MAX_SERVE_STALENESS", "60"))  # 초, 넘으면 캐시 미사용
+
+RTD_INDEX_FIELDS = ("rtd_code", "regioncode", "rtd_loc")
+
+# create_user_report 가 캐시에 넣는 행 (user_report_by_day 행과 같은 필드)
+ReportRow = namedtuple("ReportRow", [
+    "day", "report_at", "report_id", "report_by_id", "middle_type", "small_type",
+    "report_location", "report_content", "report_lat", "report_lot", "visible", "delete_vote"
+])
+
+
+def first_rtd_filter(rtd_loc=None, regioncode=None, rtd_code=None):
+    """
+    RTD 검색에 적용할 필터 (필드, 값). 없으면 None
+    /rtd/search 의 모든 경로(캐시, 날짜 버킷, 커서 조회)가 같은 우선순위(rtd_loc > regioncode > rtd_code)로 하나만 적용합니다.
+    """
+    if rtd_loc:
+        return "rtd_loc", rtd_loc
+    if regioncode:
+        return "regioncode", regioncode
+    if rtd_code is not None:
+        return "rtd_code", rtd_code
+    return None
+
+
+def _naive_utc(ts: datetime) -> datetime:
+    """드라이버가 돌려주는 값과 같도록 UTC naive 로 맞춤"""
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return ts
+
+
+class _MaxKey:
+    """bisect 상한용: 어떤 ID 보다 큰 값"""
+
+    def __lt__(self, other):
+        return False
+
+    def __gt__(self, other):
+        return True
+
+
+_MAX_KEY = _MaxKey()
+
+
+class _Snapshot:
+    """한 번 적재한 캐시 내용. 재적재 시 새로 만들어 통째로 교체합니다."""
+
+    def __init__(self, window_start: datetime):
+        self.window_start = window_start
+        self.rtd = {}            # (rtd_time, id) -> row
+        self.rtd_timeline = []   # [(rtd_time, id)] 시간순
+        self.reports = {}        # report_id -> row
+        self.report_timeline = []  # [(report_at, report_id)] 시간순
+        self.index = {field: {} for field in RTD_INDEX_FIELDS}  # field -> 값 -> {(rtd_time, id)}
+
+    def put_rtd(self, row):
+        key = (_naive_utc(row.rtd_time), row.id)
+        if key not in self.rtd:
+            insort(self.rtd_timeline, key)
+            for field in RTD_INDEX_FIELDS:
+                self.index[field].setdefault(getattr(row, field), set()).add(key)
+        self.rtd[key] = row
+
+    def put_report(self, row):
+        if row.report_id not in self.reports:
+            insort(self.report_timeline, (_naive_utc(row.report_at), row.report_id))
+        self.reports[row.report_id] = row
+
+    def drop_report(self, report_id):
+        row = self.reports.pop(report_id, None)
+        if row is not None:
+            self.report_timeline.remove((_naive_utc(row.report_at), report_id))
+
+
+class EventCache:
+    def __init__(self, buckets, days: int = EVENT_CACHE_DAYS, max_staleness: float = EVENT_CACHE_MAX_STALENESS,
+                 max_serve_staleness: float = EVENT_CACHE_MAX_SERVE_STALENESS):
+        self.buckets = buckets
+        self.days = days
+        self.max_staleness = max_staleness
+        self.max_serve_staleness = max(max_serve_staleness, max_staleness)
+        self._snapshot = None
+        self._loaded_at = 0.0
+        self._refresh_task = None
+        self._replay = None  # 재적재 중 들어온 로컬 쓰기 (새 스냅샷에 다시 적용)
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.last_reload_sec = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.days > 0
+
+    # ---- 적재 ----
+    async def _reload(self):
+        started = time.time()
+        now = datetime.now(timezone.utc)
+        window_start = now - timedelta(days=self.days)
+        self._replay = []
+        try:
+            rtd_rows, report_rows = await asyncio.gather(
+                self.buckets.rtd_rows_async(window_start, now + timedelta(days=1), descending=False),
+                self.buckets.report_rows_async(window_start, now + timedelta(days=1), descending=False)
+            )
+            snapshot = _Snapshot(_naive_utc(window_start))
+            for row in rtd_rows:
+                snapshot.put_rtd(row)
+            for row in report_rows:
+                snapshot.put_report(row)
+            for apply in self._replay:
+                apply(snapshot)
+        finally:
+            self._replay = None
+        self._snapshot = snapshot
+        self._loaded_at = started
+        self.reloads += 1
+        self.last_reload_sec = time.time() - started
+        logging.info(
+            f"[EventCache] {len(snapshot.rtd)}건 RTD, {len(snapshot.reports)}건 제보 적재 ({self.last_reload_sec:.2f}초)"
+        )
+
+    async def _refresh(self):
+        try:
+            await self._reload()
+        except Exception as e:
+            logging.error(f"[EventCache] 적재 실패: {e}")
+        finally:
+            self._refresh_task = None
+
+    def _current_snapshot(self):
+        """
+        응답에 쓸 스냅샷. 오래됐으면 백그라운드 재적재를 한 번만 시작하고 이전 스냅샷을 돌려줍니다.
+        스냅샷이 없거나 max_serve_staleness 보다 오래됐으면 None
+        """
+        age = time.time() - self._loaded_at
+        if (self._snapshot is None or age > self.max_staleness) and self._refresh_task is None:
+            self._refresh_task = asyncio.get_running_loop().create_task(self._refresh())
+        if self._snapshot is None or age > self.max_serve_staleness:
+            return None
+        return self._snapshot
+
+    # ---- 조회 ----
+    async def search(self, start: datetime, end: datetime, descending: bool = True,
+                     rtd_loc=None, regioncode=None, rtd_code=None):
+        """
+        [start, end] 구간의 ("rtd" | "report", row) 목록을 시간순으로 반환합니다.
+        구간이 캐시 범위를 벗어나거나 사용할 스냅샷이 없으면 None (호출 측에서 Cassandra 로 조회).
+        제보는 기존 검색과 같이 필터 조건 없이 포함합니다.
+        """
+        if not self.enabled:
+            return None
+        snap = self._current_snapshot()
+        start, end = _naive_utc(start), _naive_utc(end)
+        if snap is None or start < snap.window_start:
+            self.misses += 1
+            return None
+        self.hits += 1
+
+        rtd_filter = first_rtd_filter(rtd_loc, regioncode, rtd_code)
+        if rtd_filter is not None:
+            field, value = rtd_filter
+            rtd_keys = sorted(key for key in snap.index[field].get(value, ()) if start <= key[0] <= end)
+        else:
+            rtd_keys = snap.rtd_timeline[
+                bisect_left(snap.rtd_timeline, (start,)):bisect_right(snap.rtd_timeline, (end, _MAX_KEY))
+            ]
+        report_keys = snap.report_timeline[
+            bisect_left(snap.report_timeline, (start,)):bisect_right(snap.report_timeline, (end, _MAX_KEY))
+        ]
+
+        if descending:
+            rtd_keys, report_keys = reversed(rtd_keys), reversed(report_keys)
+        merged = heapq.merge(
+            ((key[0], "rtd", key) for key in rtd_keys),
+            ((key[0], "report", key[1]) for key in report_keys),
+            key=lambda item: item[0], reverse=descending
+        )
+        return [
+            (kind, snap.rtd[key] if kind == "rtd" else snap.reports[key])
+            for _, kind, key in merged
+        ]
+
+    # ---- 로컬 쓰기 반영 ----
+    def _apply(self, mutate):
+        if self._snapshot is not None:
+            mutate(self._snapshot)
+        if self._replay is not None:
+            self._replay.append(mutate)
+
+    def add_report(self, row: ReportRow):
+        # 버킷에서 읽은 행과 같이 report_at 을 UTC naive 로 (응답 직렬화/정렬이 같은 형식이 되도록)
+        row = row._replace(report_at=_naive_utc(row.report_at))
+        self._apply(lambda snap: snap.put_report(row))
+
+    def remove_report(self, report_id):
+        self._apply(lambda snap: snap.drop_report(report_id))
+
+    def update_report(self, report_id, **fields):
+        def mutate(snap):
+            row = snap.reports.get(report_id)
+            if row is not None:
+                snap.reports[report_id] = row._replace(**fields)
+        self._apply(mutate)
+
+    def update_rtd(self, rtd_time, rtd_id, **fields):
+        key = (_naive_utc(rtd_time), rtd_id)
+
+        def mutate(snap):
+            row = snap.rtd.get(key)
+            if row is not None:
+                snap.rtd[key] = row._replace(**fields)
+        self._apply(mutate)
+
+    # ---- 상태 ----
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        snap = self._snapshot
+        return {
+            "enabled": self.enabled,
+            "days": self.days,
+            "max_staleness_sec": self.max_staleness,
+            "staleness_sec": round(time.time() - self._loaded_at, 3) if snap is not None else None,
+            "refreshing": self._refresh_task is not None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else None,
+            "reloads": self.reloads,
+            "last_reload_sec": round(self.last_reload_sec, 3),
+            "rtd_count": len(snap.rtd) if snap is not None else 0,
+            "report_count": len(snap.reports) if snap is not None else 0,
+        }
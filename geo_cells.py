@@ -0,0 +1,178 @@
+# geo_cells.py
+
+"""
+격자 셀(GRID_CELL_DEG 도 단위) 공간 조회 테이블.
+
+지도 화면은 화면 영역 안의 이벤트만 필요하지만, 기존 조회는 기간 안의 전체 이벤트를 내려보내고 앱에서 걸러야 했습니다.
+저장 시점에 좌표가 속한 격자 셀을 계산해 (셀, 날짜) 파티션에 이중 기록하고,
+조회 시에는 영역을 덮는 셀 × 기간의 날짜 파티션만 읽은 뒤 정확한 영역(사각형 / 반경)으로 한 번 더 거릅니다.
+
+  - rtd_by_cell: rtd_db 와 같은 행 (좌표가 있는 행만)
+  - user_report_by_cell: user_report 와 같은 행 (좌표가 있는 행만)
+
+투표 상태(visible / vote_count / delete_vote)는 날짜 버킷 테이블과 같이 투표 시 함께 갱신합니다.
+셀 크기를 바꾸면 기존 행의 셀이 달라지므로 테이블을 비우고 backfill_indexes.py cells 로 다시 채워야 합니다.
+"""
+import os
+import math
+import asyncio
+from datetime import datetime
+
+from cassandra_aio import aexecute_all
+from time_buckets import day_of, days_between
+
+GRID_CELL_DEG = 0.1  # 약 11km (위도 기준)
+CELL_FANOUT = int(os.getenv("CELL_FANOUT", "16"))  # 동시에 조회할 (셀, 날짜) 파티션 수
+NEARBY_MAX_PARTITIONS = int(os.getenv("NEARBY_MAX_PARTITIONS", "400"))  # 한 요청에서 읽을 수 있는 파티션 수 상한
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEG_LAT = 111.32
+
+SCHEMA_CQL = [
+    """
+    CREATE TABLE IF NOT EXISTS rtd_by_cell (
+        cell text,
+        day date,
+        rtd_time timestamp,
+        id uuid,
+        rtd_code int,
+        rtd_loc text,
+        rtd_details list<text>,
+        regioncode bigint,
+        latitude double,
+        longitude double,
+        visible boolean,
+        vote_count int,
+        PRIMARY KEY ((cell, day), rtd_time, id)
+    ) WITH CLUSTERING ORDER BY (rtd_time DESC, id ASC)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS user_report_by_cell (
+        cell text,
+        day date,
+        report_at timestamp,
+        report_id uuid,
+        report_by_id text,
+        middle_type text,
+        small_type text,
+        report_location text,
+        report_content text,
+        report_lat double,
+        report_lot double,
+        visible boolean,
+        delete_vote int,
+        PRIMARY KEY ((cell, day), report_at, report_id)
+    ) WITH CLUSTERING ORDER BY (report_at DESC, report_id ASC)
+    """,
+]
+
+RTD_BY_CELL_INSERT_CQL = """
+    INSERT INTO rtd_by_cell (
+      cell, day, rtd_time, id, rtd_code, rtd_loc, rtd_details,
+      regioncode, latitude, longitude
+    ) VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
+    """
+
+REPORT_BY_CELL_INSERT_CQL = """
+    INSERT INTO user_report_by_cell (
+      cell, day, report_at, report_id, report_by_id, middle_type, small_type,
+      report_location, report_content, report_lat, report_lot, visible, delete_vote
+    ) VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
+    """
+
+
+def ensure_geo_schema(session):
+    """셀 테이블이 없으면 생성합니다. (IF NOT EXISTS 이므로 여러 번 호출해도 안전)"""
+    for cql in SCHEMA_CQL:
+        session.execute(cql)
+
+
+def _cell_index(value: float) -> int:
+    return math.floor(value / GRID_CELL_DEG)
+
+
+def cell_of(lat, lon):
+    """좌표가 속한 격자 셀 키 ("위도칸:경도칸"). 좌표가 없으면 None"""
+    if lat is None or lon is None:
+        return None
+    return f"{_cell_index(lat)}:{_cell_index(lon)}"
+
+
+def valid_coordinate(lat, lon) -> bool:
+    return lat is not None and lon is not None and -90 <= lat <= 90 and -180 <= lon <= 180
+
+
+def cell_count_in_bbox(min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> int:
+    """cells_in_bbox 가 돌려줄 셀 수 (목록을 만들지 않고 계산 — 너무 넓은 영역을 먼저 거절할 때 사용)"""
+    rows = _cell_index(max_lat) - _cell_index(min_lat) + 1
+    cols = _cell_index(max_lon) - _cell_index(min_lon) + 1
+    return max(rows, 0) * max(cols, 0)
+
+
+def cells_in_bbox(min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> list:
+    """사각형 영역을 덮는 격자 셀 키 목록 (넓은 영역은 먼저 cell_count_in_bbox 로 크기를 확인)"""
+    return [
+        f"{row}:{col}"
+        for row in range(_cell_index(min_lat), _cell_index(max_lat) + 1)
+        for col in range(_cell_index(min_lon), _cell_index(max_lon) + 1)
+    ]
+
+
+def radius_bbox(lat: float, lon: float, radius_km: float) -> tuple:
+    """중심 + 반경을 덮는 (min_lat, min_lon, max_lat, max_lon). 위도/경도 범위를 넘는 부분은 잘라냅니다."""
+    dlat = radius_km / KM_PER_DEG_LAT
+    dlon = radius_km / (KM_PER_DEG_LAT * max(math.cos(math.radians(lat)), 1e-6))
+    return max(lat - dlat, -90.0), max(lon - dlon, -180.0), min(lat + dlat, 90.0), min(lon + dlon, 180.0)
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def rtd_by_cell_params(rtd_code, rtd_time, rec_id, rtd_loc, rtd_details,
+                       regioncode=None, latitude=None, longitude=None):
+    """rtd_db INSERT 파라미터 순서 그대로 받아 rtd_by_cell INSERT 파라미터로 변환 (좌표가 없으면 None)"""
+    cell = cell_of(latitude, longitude)
+    if cell is None:
+        return None
+    return (cell, day_of(rtd_time), rtd_time, rec_id, rtd_code, rtd_loc, rtd_details,
+            regioncode, latitude, longitude)
+
+
+class CellQueries:
+    """(셀, 날짜) 파티션 조회. CELL_FANOUT 개씩 동시에 질의합니다."""
+
+    def __init__(self, session, fanout: int = CELL_FANOUT):
+        self.session = session
+        self.fanout = max(fanout, 1)
+        self._stmts = {}
+        for table, ts_col in (("rtd_by_cell", "rtd_time"), ("user_report_by_cell", "report_at")):
+            self._stmts[table] = session.prepare(
+                f"SELECT * FROM {table} WHERE cell = ? AND day = ? AND {ts_col} >= ? AND {ts_col} <= ?"
+            )
+
+    @staticmethod
+    def partition_count(cell_count: int, start: datetime, end: datetime) -> int:
+        """셀 cell_count 개 × 기간의 날짜 파티션 수 (목록을 만들지 않고 계산)"""
+        return cell_count * max((day_of(end) - day_of(start)).days + 1, 0)
+
+    async def _scan(self, table: str, cells: list, start: datetime, end: datetime) -> list:
+        stmt = self._stmts[table]
+        limiter = asyncio.Semaphore(self.fanout)
+
+        async def read(cell, day):
+            async with limiter:
+                return await aexecute_all(self.session, stmt, (cell, day, start, end))
+
+        days = days_between(start, end)
+        pages = await asyncio.gather(*(read(cell, day) for cell in cells for day in days))
+        return [row for rows in pages for row in rows]
+
+    async def rtd_rows(self, cells: list, start: datetime, end: datetime) -> list:
+        return await self._scan("rtd_by_cell", cells, start, end)
+
+    async def report_rows(self, cells: list, start: datetime, end: datetime) -> list:
+        return await self._scan("user_report_by_cell", cells, start, end)
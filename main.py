@@ -7,6 +7,7 @@ import logging
 import select
 import re
 import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
 from io import StringIO
 from uuid import uuid4, uuid5, NAMESPACE_DNS
@@ -18,15 +19,19 @@ import xml.etree.ElementTree as ET
 from bs4 import BeautifulSoup
 from konlpy.tag import Okt  # 형태소 분석기
 
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.chrome.service import Service
 import pandas as pd
 from functools import partial
-from ner_utils import extract_locations
+from ner_utils import extract_locations_batch
 from fcm_sender import send_broadcast_data_message
+from safekorea_client import SafeKoreaClient
+from webdriver_pool import WebDriverPool, create_chrome_driver, extract_rows_script, extract_rows_legacy
+from message_dedup import HighWaterMarkDedup
+from adaptive_poller import AdaptivePoller
+from recent_ids import RecentIdCache
+from report_expiry import ReportDeactivator
+from time_buckets import ensure_schema, rtd_by_day_params, RTD_BY_DAY_INSERT_CQL
+from geo_cells import ensure_geo_schema, rtd_by_cell_params, RTD_BY_CELL_INSERT_CQL
+from change_log import ensure_change_log_schema, change_params, CHANGE_INSERT_CQL
 
 # .env 파일의 절대 경로를 지정하여 로드
 dotenv_path = os.path.join(os.path.dirname(__file__), '.env')
@@ -43,6 +48,8 @@ load_dotenv()
 API_KEY = os.getenv("API_KEY", "7dWUeNJAqaan8oJAs5CbDWKnWaJpLWoxd+lB97UDDRgFfSjfKD7ZGHxM+kRAoZqsga+WlheugBMS2q9WCSaUNg==")
 EQ_API_KEY = os.getenv("EQ_API_KEY", "F5Iz7aHpRUSSM-2h6ZVE2w")
 CHROME_DRIVER_PATH = '/usr/local/bin/chromedriver'
+# 재난문자 수집 방식: "http"(기본, 실패 시 Selenium 대체) 또는 "selenium"(항상 브라우저 사용)
+SAFEKOREA_FETCH_MODE = os.getenv("SAFEKOREA_FETCH_MODE", "http").lower()
 
 logging.basicConfig(
     level=logging.INFO,
@@ -225,8 +232,11 @@ class CassandraConnector:
                 logging.info(f"Cassandra 연결 시도 중... (시도 {attempt + 1}/5)")
                 from cassandra.auth import PlainTextAuthProvider
                 from cassandra.cluster import Cluster
+                from cassandra.policies import TokenAwarePolicy, DCAwareRoundRobinPolicy
                 auth_provider = PlainTextAuthProvider(username="andy013", password="1212")
-                self.cluster = Cluster(["127.0.0.1"], port=9042, auth_provider=auth_provider)
+                # prepared 문은 파티션 키로 replica 를 찾아 바로 보냄 (token-aware 라우팅)
+                self.cluster = Cluster(["127.0.0.1"], port=9042, auth_provider=auth_provider,
+                                       load_balancing_policy=TokenAwarePolicy(DCAwareRoundRobinPolicy()))
                 self.session = self.cluster.connect(self.keyspace)
                 logging.info("✅ Cassandra 연결 완료.")
                 return
@@ -237,6 +247,9 @@ class CassandraConnector:
 
 
 connector = CassandraConnector()
+ensure_schema(connector.session)
+ensure_geo_schema(connector.session)
+ensure_change_log_schema(connector.session)
 
 # ---------------------------------------------------------------------------
 # 지오코딩 및 행정구역 코드 조회
@@ -259,7 +272,9 @@ GEO_CACHE_PATH = "geocode_cache.json"
 FAILED_LOG_PATH = "failed_geocodes.log"
 
 # 지오코딩 객체 초기화
-geolocator = Nominatim(user_agent='South Korea')
+# NOMINATIM_DOMAIN 을 지정하면 자체 운영 Nominatim 을 사용 (일괄 작업에서 요청 간격을 줄일 때)
+NOMINATIM_DOMAIN = os.getenv("NOMINATIM_DOMAIN")
+geolocator = Nominatim(user_agent='South Korea', **({"domain": NOMINATIM_DOMAIN} if NOMINATIM_DOMAIN else {}))
 
 # 캐시 로드
 if os.path.exists(GEO_CACHE_PATH):
@@ -268,16 +283,47 @@ if os.path.exists(GEO_CACHE_PATH):
 else:
     geocode_cache = {}
 
+# 백필/일괄 처리에서 여러 스레드가 동시에 조회하므로 캐시 파일 쓰기는 락으로 직렬화
+cache_lock = threading.Lock()
+
+# Nominatim 이용 정책(초당 1회)을 지키기 위한 요청 간 최소 간격
+NOMINATIM_MIN_INTERVAL = float(os.getenv("NOMINATIM_MIN_INTERVAL", "1.0"))
+
+
+class RateLimiter:
+    """호출 간 최소 간격을 지키는 스레드 안전 제한기 (min_interval <= 0 이면 제한 없음)"""
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._last_call = 0.0
+
+    def wait(self):
+        if self.min_interval <= 0:
+            return
+        with self._lock:
+            wait = self.min_interval - (time.time() - self._last_call)
+            if wait > 0:
+                time.sleep(wait)
+            self._last_call = time.time()
+
+
+# 수집기 프로세스 전체가 공유하는 기본 제한기. 일괄 작업(re_ner, messageroll)은 자체 제한기를 넘겨
+# 간격을 따로 설정할 수 있습니다. (자체 운영 Nominatim 이면 0 으로 제한 해제)
+nominatim_limiter = RateLimiter(NOMINATIM_MIN_INTERVAL)
+
 # 캐시 저장 함수
 def save_geocode_cache():
     try:
-        with open(GEO_CACHE_PATH, "w", encoding="utf-8") as f:
-            json.dump(geocode_cache, f, ensure_ascii=False, indent=2)
+        with cache_lock:
+            snapshot = dict(geocode_cache)
+            with open(GEO_CACHE_PATH, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, ensure_ascii=False, indent=2)
     except Exception as e:
         logging.warning(f"[캐시 저장 실패] {e}")
 
 # 지오코딩 함수
-def geocoding(address: str) -> dict:
+def geocoding(address: str, limiter: RateLimiter = None) -> dict:
     if not address:
         return {"lat": None, "lng": None}
 
@@ -290,6 +336,7 @@ def geocoding(address: str) -> dict:
 
     # 지오코딩 요청
     try:
+        (limiter or nominatim_limiter).wait()
         location = geolocator.geocode(cleaned_address, timeout=5)
         if location:
             coords = {"lat": location.latitude, "lng": location.longitude}
@@ -324,8 +371,10 @@ else:
 
 def save_region_cache():
     try:
-        with open(REGION_CACHE_PATH, "w", encoding="utf-8") as f:
-            json.dump(region_cache, f, ensure_ascii=False, indent=2)
+        with cache_lock:
+            snapshot = dict(region_cache)
+            with open(REGION_CACHE_PATH, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, ensure_ascii=False, indent=2)
     except Exception as e:
         logging.warning(f"[지역 캐시 저장 실패] {e}")
 
@@ -367,45 +416,206 @@ def get_regioncode(address: str) -> int:
     return None
 
 
+def resolve_location(address: str, limiter: RateLimiter = None) -> tuple:
+    """지역명 → (행정코드, 위도, 경도). limiter 를 주지 않으면 프로세스 공용 제한기 사용"""
+    coords = geocoding(address, limiter)
+    lat = float(coords.get('lat')) if coords.get('lat') else None
+    lng = float(coords.get('lng')) if coords.get('lng') else None
+    return get_regioncode(address), lat, lng
+
+
 # ---------------------------------------------------------------------------
 # 통합 데이터 저장 함수
 # ---------------------------------------------------------------------------
-def insert_rtd_data(rtd_code, rtd_time, rtd_loc, rtd_details,
-                    regioncode=None, latitude=None, longitude=None):
+from cassandra.query import SimpleStatement
+from cassandra_async import AsyncWriter
+
+# 재난문자 묶음 처리 시 지역 조회 동시 실행 수
+ENRICH_WORKERS = int(os.getenv("ENRICH_WORKERS", "8"))
+enrich_pool = ThreadPoolExecutor(max_workers=ENRICH_WORKERS)
+
+# 수집기/일괄 작업의 동시 쓰기 (execute_async, 진행 중 요청 수 제한)
+async_writer = AsyncWriter(connector.session)
+
+# RTD 저장은 결정적 uuid5 ID 로 멱등하므로 LWT 없이 일반 INSERT 를 하고,
+# 알림 여부(신규 레코드인가)는 최근 저장 ID 캐시로 판단합니다.
+# 캐시에 없는 ID 는 rtd_db 에 있는지 한 번 더 확인합니다. (LRU 에서 밀려났거나 저장 전에 재시작된 경우)
+RECENT_RTD_IDS_PATH = os.getenv("RECENT_RTD_IDS_PATH", "recent_rtd_ids.json")
+recent_rtd_ids = RecentIdCache(RECENT_RTD_IDS_PATH)
+RTD_EXISTS_CQL = "SELECT id FROM rtd_db WHERE rtd_time = %s AND id = %s"
+
+
+def rtd_already_stored(rtd_time, rec_id) -> bool:
+    """캐시에 없는 ID 가 rtd_db 에 이미 있으면 캐시에 기록하고 True (조회 실패 시 False)"""
+    try:
+        stored = connector.session.execute(SimpleStatement(RTD_EXISTS_CQL), (rtd_time, rec_id)).one() is not None
+    except Exception as e:
+        logging.error(f"RTD 존재 확인 실패: {rec_id} ({e})")
+        return False
+    if stored:
+        recent_rtd_ids.add(rec_id)
+    return stored
+
+def rtd_record_id(rtd_code, rtd_time, rtd_loc, rtd_details):
+    """RTD 레코드의 결정적 ID (같은 내용이면 항상 같은 uuid5)"""
     record_str = f"{rtd_code}_{rtd_time.strftime('%Y%m%d%H%M%S')}_{rtd_loc}_{'_'.join(rtd_details)}"
-    rec_id = uuid5(NAMESPACE_DNS, record_str)
-    q = """
+    return uuid5(NAMESPACE_DNS, record_str)
+
+
+def notify_rtd(rtd_code, rtd_time, rtd_loc, rtd_details, latitude=None, longitude=None):
+    """RTD 신규 저장 알림을 모든 디바이스에 전송합니다. (FCM_NOTIFICATIONS_ENABLED가 True일 때만)"""
+    if not FCM_NOTIFICATIONS_ENABLED:
+        return
+    # Construct the data payload
+    data_payload = {
+        'type': 'rtd',  # 시스템 감지 재난
+        'rtd_code': str(rtd_code),
+        'rtd_time': rtd_time.isoformat(),
+        'rtd_loc': rtd_loc,
+        'latitude': str(latitude) if latitude is not None else '',
+        'longitude': str(longitude) if longitude is not None else '',
+        'details': json.dumps(rtd_details, ensure_ascii=False)
+    }
+    # Call the shared sender function
+    send_broadcast_data_message(data_payload)
+
+
+def message_rtd_details(emergency_level, ntype, content) -> list:
+    """재난문자(rtd_code 21)의 rtd_details 구성"""
+    return [
+        f"level: {emergency_level}",
+        f"type: {ntype}",
+        f"content: {content}"
+    ]
+
+
+RTD_INSERT_CQL = """
     INSERT INTO rtd_db (
       rtd_code, rtd_time, id, rtd_loc, rtd_details,
       regioncode, latitude, longitude
-    ) VALUES (%s,%s,%s,%s,%s,%s,%s,%s) IF NOT EXISTS
+    ) VALUES (%s,%s,%s,%s,%s,%s,%s,%s)
     """
+
+
+def insert_rtd_data(rtd_code, rtd_time, rtd_loc, rtd_details,
+                    regioncode=None, latitude=None, longitude=None):
+    rec_id = rtd_record_id(rtd_code, rtd_time, rtd_loc, rtd_details)
+    if rec_id in recent_rtd_ids or rtd_already_stored(rtd_time, rec_id):
+        logging.debug(f"RTD 이미 저장됨: {rec_id}")
+        return
     params = (
         rtd_code, rtd_time, rec_id, rtd_loc, rtd_details,
         regioncode, latitude, longitude
     )
-    if execute_cassandra(q, params):
+    if execute_cassandra(RTD_INSERT_CQL, params):
         logging.info(f"RTD 저장 성공: {rec_id}")
-
-        # FCM 알림 발송 로직 추가 (FCM_NOTIFICATIONS_ENABLED가 True일 때만)
-        global FCM_NOTIFICATIONS_ENABLED
-        if FCM_NOTIFICATIONS_ENABLED:
-            # Construct the data payload
-            data_payload = {
-                'type': 'rtd',  # 시스템 감지 재난
-                'rtd_code': str(rtd_code),
-                'rtd_time': rtd_time.isoformat(),
-                'rtd_loc': rtd_loc,
-                'latitude': str(latitude) if latitude is not None else '',
-                'longitude': str(longitude) if longitude is not None else '',
-                'details': json.dumps(rtd_details, ensure_ascii=False)
-            }
-            # Call the shared sender function
-            send_broadcast_data_message(data_payload)
-
+        if not execute_cassandra(RTD_BY_DAY_INSERT_CQL, rtd_by_day_params(*params)):
+            logging.error(f"rtd_by_day 저장 실패: {rec_id}")
+        cell_params = rtd_by_cell_params(*params)
+        if cell_params is not None and not execute_cassandra(RTD_BY_CELL_INSERT_CQL, cell_params):
+            logging.error(f"rtd_by_cell 저장 실패: {rec_id}")
+        if not execute_cassandra(CHANGE_INSERT_CQL, change_params("rtd", "insert", rtd_time, rec_id)):
+            logging.error(f"event_changes 기록 실패: {rec_id}")
+        if recent_rtd_ids.add(rec_id):
+            recent_rtd_ids.flush()
+            notify_rtd(rtd_code, rtd_time, rtd_loc, rtd_details, latitude, longitude)
     else:
         logging.error(f"RTD 저장 실패: {rec_id}")
 
+
+def insert_rtd_many(records: list) -> int:
+    """
+    여러 RTD 레코드를 동시에 저장한 뒤, 저장에 성공한 레코드의 알림을 입력 순서대로 보냅니다.
+    최근에 이미 저장한 ID(및 묶음 내 중복)와, 캐시에는 없지만 rtd_db 에 이미 있는 ID 는 건너뜁니다.
+    records: (rtd_code, rtd_time, rtd_loc, rtd_details, regioncode, latitude, longitude) 튜플 목록
+    반환값: 저장 성공 건수
+    """
+    new_records, params_list, batch_ids = [], [], set()
+    for record in records:
+        rtd_code, rtd_time, rtd_loc, rtd_details, regioncode, latitude, longitude = record
+        rec_id = rtd_record_id(rtd_code, rtd_time, rtd_loc, rtd_details)
+        if rec_id in batch_ids or rec_id in recent_rtd_ids:
+            continue
+        batch_ids.add(rec_id)
+        new_records.append(record)
+        params_list.append((rtd_code, rtd_time, rec_id, rtd_loc, rtd_details, regioncode, latitude, longitude))
+    if not params_list:
+        return 0
+
+    # 캐시에 없는 ID 의 존재 확인 (대부분의 재수집 중복은 위 캐시에서 걸러지므로 신규 레코드만 조회)
+    exists = async_writer.write_many(SimpleStatement(RTD_EXISTS_CQL), [(p[1], p[2]) for p in params_list])
+    keep = []
+    for i, (success, rows) in enumerate(exists):
+        if success and rows:
+            recent_rtd_ids.add(params_list[i][2])
+        else:
+            keep.append(i)
+    records = [new_records[i] for i in keep]
+    params_list = [params_list[i] for i in keep]
+    if not params_list:
+        return 0
+
+    results = list(async_writer.write_many(SimpleStatement(RTD_INSERT_CQL), params_list))
+
+    # 날짜 버킷 / 격자 셀 조회 테이블 이중 기록 (원본 저장에 성공한 행만, 셀은 좌표가 있는 행만)
+    stored_params = [params for params, (success, _) in zip(params_list, results) if success]
+    bucket_result = async_writer.write_many(
+        SimpleStatement(RTD_BY_DAY_INSERT_CQL),
+        [rtd_by_day_params(*params) for params in stored_params],
+        keep_results=False
+    )
+    for bucket_params, e in bucket_result.errors:
+        logging.error(f"rtd_by_day 저장 실패: {bucket_params[2]} ({e})")
+    cell_result = async_writer.write_many(
+        SimpleStatement(RTD_BY_CELL_INSERT_CQL),
+        [p for p in (rtd_by_cell_params(*params) for params in stored_params) if p is not None],
+        keep_results=False
+    )
+    for cell_params, e in cell_result.errors:
+        logging.error(f"rtd_by_cell 저장 실패: {cell_params[3]} ({e})")
+    # 델타 동기화용 변경 로그
+    change_result = async_writer.write_many(
+        SimpleStatement(CHANGE_INSERT_CQL),
+        [change_params("rtd", "insert", params[1], params[2]) for params in stored_params],
+        keep_results=False
+    )
+    for change, e in change_result.errors:
+        logging.error(f"event_changes 기록 실패: {change[5]} ({e})")
+
+    stored, to_notify = 0, []
+    for record, params, (success, result) in zip(records, params_list, results):
+        if not success:
+            logging.error(f"RTD 저장 실패: {params[2]} ({result})")
+            continue
+        stored += 1
+        logging.info(f"RTD 저장 성공: {params[2]}")
+        if recent_rtd_ids.add(params[2]):
+            to_notify.append(record)
+    # 알림 전에 캐시를 파일에 기록 (알림 도중 중단되어도 재시작 후 같은 알림을 다시 보내지 않도록)
+    recent_rtd_ids.flush()
+    for rtd_code, rtd_time, rtd_loc, rtd_details, _, latitude, longitude in to_notify:
+        notify_rtd(rtd_code, rtd_time, rtd_loc, rtd_details, latitude, longitude)
+    return stored
+
+
+def save_collected_rows(insert_cql: str, rows: list, label: str) -> int:
+    """
+    수집기 공통 저장: 원본 테이블 행을 동시에 저장하고, 저장에 성공한 행의 RTD 레코드를 insert_rtd_many 로 저장합니다.
+    rows: (원본 INSERT 파라미터, RTD 레코드 튜플) 목록
+    반환값: 원본 테이블 저장 성공 건수
+    """
+    if not rows:
+        return 0
+    results = async_writer.write_many(SimpleStatement(insert_cql), [params for params, _ in rows])
+    rtd_records = []
+    for (params, rtd_record), (success, result) in zip(rows, results):
+        if success:
+            rtd_records.append(rtd_record)
+        else:
+            logging.error(f"{label} 저장 실패 ({params[0]}): {result}")
+    insert_rtd_many(rtd_records)
+    return len(rtd_records)
+
 # ---------------------------------------------------------------------------
 # 1. 대기질 예보 수집 (rtd_code 72)
 # ---------------------------------------------------------------------------
@@ -451,6 +661,7 @@ def get_air_inform():
     if not isinstance(items, list):
         items = [items]
 
+    records = []
     for item in items:
         inform_date = item.get("informData", "").strip()
         if inform_date != today:
@@ -476,8 +687,7 @@ def get_air_inform():
                 for region in bad_regions:
                     coords = geocoding(region)
                     region_cd = get_regioncode(region)
-                    # ↓ 여기만 바뀜: print → insert_rtd_data
-                    insert_rtd_data(
+                    records.append((
                         72,
                         dt,
                         region,
@@ -485,10 +695,11 @@ def get_air_inform():
                         region_cd,
                         float(coords['lat']) if coords['lat'] else None,
                         float(coords['lng']) if coords['lng'] else None
-                    )
+                    ))
             else:
                 logging.info("나쁨 등급 지역 없음")
 
+    insert_rtd_many(records)
     logging.info("대기질 예보 수집 완료")
 
 
@@ -520,6 +731,7 @@ def get_air_grade():
     if isinstance(items, dict):
         items = [items]
 
+    records = []
     for it in items:
         # 시간 파싱
         try:
@@ -551,8 +763,7 @@ def get_air_grade():
             # 행정구역 코드 조회
             region_cd = get_regioncode(station)
 
-            # RTD 저장
-            insert_rtd_data(
+            records.append((
                 71,
                 dt,
                 station,
@@ -560,8 +771,10 @@ def get_air_grade():
                 region_cd,
                 float(coords["lat"]) if coords["lat"] else None,
                 float(coords["lng"]) if coords["lng"] else None
-            )
+            ))
 
+    # RTD 저장 (동시 쓰기)
+    insert_rtd_many(records)
     logging.info("실시간 대기질 등급 수집 완료")
 
 # ---------------------------------------------------------------------------
@@ -593,8 +806,12 @@ def fetch_earthquake_data():
         logging.error(f"지진 데이터 최신 eq_time 조회 오류: {e}")
         latest_eq_time = None
 
+    insert_stmt = """
+    INSERT INTO domestic_earthquake (eq_no, eq_time, eq_lat, eq_lot, eq_mag, eq_msg)
+    VALUES (%s, %s, %s, %s, %s, %s)
+    """
     total_rows = 0
-    saved_count = 0
+    rows = []
     for row in csv_data:
         if not row or row[0].strip().startswith("#"):
             continue
@@ -623,24 +840,20 @@ def fetch_earthquake_data():
             record_str = f"{dt.strftime('%Y%m%d%H%M%S')}_{lat_num}_{lon_num}_{magnitude}"
             record_id = uuid5(NAMESPACE_DNS, record_str)
 
-            insert_stmt = """
-            INSERT INTO domestic_earthquake (eq_no, eq_time, eq_lat, eq_lot, eq_mag, eq_msg)
-            VALUES (%s, %s, %s, %s, %s, %s) IF NOT EXISTS
-            """
-            if execute_cassandra(insert_stmt, (record_id, dt, lat_num, lon_num, magnitude, msg)):
-                saved_count += 1
-                rtd_details = [
-                    f"magnitude: {magnitude}",
-                    f"location: {location}",
-                    f"latitude: {lat_num}",
-                    f"longitude: {lon_num}"
-                ]
-                insert_rtd_data(51, dt, location, rtd_details)
-            else:
-                logging.error(f"지진 저장 실패 (record: {record_str})")
+            rtd_details = [
+                f"magnitude: {magnitude}",
+                f"location: {location}",
+                f"latitude: {lat_num}",
+                f"longitude: {lon_num}"
+            ]
+            rows.append((
+                (record_id, dt, lat_num, lon_num, magnitude, msg),
+                (51, dt, location, rtd_details, None, None, None)
+            ))
         except Exception as e:
             logging.error(f"지진 파싱 오류 (row: {row}): {e}")
 
+    saved_count = save_collected_rows(insert_stmt, rows, "지진")
     logging.info(f"지진 정보 저장 완료: {total_rows}행 중 {saved_count}건 저장됨")
 
 
@@ -718,19 +931,25 @@ def get_typhoon_data():
         logging.info("새로운 태풍 정보가 없습니다.")
         return
 
-    saved_count = 0
+    insert_query = """
+    INSERT INTO domestic_typhoon (
+        typ_no, forecast_time, typ_name, typ_dir, typ_lat, typ_lon,
+        typ_location, intensity, wind_radius
+    )
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+    """
+    rows = []
     for item in data:
         unique_str = f"{item['forecast_time'].strftime('%Y%m%d%H%M')}_{item['typ_name']}_{item['typ_lat']}_{item['typ_lon']}"
         typ_no = uuid5(NAMESPACE_DNS, unique_str)
-        insert_query = """
-        INSERT INTO domestic_typhoon (
-            typ_no, forecast_time, typ_name, typ_dir, typ_lat, typ_lon,
-            typ_location, intensity, wind_radius
-        )
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-        IF NOT EXISTS
-        """
-        if execute_cassandra(insert_query, (
+        rtd_details = [
+            f"typ_name: {item['typ_name']}",
+            f"typ_dir: {item['typ_dir']}",
+            f"intensity: {item['intensity']}",
+            f"wind_radius: {item['wind_radius']}"
+        ]
+        rows.append((
+            (
                 typ_no,
                 item['forecast_time'],
                 item['typ_name'],
@@ -740,18 +959,11 @@ def get_typhoon_data():
                 item['typ_location'],
                 item['intensity'],
                 item['wind_radius']
-        )):
-            saved_count += 1
-            rtd_details = [
-                f"typ_name: {item['typ_name']}",
-                f"typ_dir: {item['typ_dir']}",
-                f"intensity: {item['intensity']}",
-                f"wind_radius: {item['wind_radius']}"
-            ]
-            insert_rtd_data(31, item['forecast_time'], item['typ_location'], rtd_details)
-        else:
-            logging.error(f"태풍 정보 저장 실패 (typ_no: {typ_no})")
+            ),
+            (31, item['forecast_time'], item['typ_location'], rtd_details, None, None, None)
+        ))
 
+    saved_count = save_collected_rows(insert_query, rows, "태풍 정보")
     logging.info(f"태풍 정보 저장 완료: {len(data)}건 중 {saved_count}건 저장됨")
 
 
@@ -849,7 +1061,12 @@ def get_flood_data():
         logging.info("새로운 홍수 정보가 없습니다.")
         return
 
-    saved_count = 0
+    insert_flood_cql = """
+    INSERT INTO RealTimeFlood (
+        fld_no, fld_region, fld_alert, fld_time, comment
+    ) VALUES (%s, %s, %s, %s, %s)
+    """
+    rows = []
     for item in data:
         comment_str = "; ".join(item["details"])
         alert_stat = item["status"].replace("예경보 현황: ", "")
@@ -861,23 +1078,16 @@ def get_flood_data():
             continue
 
         fld_no = uuid5(NAMESPACE_DNS, f"{item['time'].strftime('%Y%m%d%H%M')}_{item['loc']}_{comment_str}")
-
-        insert_flood_cql = """
-        INSERT INTO RealTimeFlood (
-            fld_no, fld_region, fld_alert, fld_time, comment
-        ) VALUES (%s, %s, %s, %s, %s) IF NOT EXISTS
-        """
-        if execute_cassandra(insert_flood_cql, (
-            fld_no,
-            item["loc"],
-            alert_stat,
-            item["time"],
-            comment_str
-        )):
-            saved_count += 1
-
+        rows.append((
+            (
+                fld_no,
+                item["loc"],
+                alert_stat,
+                item["time"],
+                comment_str
+            ),
             # RTD 저장도 함께
-            insert_rtd_data(
+            (
                 item["code"],
                 item["time"],
                 item["loc"],
@@ -886,9 +1096,9 @@ def get_flood_data():
                 item.get("lat"),
                 item.get("lon")
             )
-        else:
-            logging.error("RealTimeFlood 저장 실패")
+        ))
 
+    saved_count = save_collected_rows(insert_flood_cql, rows, "RealTimeFlood")
     logging.info(f"홍수 정보 저장 완료: {len(data)}건 중 {saved_count}건 저장됨")
 
 # ---------------------------------------------------------------------------
@@ -970,7 +1180,13 @@ def get_warning_data():
         logging.info("새로운 주의보 정보가 없습니다.")
         return
 
-    saved_count = 0
+    insert_query = """
+    INSERT INTO ForecastAnnouncement (
+        announce_no, disaster_region, alert_type, announce_time, comment
+    )
+    VALUES (%s, %s, %s, %s, %s)
+    """
+    rows = []
     for item in data:
         rtd_code = item['rtd_code']
         rtd_time = item['rtd_time']
@@ -988,75 +1204,31 @@ def get_warning_data():
             alert_stat = "정보없음"
         unique_str = f"{rtd_loc}_{alert_type}_{rtd_time.strftime('%Y%m%d%H%M')}"
         announce_no = uuid5(NAMESPACE_DNS, unique_str)
-        insert_query = """
-        INSERT INTO ForecastAnnouncement (
-            announce_no, disaster_region, alert_type, announce_time, comment
-        )
-        VALUES (%s, %s, %s, %s, %s)
-        IF NOT EXISTS
-        """
         comment = f"기상특보 자동 수집 / {alert_type}"
-        if execute_cassandra(insert_query, (announce_no, rtd_loc, alert_type, rtd_time, comment)):
-            saved_count += 1
-            insert_rtd_data(rtd_code, rtd_time, rtd_loc, rtd_details)
-        else:
-            logging.error(f"주의보 정보 저장 실패 (announce_no: {announce_no})")
+        rows.append((
+            (announce_no, rtd_loc, alert_type, rtd_time, comment),
+            (rtd_code, rtd_time, rtd_loc, rtd_details, None, None, None)
+        ))
+
+    saved_count = save_collected_rows(insert_query, rows, "주의보 정보")
     logging.info(f"주의보 정보 저장 완료: {len(data)}건 중 {saved_count}건 저장됨")
 
 
 # ---------------------------------------------------------------------------
 # 7. 오래된 사용자 제보 비활성화
 # ---------------------------------------------------------------------------
+_report_deactivator = None
+
+
 def deactivate_old_user_reports():
-    """3일이 지난 사용자 제보 중 visible=true인 항목을 false로 변경합니다."""
+    """노출 기간(REPORT_VISIBLE_DAYS)이 지난 사용자 제보 중 visible=true인 항목을 false로 변경합니다."""
+    global _report_deactivator
     logging.info("오래된 사용자 제보 비활성화 작업 시작")
-    three_days_ago = datetime.now(timezone.utc) - timedelta(days=3)
-
     try:
-        # user_report_by_time 테이블을 사용하여 3일 이전의 제보를 조회합니다.
-        # 이 테이블은 시간 기반 조회를 위해 존재할 가능성이 높습니다.
-        # 기존 코드에서 ALLOW FILTERING을 사용하므로 동일한 패턴을 따릅니다.
-        select_query = """
-            SELECT report_by_id, report_at, visible
-            FROM user_report_by_time
-            WHERE report_at < %s ALLOW FILTERING
-        """
-        rows = connector.session.execute(select_query, (three_days_ago,))
-
-        reports_to_update = []
-        for row in rows:
-            if row.visible:
-                reports_to_update.append((row.report_by_id, row.report_at))
-
-        if not reports_to_update:
-            logging.info("비활성화할 오래된 사용자 제보가 없습니다.")
-            print("비활성화할 오래된 사용자 제보가 없습니다.")
-            return
-
-        logging.info(f"총 {len(reports_to_update)}개의 오래된 제보를 비활성화합니다.")
-        print(f"총 {len(reports_to_update)}개의 오래된 제보를 비활성화합니다.")
-
-        # BatchStatement를 사용하여 여러 업데이트를 한 번에 처리
-        from cassandra.query import BatchStatement, SimpleStatement
-        batch = BatchStatement()
-        update_query = "UPDATE user_report SET visible = false WHERE report_by_id = %s AND report_at = %s"
-        
-        updated_count = 0
-        for report_by_id, report_at in reports_to_update:
-            batch.add(SimpleStatement(update_query), (report_by_id, report_at))
-            updated_count += 1
-            # 카산드라 배치 크기 제한을 고려하여 100개마다 실행
-            if updated_count % 100 == 0:
-                connector.session.execute(batch)
-                batch.clear()
-                logging.info(f"{updated_count}개 제보 비활성화 처리 중...")
-
-        if len(batch) > 0:
-            connector.session.execute(batch)
-
-        logging.info(f"오래된 사용자 제보 비활성화 작업 완료. 총 {updated_count}개 처리.")
+        if _report_deactivator is None:
+            _report_deactivator = ReportDeactivator(connector.session, async_writer)
+        updated_count = _report_deactivator.run()
         print(f"오래된 사용자 제보 비활성화 작업 완료. 총 {updated_count}개 처리.")
-
     except Exception as e:
         logging.error(f"오래된 사용자 제보 비활성화 중 오류 발생: {e}")
         print(f"오래된 사용자 제보 비활성화 중 오류 발생: {e}")
@@ -1065,17 +1237,33 @@ def deactivate_old_user_reports():
 # ---------------------------------------------------------------------------
 # 8. 재난문자 크롤러 (명령어 인터페이스 포함)
 # ---------------------------------------------------------------------------
+WEBDRIVER_POOL_SIZE = int(os.getenv("WEBDRIVER_POOL_SIZE", "1"))
+WEBDRIVER_MAX_PAGES = int(os.getenv("WEBDRIVER_MAX_PAGES", "50"))  # 이 페이지 수를 넘으면 드라이버 재생성
+WEBDRIVER_ACQUIRE_TIMEOUT = float(os.getenv("WEBDRIVER_ACQUIRE_TIMEOUT", "60"))  # 빈 드라이버 대기 최대 시간(초)
+# Selenium 추출 방식: "script"(기본, 명시적 대기 + execute_script 한 번) 또는 "legacy"(고정 대기 + 행별 find_element)
+SELENIUM_EXTRACT_MODE = os.getenv("SELENIUM_EXTRACT_MODE", "script").lower()
+DISASTER_POLL_TASK = "disaster_messages"
+
+
 class DisasterMessageCrawler:
     def __init__(self):
-        chrome_options = Options()
-        chrome_options.add_argument('--headless')
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        self.driver = webdriver.Chrome(service=Service(CHROME_DRIVER_PATH), options=chrome_options)
-        self.driver.set_page_load_timeout(30)
-        self.wait = WebDriverWait(self.driver, 20)
+        # 기본은 HTTP 클라이언트로 수집하고, 실패 시에만 headless Chrome 을 띄워 대체합니다.
+        self.http_client = SafeKoreaClient()
+        self.driver_pool = WebDriverPool(
+            partial(create_chrome_driver, CHROME_DRIVER_PATH), WEBDRIVER_POOL_SIZE, WEBDRIVER_MAX_PAGES,
+            acquire_timeout=WEBDRIVER_ACQUIRE_TIMEOUT
+        )
         self.session = connector.session
-        self.seen_ids = set()
+        # 스케줄러와 모니터가 같은 인스턴스를 공유하므로 동시에 들어온 수집 요청은 하나로 합칩니다.
+        self._poll_guard = threading.Lock()
+        self._inflight_poll = None
+        # 폴링 주기 자동 조절 (새 메시지가 이어지면 빠르게, 조용하면 점점 느리게)
+        self.poller = AdaptivePoller()
+        # 재난문자 폴링은 다른 수집 작업(직렬 스케줄러)에 밀리지 않도록 전용 스레드에서 실행합니다.
+        self._poll_stop = threading.Event()
+        self._poll_thread = threading.Thread(target=self._poll_loop, name=DISASTER_POLL_TASK, daemon=True)
+        # 처리한 최대 message_id + 최근 ID 윈도우로 중복 판별 (애매할 때만 DB 조회)
+        self.dedup = HighWaterMarkDedup(lookup=self.message_exists)
         self.filter_keywords = ["찾습니다", "배회중인", "실종된", "실종"]
 
     def message_exists(self, msg_id):
@@ -1087,87 +1275,84 @@ class DisasterMessageCrawler:
         return result.one() is not None
 
     def backup_messages(self, messages):
-        from cassandra.query import SimpleStatement
+        """
+        신규 재난문자 묶음을 저장하고 RTD 로 변환합니다.
+        1) disaster_message 동시 INSERT
+        2) 저장된 메시지 본문 전체를 한 번에 배치 NER
+        3) 중복 제거한 지역명의 행정코드/좌표를 동시에 조회
+        4) rtd_db 동시 INSERT 후 메시지 순서대로 알림 발송
+        2~4 단계가 묶음 전체로 실패하면 메시지마다 따로 다시 처리해, 한 메시지의 오류가 나머지를 막지 않게 합니다.
+        disaster_message 저장에 성공한 메시지 목록을 반환합니다. (중복 판별기에는 이 메시지만 기록)
+        """
+        if not messages:
+            return []
+
+        insert_params = [(
+            int(msg['message_id']),
+            msg['emergency_level'],
+            msg['DM_ntype'],
+            msg['DM_stype'],
+            msg['issuing_agency'],
+            msg['issued_at'],
+            msg['message_content']
+        ) for msg in messages]
+        results = async_writer.write_many(
+            SimpleStatement("""
+                INSERT INTO disaster_message (
+                    message_id, emergency_level, DM_ntype, DM_stype,
+                    issuing_agency, issued_at, message_content
+                ) VALUES (%s, %s, %s, %s, %s, %s, %s)
+            """),
+            insert_params
+        )
 
-        for msg in messages:
-            logging.info(f"✅ disaster_message INSERT 시도 중: {msg['message_id']}")
-            try:
-                # 1) disaster_message 테이블에 저장
-                self.session.execute(SimpleStatement("""
-                    INSERT INTO disaster_message (
-                        message_id, emergency_level, DM_ntype, DM_stype,
-                        issuing_agency, issued_at, message_content
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s) IF NOT EXISTS
-                """, ()
-                ), (
-                    int(msg['message_id']),
-                    msg['emergency_level'],
-                    msg['DM_ntype'],
-                    msg['DM_stype'],
-                    msg['issuing_agency'],
-                    msg['issued_at'],
-                    msg['message_content']
-                ))
+        saved = []
+        for msg, (success, result) in zip(messages, results):
+            if success:
                 logging.info(f"✅ disaster_message 저장 성공: {msg['message_id']}")
+                saved.append(msg)
+            else:
+                logging.error(f"❌ disaster_message 저장 실패 ({msg['message_id']}): {result}")
+        if not saved:
+            return saved
 
-                # 2) NER 모델로 메시지 내용에서 지역 추출
-                full_text = msg['message_content']
-                extracted_regions = extract_locations(full_text)
-                logging.info(f"🔍 추출된 지역들: {extracted_regions}")
-
-                if extracted_regions:
-                    # → (생략) 정상적인 지역별 RTD 저장 로직
-                    for rtd_loc in extracted_regions:
-                        region_cd = get_regioncode(rtd_loc)
-                        coords    = geocoding(rtd_loc)
-                        lat       = float(coords.get('lat')) if coords.get('lat') else None
-                        lng       = float(coords.get('lng')) if coords.get('lng') else None
-
-                        rtd_details = [
-                            f"level: {msg['emergency_level']}",
-                            f"type: {msg['DM_ntype']}",
-                            f"content: {msg['message_content']}"
-                        ]
-                        insert_rtd_data(
-                            21,
-                            msg['issued_at'],
-                            rtd_loc,
-                            rtd_details,
-                            region_cd,
-                            lat,
-                            lng
-                        )
-                        logging.info(f"✅ rtd_db 저장 완료 (loc: {rtd_loc})")
-
-                else:
-                    # 추출 실패 시 issuing_agency 를 지역명으로 사용
-                    fallback_loc = msg['issuing_agency']
-                    logging.warning(f"⚠️ 지역명 미추출 → issuing_agency 를 지역명으로 사용: {fallback_loc}")
-
-                    # issuing_agency 에 대해 geocode & regioncode 수행
-                    region_cd = get_regioncode(fallback_loc)
-                    coords    = geocoding(fallback_loc)
-                    lat       = float(coords.get('lat')) if coords.get('lat') else None
-                    lng       = float(coords.get('lng')) if coords.get('lng') else None
-
-                    rtd_details = [
-                        f"level: {msg['emergency_level']}",
-                        f"type: {msg['DM_ntype']}",
-                        f"content: {msg['message_content']}"
-                    ]
-                    insert_rtd_data(
-                        21,
-                        msg['issued_at'],
-                        fallback_loc,
-                        rtd_details,
-                        region_cd,
-                        lat,
-                        lng
-                    )
-                    logging.info(f"✅ rtd_db 저장 완료 (fallback loc: {fallback_loc})")
-
-            except Exception as e:
-                logging.error(f"❌ backup_messages 처리 중 오류: {e}")
+        try:
+            self._store_rtd(saved)
+        except Exception as e:
+            logging.error(f"❌ backup_messages 묶음 처리 중 오류 → 메시지별로 다시 처리: {e}")
+            for msg in saved:
+                try:
+                    self._store_rtd([msg])
+                except Exception as e:
+                    logging.error(f"❌ [{msg['message_id']}] RTD 변환 실패: {e}")
+        return saved
+
+    def _store_rtd(self, messages):
+        """저장된 재난문자 묶음을 배치 NER → 지역 동시 조회 → rtd_db 동시 INSERT 로 변환합니다."""
+        # NER 모델로 메시지 내용에서 지역 추출 (묶음 단위 배치 추론)
+        regions_list = extract_locations_batch([msg['message_content'] for msg in messages])
+
+        locs_per_msg = []
+        for msg, extracted_regions in zip(messages, regions_list):
+            logging.info(f"🔍 [{msg['message_id']}] 추출된 지역들: {extracted_regions}")
+            if not extracted_regions:
+                # 추출 실패 시 issuing_agency 를 지역명으로 사용
+                logging.warning(f"⚠️ 지역명 미추출 → issuing_agency 를 지역명으로 사용: {msg['issuing_agency']}")
+                extracted_regions = [msg['issuing_agency']]
+            locs_per_msg.append(extracted_regions)
+
+        unique_locs = list({loc for locs in locs_per_msg for loc in locs})
+        resolved = dict(zip(unique_locs, enrich_pool.map(resolve_location, unique_locs)))
+
+        records = []
+        for msg, locs in zip(messages, locs_per_msg):
+            rtd_details = message_rtd_details(msg['emergency_level'], msg['DM_ntype'], msg['message_content'])
+            for rtd_loc in locs:
+                region_cd, lat, lng = resolved[rtd_loc]
+                records.append((21, msg['issued_at'], rtd_loc, rtd_details, region_cd, lat, lng))
+
+        stored = insert_rtd_many(records)
+        logging.info(f"✅ rtd_db 저장 완료: {stored}/{len(records)}건 (메시지 {len(messages)}건)")
 
     # ---------------------------------------------------------------------------
     # RTD DB 항목 수정 로직 추가
@@ -1261,13 +1446,68 @@ class DisasterMessageCrawler:
         except Exception as e:
             print(f"테스트 FCM 발송 중 오류 발생: {e}")
 
+    def poll(self):
+        """
+        신규 재난문자를 수집하고 저장한 뒤 저장된 메시지 목록을 반환합니다.
+        다른 스레드가 이미 수집 중이면 새로 수집하지 않고 그 결과를 기다려 공유합니다.
+        중복 판별 상태(high-water mark)는 저장이 끝난 뒤 저장에 성공한 ID 만 반영합니다.
+        저장에 실패한 메시지는 기록하지 않으므로 다음 폴링에서 다시 신규로 판별됩니다.
+        """
+        with self._poll_guard:
+            inflight = self._inflight_poll
+            owner = inflight is None
+            if owner:
+                inflight = self._inflight_poll = Future()
+        if not owner:
+            logging.info("진행 중인 재난문자 수집 결과를 공유합니다.")
+            return inflight.result()
+
+        try:
+            messages = self.backup_messages(self.check_messages())
+            for msg in messages:
+                self.dedup.mark(msg["message_id"])
+            self.dedup.commit()
+            self._adjust_poll_interval(messages)
+            inflight.set_result(messages)
+            return messages
+        except Exception as e:
+            inflight.set_exception(e)
+            raise
+        finally:
+            with self._poll_guard:
+                self._inflight_poll = None
+
+    def _adjust_poll_interval(self, messages):
+        """새 메시지가 있으면 폴링 주기를 줄이고, 없으면 지수적으로 늘립니다. (폴링 스레드가 poller.interval 을 읽음)"""
+        self.poller.record([m["issued_at"] for m in messages])
+
+    def start_polling(self):
+        self._poll_thread.start()
+
+    def _poll_loop(self):
+        while not self._poll_stop.is_set():
+            try:
+                self.check_and_save()
+            except Exception as e:
+                logging.error(f"[재난문자 폴링] 실행 오류: {e}")
+            self._poll_stop.wait(self.poller.interval)
+
+    def show_poll_stats(self):
+        print("=== 재난문자 폴링 현황 ===")
+        for key, value in self.poller.metrics().items():
+            if key in ("last_poll_at", "last_new_at") and value:
+                value = datetime.fromtimestamp(value).strftime("%Y-%m-%d %H:%M:%S")
+            elif key.startswith("detection_latency") and value is not None:
+                value = f"{value:.1f}초"
+            print(f"{key}: {value}")
+        print("=========================")
+
     def check_and_save(self):
-        messages = self.check_messages()
+        messages = self.poll()
         if messages:
-            self.backup_messages(messages)
-            logging.info(f"스케줄러: 신규 메시지 {len(messages)}건 저장됨")
+            logging.info(f"재난문자 폴링: 신규 메시지 {len(messages)}건 저장됨")
         else:
-            logging.info("스케줄러: 신규 재난문자 없음")
+            logging.info("재난문자 폴링: 신규 재난문자 없음")
 
     def show_status(self):
         global FCM_NOTIFICATIONS_ENABLED
@@ -1285,6 +1525,8 @@ class DisasterMessageCrawler:
             except Exception as e:
                 print(f"{table}: 오류 발생 ({str(e).splitlines()[0]})")
         print(f"FCM 알림 상태: {'활성화' if FCM_NOTIFICATIONS_ENABLED else '비활성화'}")
+        print(f"WebDriver 풀: {self.driver_pool.stats()}")
+        print(f"재난문자 중복 판별: high-water={self.dedup.high_water}, {self.dedup.stats}")
         print("=================")
 
     def process_command(self, cmd):
@@ -1327,9 +1569,8 @@ class DisasterMessageCrawler:
             logging.info("주의보 정보 수집 완료")
         elif cmd == "9":
             logging.info("재난문자 수집 시작")
-            messages = self.check_messages()
+            messages = self.poll()
             if messages:
-                self.backup_messages(messages)
                 logging.info(f"신규 메시지 {len(messages)}건 저장됨")
             else:
                 logging.info("신규 재난문자 없음")
@@ -1353,11 +1594,21 @@ class DisasterMessageCrawler:
                         print(f"작업 '{task_name}'을(를) 찾을 수 없습니다.")
                 except Exception:
                     print("올바른 주기(초)를 입력해주세요.")
+        elif cmd == "poll_stats":
+            self.show_poll_stats()
+        elif cmd.startswith("set_poll_bounds"):
+            tokens = cmd.split()
+            try:
+                self.poller.set_bounds(int(tokens[1]), int(tokens[2]))
+                print(f"재난문자 폴링 주기 범위: {self.poller.min_interval}~{self.poller.max_interval}초")
+            except Exception:
+                print("사용법: set_poll_bounds <최소 초> <최대 초>")
         elif cmd == "list_intervals":
             tasks = scheduler.list_tasks()
             print("=== 등록된 스케줄 작업 ===")
             for name, interval in tasks.items():
                 print(f"{name}: {interval}초")
+            print(f"{DISASTER_POLL_TASK}: {self.poller.interval}초 (적응형, 전용 스레드)")
             print("=======================")
         elif cmd == "edit_rtd":
             self.edit_rtd_entry()
@@ -1381,6 +1632,8 @@ class DisasterMessageCrawler:
         print(" 8 → 기상특보(주의보/경보) 정보 수집")
         print(" 9 → 재난문자 수집")
         print(" 10 → 3일 지난 제보 비활성화")
+        print(" poll_stats → 재난문자 폴링 주기/탐지 지연 확인")
+        print(" set_poll_bounds <최소 초> <최대 초> → 재난문자 폴링 주기 범위 수정")
         print(" toggle_fcm → FCM 알림 활성화/비활성화")
         print(" set_interval <task_name> <초> → 지정 작업 주기 수정")
         print(" list_intervals → 현재 등록된 스케줄 주기 확인")
@@ -1391,31 +1644,29 @@ class DisasterMessageCrawler:
 
     
 
-    def check_messages(self):
-        self.driver.get(
-            'https://www.safekorea.go.kr/idsiSFK/neo/sfk/cs/sfc/dis/disasterMsgList.jsp?menuSeq=603'
-        )
-        time.sleep(5)
+    def _fetch_rows_selenium(self):
+        with self.driver_pool.acquire() as driver:
+            return self._extract_rows_selenium(driver)
 
-        messages = []
-        rows = self.driver.find_elements(By.CSS_SELECTOR, "table.boardList_table tbody tr")
-        for row in rows:
-            row_id = row.get_attribute('id')
-            try:
-                idx = re.search(r'disasterSms_tr_(\d+)_apiData1', row_id).group(1)
-            except:
-                continue
+    def _extract_rows_selenium(self, driver):
+        if SELENIUM_EXTRACT_MODE == "legacy":
+            return extract_rows_legacy(driver)
+        return extract_rows_script(driver)
 
+    def fetch_rows(self):
+        """재난문자 목록을 가져옵니다. HTTP 수집이 실패하면 Selenium 으로 대체합니다."""
+        if SAFEKOREA_FETCH_MODE != "selenium":
             try:
-                msg_id = int(row.find_element(By.ID, f"disasterSms_tr_{idx}_MD101_SN").text.strip())
-                emergency_level = row.find_element(By.ID, f"disasterSms_tr_{idx}_EMRGNCY_STEP_NM").text.strip()
-                ntype = row.find_element(By.ID, f"disasterSms_tr_{idx}_DSSTR_SE_NM").text.strip()
-                location = row.find_element(By.ID, f"disasterSms_tr_{idx}_MSG_LOC").text.strip()
-                issued_at_str = row.find_element(By.ID, f"disasterSms_tr_{idx}_CREATE_DT").text.strip()
-                content = row.find_element(By.ID, f"disasterSms_tr_{idx}_MSG_CN").get_attribute("title").strip()
+                return self.http_client.fetch()
             except Exception as e:
-                logging.error(f"필드 추출 오류 (row {row_id}): {e}")
-                continue
+                logging.warning(f"HTTP 재난문자 수집 실패 → Selenium 으로 대체: {e}")
+        return self._fetch_rows_selenium()
+
+    def check_messages(self):
+        messages = []
+        for row in self.fetch_rows():
+            msg_id = row["message_id"]
+            content = row["content"]
 
             # 재난문자 내용 필터링: 실종/찾기 관련 메시지는 제외
             if any(keyword in content for keyword in self.filter_keywords):
@@ -1423,55 +1674,50 @@ class DisasterMessageCrawler:
                 logging.info(f"필터링된 메시지 (키워드 {matched_keywords} 포함): {msg_id} - {content}")
                 continue
 
-            if msg_id in self.seen_ids or self.message_exists(msg_id):
+            if not self.dedup.is_new(msg_id):
                 continue
 
             try:
-                issued_at = datetime.strptime(issued_at_str, "%Y/%m/%d %H:%M:%S")
+                issued_at = datetime.strptime(row["issued_at"], "%Y/%m/%d %H:%M:%S")
             except Exception:
                 issued_at = datetime.now()
 
             message = {
                 "message_id": msg_id,
-                "emergency_level": emergency_level,
-                "DM_ntype": ntype,
+                "emergency_level": row["emergency_level"],
+                "DM_ntype": row["ntype"],
                 "DM_stype": "",
-                "issuing_agency": location,
+                "issuing_agency": row["location"],
                 "issued_at": issued_at,
                 "message_content": content
             }
 
-            self.seen_ids.add(msg_id)
             messages.append(message)
 
         logging.info(f"수집된 메시지 개수: {len(messages)}")
         return messages
 
+    def close(self):
+        self._poll_stop.set()
+        if self._poll_thread.is_alive():
+            self._poll_thread.join(timeout=30)
+        self.driver_pool.close()
+
     def monitor(self):
         logging.info("실시간 재난문자 수집 시작")
         self.display_help()
-        last_check_time = time.time()
         while True:
             try:
                 if sys.stdin in select.select([sys.stdin], [], [], 0)[0]:
                     cmd = input().strip().lower()
                     if self.process_command(cmd):
                         break
-                if time.time() - last_check_time > 60:
-                    messages = self.check_messages()
-                    if messages:
-                        logging.info("신규 메시지 발견")
-                        print(json.dumps(messages, ensure_ascii=False, indent=2, default=str))
-                        self.backup_messages(messages)
-                    else:
-                        logging.info("신규 메시지 없음")
-                        print("60초 대기 중... (명령어 입력 가능: 1~8, set_interval, list_intervals, q 등)")
-                    last_check_time = time.time()
+                # 재난문자 수집은 전용 폴링 스레드가 적응형 주기로 실행합니다.
                 time.sleep(1)
             except Exception as e:
                 logging.error(f"오류 발생: {e}")
                 time.sleep(60)
-        self.driver.quit()
+        self.close()
 
 
 # ---------------------------------------------------------------------------
@@ -1487,11 +1733,14 @@ def main():
     scheduler.add_task("typhoon", 3600, get_typhoon_data)  # 태풍: 1시간
     scheduler.add_task("flood", 36000, get_flood_data)  # 홍수: 10시간
     scheduler.add_task("warning", 36000, get_warning_data)  # 기상특보: 10시간
-    scheduler.add_task("disaster_messages", 600, partial(DisasterMessageCrawler().check_and_save))
-    scheduler.add_task("deactivate_reports", 86400, deactivate_old_user_reports) # 24시간
+    # 스케줄러와 대화형 모니터가 하나의 크롤러(및 WebDriver 풀)를 공유
+    crawler = DisasterMessageCrawler()
+    scheduler.add_task("deactivate_reports", 86400, deactivate_old_user_reports)  # 24시간 (노출 여부는 API 에서 읽기 시점 계산, 플래그 정리용 보조 작업)
 
     # 스케줄러 시작 (백그라운드 스레드)
     scheduler.start()
+    # 재난문자 폴링 시작 (적응형 주기, 전용 스레드)
+    crawler.start_polling()
 
     # # 초기 수집 함수 실행 (옵션) -> 시작 시 알림이 가지 않도록 주석 처리
     # get_air_inform()
@@ -1502,7 +1751,7 @@ def main():
     # get_warning_data()
 
     # 재난문자 모니터링 시작 (명령어 기반 인터페이스)
-    DisasterMessageCrawler().monitor()
+    crawler.monitor()
 
 
 if __name__ == "__main__":
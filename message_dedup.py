@@ -0,0 +1,117 @@
+# message_dedup.py
+
+"""
+재난문자 중복 판별기.
+
+재난문자 message_id 는 단조 증가하므로 지금까지 처리한 최대 ID(high-water mark)와
+최근 처리한 ID 일부(크기가 제한된 윈도우)만 기억하면 대부분의 행을 DB 조회 없이 판별할 수 있습니다.
+
+  - ID > high-water mark                 → 신규
+  - ID 가 윈도우에 있음                   → 이미 처리
+  - ID < 윈도우의 가장 작은 ID             → 오래된 행, 건너뜀
+  - 그 외(윈도우 범위 안의 늦게 도착한 ID) → lookup(DB 조회)으로 확인
+
+상태는 JSON 파일에 저장되어 재시작 후에도 이어서 사용하며, 상태 파일이 없을 때(최초 실행)는
+모든 판별을 lookup 으로 처리해 이미 저장된 메시지를 다시 저장하지 않습니다.
+"""
+import os
+import json
+import logging
+import threading
+from collections import deque
+
+DEDUP_STATE_PATH = os.getenv("DEDUP_STATE_PATH", "message_dedup_state.json")
+DEDUP_WINDOW_SIZE = int(os.getenv("DEDUP_WINDOW_SIZE", "200"))
+
+
+class HighWaterMarkDedup:
+    def __init__(self, path: str = DEDUP_STATE_PATH, window_size: int = DEDUP_WINDOW_SIZE, lookup=None):
+        """
+        path: 상태 파일 경로
+        window_size: 기억할 최근 ID 개수
+        lookup: msg_id → 이미 저장되어 있으면 True 를 반환하는 함수 (판별이 애매할 때만 호출)
+        """
+        self.path = path
+        self.lookup = lookup
+        self.high_water = None
+        self.window = deque(maxlen=max(window_size, 1))
+        self._window_set = set()
+        self._pending = []
+        self._lock = threading.Lock()
+        self.stats = {"new": 0, "seen": 0, "old": 0, "lookups": 0}
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            self.high_water = state.get("high_water")
+            for msg_id in state.get("window", []):
+                self._remember(msg_id)
+        except Exception as e:
+            logging.warning(f"[중복 판별 상태 로드 실패] {e}")
+
+    def save(self):
+        with self._lock:
+            state = {"high_water": self.high_water, "window": list(self.window)}
+        try:
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logging.warning(f"[중복 판별 상태 저장 실패] {e}")
+
+    def _remember(self, msg_id: int):
+        if msg_id in self._window_set:
+            return
+        if len(self.window) == self.window.maxlen:
+            self._window_set.discard(self.window[0])
+        self.window.append(msg_id)
+        self._window_set.add(msg_id)
+
+    def _lookup(self, msg_id: int) -> bool:
+        self.stats["lookups"] += 1
+        return self.lookup(msg_id) if self.lookup else False
+
+    def is_new(self, msg_id: int) -> bool:
+        """
+        msg_id 가 아직 처리되지 않은 메시지인지 판별합니다.
+        한 번의 폴링 동안에는 폴링 시작 시점의 상태로 판별하고, 기록은 commit() 에서 반영합니다.
+        """
+        with self._lock:
+            if self.high_water is None:
+                # 최초 실행: 기준점이 없으므로 DB 로 확인
+                seen = self._lookup(msg_id)
+            elif msg_id > self.high_water:
+                seen = False
+            elif msg_id in self._window_set:
+                seen = True
+            elif self.window and msg_id < min(self.window):
+                self.stats["old"] += 1
+                return False
+            else:
+                seen = self._lookup(msg_id)
+
+            self.stats["seen" if seen else "new"] += 1
+            if seen:
+                # DB 에 있던 ID 도 기억해 두어 다음 폴링에서는 조회하지 않음
+                self._pending.append(msg_id)
+            return not seen
+
+    def mark(self, msg_id: int):
+        """처리한 ID 를 기록합니다. 상태 반영과 파일 저장은 commit() 에서 한 번에 합니다."""
+        with self._lock:
+            self._pending.append(msg_id)
+
+    def commit(self):
+        """폴링 중 기록한 ID 를 high-water mark/윈도우에 반영하고 파일에 저장합니다."""
+        with self._lock:
+            for msg_id in sorted(self._pending):
+                self._remember(msg_id)
+                if self.high_water is None or msg_id > self.high_water:
+                    self.high_water = msg_id
+            self._pending = []
+        self.save()
@@ -1,90 +1,236 @@
 # migrate_disaster_messages.py
 
+"""
+disaster_message 테이블의 레코드를 rtd_db(rtd_code 21)로 옮기는 일괄 마이그레이션 엔진입니다.
+
+- 일괄 모드: FCM 알림을 보내지 않고, 결정적 uuid5 ID 로 일반 INSERT 를 하므로 재실행해도 안전합니다.
+- CHUNK_SIZE 건씩 읽어 배치 NER → 중복 제거된 지역 코드/좌표 동시 조회 → 동시 INSERT 순으로 처리합니다.
+- 청크가 모두 저장되면 마지막 message_id 를 체크포인트에 기록하고, 재실행 시
+  token(message_id) > token(마지막 ID) 부터 이어서 읽습니다. (--restart 로 처음부터)
+  저장에 실패한 행이 있으면 체크포인트를 갱신하지 않고 중단하므로, 재실행하면 그 청크부터 다시 저장합니다.
+- 지오코딩 요청 간격은 MIGRATION_GEOCODE_INTERVAL 로 따로 설정합니다. (자체 운영 Nominatim 이면 0)
+- --dry-run 은 읽기/NER 만 수행하고 지역 조회·저장·체크포인트 없이 처리량(msg/sec)을 측정합니다.
+  (외부 지역코드/지오코딩 API 를 호출하지 않음)
+
+사용법:
+    python messageroll.py [--restart] [--dry-run] [--limit N]
+"""
+import os
+import json
+import time
+import argparse
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from cassandra_async import write_many
+from time_buckets import rtd_by_day_params
+from geo_cells import rtd_by_cell_params
+from change_log import change_params, CHANGE_INSERT_CQL
 from cassandra.query import SimpleStatement
-from ner_utils import extract_location
-from main import connector, get_regioncode, geocoding, insert_rtd_data
+from ner_utils import extract_locations_batch
+import main
+from main import connector, resolve_location, rtd_record_id, message_rtd_details, RateLimiter, NOMINATIM_MIN_INTERVAL
 from tqdm import tqdm  # 진행 바
 
-def migrate_disaster_messages_to_rtd():
+CHUNK_SIZE = int(os.getenv("MIGRATION_CHUNK_SIZE", "256"))
+RESOLVE_WORKERS = int(os.getenv("MIGRATION_RESOLVE_WORKERS", "8"))
+WRITE_CONCURRENCY = int(os.getenv("MIGRATION_WRITE_CONCURRENCY", "64"))
+CHECKPOINT_PATH = os.getenv("MIGRATION_CHECKPOINT_PATH", "migration_checkpoint.json")
+GEOCODE_INTERVAL = float(os.getenv("MIGRATION_GEOCODE_INTERVAL", str(NOMINATIM_MIN_INTERVAL)))
+
+SELECT_COLUMNS = "message_id, emergency_level, dm_ntype, issued_at, issuing_agency, message_content"
+
+
+def load_checkpoint():
+    if os.path.exists(CHECKPOINT_PATH):
+        with open(CHECKPOINT_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+
+def save_checkpoint(last_message_id, migrated: int):
+    data = {
+        "last_message_id": last_message_id,
+        "migrated": migrated,
+        "updated_at": datetime.now().isoformat()
+    }
+    tmp_path = CHECKPOINT_PATH + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, CHECKPOINT_PATH)
+
+
+def iter_chunks(session, last_message_id=None, limit=None):
+    """disaster_message 를 토큰 순서로 읽어 CHUNK_SIZE 건씩 돌려줍니다."""
+    if last_message_id is None:
+        stmt = SimpleStatement(
+            f"SELECT {SELECT_COLUMNS} FROM disaster_service.disaster_message",
+            fetch_size=CHUNK_SIZE
+        )
+        rows = session.execute(stmt)
+    else:
+        stmt = SimpleStatement(
+            f"SELECT {SELECT_COLUMNS} FROM disaster_service.disaster_message "
+            "WHERE token(message_id) > token(%s)",
+            fetch_size=CHUNK_SIZE
+        )
+        rows = session.execute(stmt, (last_message_id,))
+
+    chunk = []
+    seen = 0
+    for row in rows:
+        chunk.append(row)
+        seen += 1
+        if len(chunk) >= CHUNK_SIZE or (limit and seen >= limit):
+            yield chunk
+            chunk = []
+        if limit and seen >= limit:
+            return
+    if chunk:
+        yield chunk
+
+
+def build_rtd_params(chunk, pool, limiter=None) -> list:
     """
-    disaster_message 테이블의 모든 레코드를 읽어서
-    extract_location → get_regioncode → geocoding → insert_rtd_data(21, …) 로 rtd_db에 저장
-    tqdm으로 진행 상황을 표시합니다.
+    청크 하나를 배치 NER + 지역 동시 조회하여 rtd_db INSERT 파라미터 목록으로 변환합니다.
+    pool 이 None 이면 지역 조회를 건너뜁니다. (dry-run: 지역코드/좌표는 None)
+    """
+    regions_list = extract_locations_batch([row.message_content for row in chunk])
+
+    # 지역 추출 실패 시 issuing_agency 를 지역명으로 사용 (실시간 수집 경로와 동일)
+    locs_per_row = [regions or [row.issuing_agency] for row, regions in zip(chunk, regions_list)]
+    resolved = {}
+    if pool is not None:
+        unique = list({loc for locs in locs_per_row for loc in locs if loc})
+        resolved = dict(zip(unique, pool.map(lambda loc: resolve_location(loc, limiter), unique)))
+
+    params = []
+    for row, locs in zip(chunk, locs_per_row):
+        rtd_details = message_rtd_details(row.emergency_level, row.dm_ntype, row.message_content)
+        for loc in locs:
+            region_cd, lat, lng = resolved.get(loc, (None, None, None))
+            rec_id = rtd_record_id(21, row.issued_at, loc, rtd_details)
+            params.append((21, row.issued_at, rec_id, loc, rtd_details, region_cd, lat, lng))
+    return params
+
+
+def migrate_disaster_messages_to_rtd(restart=False, dry_run=False, limit=None):
+    """
+    disaster_message 테이블의 레코드를 읽어서
+    배치 NER → get_regioncode/geocoding(동시) → rtd_db(21) 동시 INSERT 로 저장합니다.
+    일괄 모드이므로 FCM 알림은 보내지 않습니다.
     """
     session = connector.session
+    main.FCM_NOTIFICATIONS_ENABLED = False  # 일괄 마이그레이션 중 알림 차단
+
+    checkpoint = {} if (restart or dry_run) else load_checkpoint()
+    last_message_id = checkpoint.get("last_message_id")
+    migrated = checkpoint.get("migrated", 0) if last_message_id is not None else 0
+    if last_message_id is not None:
+        logging.info(f"체크포인트에서 재개합니다 (마지막 message_id: {last_message_id}, 누적 {migrated}건)")
+
+    insert_stmt = session.prepare("""
+        INSERT INTO rtd_db (
+          rtd_code, rtd_time, id, rtd_loc, rtd_details,
+          regioncode, latitude, longitude
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """)
+    bucket_stmt = session.prepare("""
+        INSERT INTO rtd_by_day (
+          day, rtd_time, id, rtd_code, rtd_loc, rtd_details,
+          regioncode, latitude, longitude
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """)
+    cell_stmt = session.prepare("""
+        INSERT INTO rtd_by_cell (
+          cell, day, rtd_time, id, rtd_code, rtd_loc, rtd_details,
+          regioncode, latitude, longitude
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """)
+
+    count_messages = 0
+    count_failed = 0
+    aborted = False
+    limiter = RateLimiter(GEOCODE_INTERVAL)
+    started = time.time()
+    progress = tqdm(desc="Migrating messages", unit="msg", total=limit)
+
+    with ThreadPoolExecutor(max_workers=RESOLVE_WORKERS) as pool:
+        for chunk in iter_chunks(session, last_message_id, limit):
+            params = build_rtd_params(chunk, None if dry_run else pool, limiter)
+
+            if not dry_run:
+                chunk_failed = 0
+                results = write_many(session, insert_stmt, params, concurrency=WRITE_CONCURRENCY)
+                stored, cells = [], []
+                for (success, result), p in zip(results, params):
+                    if success:
+                        migrated += 1
+                        stored.append(rtd_by_day_params(*p))
+                        cell_params = rtd_by_cell_params(*p)
+                        if cell_params is not None:
+                            cells.append(cell_params)
+                    else:
+                        chunk_failed += 1
+                        logging.error(f"[RTD {p[2]}] 저장 실패: {result}")
+                # 날짜 버킷 조회 테이블 이중 기록
+                bucket_result = write_many(session, bucket_stmt, stored,
+                                           concurrency=WRITE_CONCURRENCY, keep_results=False)
+                for p, e in bucket_result.errors:
+                    chunk_failed += 1
+                    logging.error(f"[RTD {p[2]}] rtd_by_day 저장 실패: {e}")
+                # 격자 셀 조회 테이블 이중 기록 (좌표가 있는 행만)
+                cell_result = write_many(session, cell_stmt, cells,
+                                         concurrency=WRITE_CONCURRENCY, keep_results=False)
+                for p, e in cell_result.errors:
+                    chunk_failed += 1
+                    logging.error(f"[RTD {p[3]}] rtd_by_cell 저장 실패: {e}")
+                # 델타 동기화용 변경 로그 (조회 테이블 기록 후)
+                change_result = write_many(session, SimpleStatement(CHANGE_INSERT_CQL),
+                                           [change_params("rtd", "insert", p[1], p[2]) for p in stored],
+                                           concurrency=WRITE_CONCURRENCY, keep_results=False)
+                for p, e in change_result.errors:
+                    chunk_failed += 1
+                    logging.error(f"[RTD {p[5]}] event_changes 기록 실패: {e}")
+                if chunk_failed:
+                    # 체크포인트를 넘기지 않고 중단 (INSERT 는 멱등이므로 재실행하면 이 청크부터 다시 저장)
+                    count_failed += chunk_failed
+                    aborted = True
+                    break
+                save_checkpoint(chunk[-1].message_id, migrated)
+
+            count_messages += len(chunk)
+            progress.update(len(chunk))
+
+    progress.close()
+    elapsed = time.time() - started
+    rate = count_messages / elapsed if elapsed > 0 else 0.0
+
+    if dry_run:
+        logging.info(f"[dry-run] 메시지 {count_messages}건 처리, {elapsed:.1f}초 ({rate:.1f} msg/sec)")
+        print(f"[dry-run] {count_messages} msgs, {elapsed:.1f}s, {rate:.1f} msg/sec")
+        return
 
-    # 전체 행 수 조회 (tqdm의 total로 사용)
-    count_query = SimpleStatement("SELECT COUNT(*) FROM disaster_service.disaster_message")
-    count_result = session.execute(count_query).one()
-    total_rows = count_result.count if count_result and hasattr(count_result, 'count') else None
+    if aborted:
+        logging.error(
+            f"[migration 중단] 저장 실패 {count_failed}건. 다시 실행하면 {CHECKPOINT_PATH} 의 마지막 청크 이후부터 이어서 진행합니다."
+        )
+        return
 
-    # 모든 레코드 조회 (컬럼명을 소문자로 맞춤)
-    query = SimpleStatement(
-        "SELECT message_id, emergency_level, dm_ntype, issued_at, issuing_agency, message_content "
-        "FROM disaster_service.disaster_message"
+    if os.path.exists(CHECKPOINT_PATH) and not limit:
+        os.remove(CHECKPOINT_PATH)
+    logging.info(
+        f"[migration 완료] 이번 실행 메시지 {count_messages}건, RTD 누적 저장 {migrated}건, "
+        f"실패 {count_failed}건, {rate:.1f} msg/sec"
     )
-    rows = session.execute(query)
-
-    count_total = 0
-    count_inserted = 0
-
-    # tqdm 으로 진행 바 적용
-    iterator = tqdm(rows, total=total_rows, desc="Migrating messages", unit="msg")
-
-    for row in iterator:
-        count_total += 1
-        try:
-            # (A) 행에서 필요한 필드 꺼내기 (컬럼명은 모두 소문자)
-            message_id      = row.message_id
-            emergency_level = row.emergency_level
-            dm_ntype        = row.dm_ntype       # 수정: 소문자 dm_ntype
-            issued_at       = row.issued_at
-            issuing_agency  = row.issuing_agency
-            content         = row.message_content
-
-            # (B) NER 모델로 메시지 내용에서 지역 추출
-            extracted_region = extract_location(content)
-            logging.info(f"[메시지 ID {message_id}] 추출된 지역: '{extracted_region}'")
-
-            # (C) 지역이 있으면 코드/좌표 조회, 없으면 None/빈 문자열 처리
-            if extracted_region:
-                region_cd = get_regioncode(extracted_region)
-                coords    = geocoding(extracted_region)
-                lat = float(coords["lat"]) if coords.get("lat") else None
-                lng = float(coords["lng"]) if coords.get("lng") else None
-                rtd_loc = extracted_region
-            else:
-                region_cd = None
-                lat = None
-                lng = None
-                rtd_loc = ""  # 빈 문자열
-
-            # (D) rtd_details 구성
-            rtd_details = [
-                f"level: {emergency_level}",
-                f"type: {dm_ntype}",
-                f"content: {content}"
-            ]
-
-            # (E) insert_rtd_data 호출 (문자코드 = 21)
-            insert_rtd_data(
-                21,          # rtd_code: 재난문자 전용
-                issued_at,   # 발송 시각(datetime)
-                rtd_loc,     # 추출된 지역명(없으면 "")
-                rtd_details, # 상세 정보 리스트
-                region_cd,   # 행정구역 코드 or None
-                lat,         # 위도 or None
-                lng          # 경도 or None
-            )
-            count_inserted += 1
-
-        except Exception as e:
-            logging.error(f"[메시지 ID {message_id}] RTD 저장 실패: {e}")
-
-    logging.info(f"[migration 완료] 전체 메시지 수: {count_total}, RTD에 저장된 수: {count_inserted}")
 
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
-    migrate_disaster_messages_to_rtd()
+    parser = argparse.ArgumentParser(description="disaster_message → rtd_db 일괄 마이그레이션")
+    parser.add_argument("--restart", action="store_true", help="체크포인트를 무시하고 처음부터 실행")
+    parser.add_argument("--dry-run", action="store_true", help="저장 없이 처리량만 측정")
+    parser.add_argument("--limit", type=int, default=None, help="처리할 최대 메시지 수")
+    args = parser.parse_args()
+    migrate_disaster_messages_to_rtd(restart=args.restart, dry_run=args.dry_run, limit=args.limit)
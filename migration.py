@@ -1,5 +1,7 @@
 from cassandra.cluster import Cluster
 from cassandra.auth import PlainTextAuthProvider
+from cassandra.query import SimpleStatement
+from cassandra_async import write_many
 
 # Cassandra 접속 정보 (직접 입력)
 CASSANDRA_HOST = '127.0.0.1'
@@ -16,22 +18,22 @@ session = cluster.connect(KEYSPACE)
 print("✅ Cassandra 연결 성공")
 
 # 데이터 복사: rtd_db → rtd_db_new
-rows = session.execute("SELECT * FROM rtd_db")
-count = 0
+rows = session.execute(SimpleStatement("SELECT * FROM rtd_db", fetch_size=1000))
+insert_stmt = session.prepare("""
+    INSERT INTO rtd_db_new (
+        id, rtd_time, rtd_loc, rtd_details,
+        rtd_code, regioncode, latitude, longitude
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+""")
 
-for row in rows:
-    try:
-        session.execute("""
-            INSERT INTO rtd_db_new (
-                id, rtd_time, rtd_loc, rtd_details,
-                rtd_code, regioncode, latitude, longitude
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-        """, (
-            row.id, row.rtd_time, row.rtd_loc, row.rtd_details,
-            row.rtd_code, row.regioncode, row.latitude, row.longitude
-        ))
-        count += 1
-    except Exception as e:
-        print(f"❌ INSERT 실패 (ID: {row.id}): {e}")
+# execute_async 로 동시에 INSERT (진행 중 요청 수 제한, 결과는 건수/오류만 유지)
+result = write_many(session, insert_stmt, (
+    (row.id, row.rtd_time, row.rtd_loc, row.rtd_details,
+     row.rtd_code, row.regioncode, row.latitude, row.longitude)
+    for row in rows
+), keep_results=False)
+for params, e in result.errors:
+    print(f"❌ INSERT 실패 (ID: {params[0]}): {e}")
+count = result.succeeded
 
 print(f"✅ 총 {count}건 마이그레이션 완료")
@@ -0,0 +1,143 @@
+# ner_tune.py
+"""
+이 장비에서 NER 추론의 torch intra-op / inter-op 스레드 수와 배치 크기를 스윕하여
+가장 빠른 조합을 ner_runtime.json(NER_RUNTIME_PATH)에 기록합니다.
+ner_utils 는 시작할 때 이 파일을 읽어 설정을 적용합니다.
+
+사용법:
+    python ner_tune.py                 # 전체 스윕 후 최적값 저장
+    python ner_tune.py --dry-run       # 스윕 결과만 출력하고 저장하지 않음
+
+inter-op 스레드 수는 프로세스당 한 번만 설정할 수 있으므로 (intra, inter) 조합마다
+하위 프로세스를 띄워 측정하고, 배치 크기는 하위 프로세스 안에서 바꿔가며 측정합니다.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import logging
+import subprocess
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+SAMPLES = [
+    "21:48 남구 선암동 화재 발생. 인근 주민은 주의 바랍니다.",
+    "온양읍 운화리 산119-1 산불 발생. 주민 대피 요망.",
+    "기상청 예보: 경기도 수원시 권선구 호매실동 호우주의보 발효 중.",
+    "서울특별시 성동구 왕십리로 사고 발생. 차량 우회 바랍니다."
+]
+
+# ner_utils 를 import 하면 모델이 로드되므로 경로만 같은 규칙으로 계산
+NER_RUNTIME_PATH = os.getenv(
+    "NER_RUNTIME_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "ner_runtime.json")
+)
+
+BATCH_SIZES = [1, 4, 8, 16, 32]
+REPEAT = 5
+
+
+def thread_candidates() -> list:
+    cpus = os.cpu_count() or 1
+    candidates = {1, 2, 4, cpus // 2, cpus}
+    return sorted(c for c in candidates if 1 <= c <= cpus)
+
+
+def long_bulletin(ner_utils, min_windows: int) -> str:
+    """
+    SAMPLES 를 이어 붙여 min_windows 개 이상의 윈도우로 나뉘는 긴 속보를 만듭니다.
+    가장 큰 배치 크기보다 윈도우가 많아야 배치 크기마다 forward 횟수가 달라집니다.
+    """
+    body = ner_utils.MAX_LENGTH - 2
+    step = max(body - min(ner_utils.WINDOW_STRIDE, body - 1), 1)
+    unit = " ".join(SAMPLES)
+    unit_tokens = len(ner_utils.tokenizer_loc(unit.split(), is_split_into_words=True,
+                                              add_special_tokens=False)["input_ids"])
+    need_tokens = body + (min_windows - 1) * step + 1
+    return " ".join([unit] * (need_tokens // unit_tokens + 1))
+
+
+def run_worker(batch_sizes: list, repeat: int) -> list:
+    """현재 프로세스의 스레드 설정으로 배치 크기별 평균 지연 시간(ms)을 측정합니다."""
+    import ner_utils
+
+    # 가장 큰 배치도 forward 를 두 번 이상 하도록
+    bulletin = long_bulletin(ner_utils, 2 * max(batch_sizes))
+
+    results = []
+    for batch_size in batch_sizes:
+        ner_utils.NER_BATCH_SIZE = batch_size
+        ner_utils.extract_locations(bulletin)  # warm-up
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for text in SAMPLES:
+                ner_utils.extract_locations(text)
+            ner_utils.extract_locations(bulletin)
+        elapsed_ms = (time.perf_counter() - start) * 1000 / repeat
+
+        results.append({"batch_size": batch_size, "latency_ms": round(elapsed_ms, 2)})
+    return results
+
+
+def sweep(batch_sizes: list, repeat: int) -> list:
+    measurements = []
+    for intra in thread_candidates():
+        for inter in sorted({1, 2, min(4, intra)}):
+            env = dict(os.environ,
+                       NER_INTRA_OP_THREADS=str(intra),
+                       NER_INTER_OP_THREADS=str(inter))
+            cmd = [sys.executable, os.path.abspath(__file__), "--worker",
+                   "--batch-sizes", ",".join(map(str, batch_sizes)),
+                   "--repeat", str(repeat)]
+            try:
+                out = subprocess.run(cmd, env=env, capture_output=True, text=True, check=True).stdout
+                rows = json.loads(out.strip().splitlines()[-1])
+            except Exception as e:
+                logging.error(f"측정 실패 (intra={intra}, inter={inter}): {e}")
+                continue
+            for row in rows:
+                row.update({"intra_op_threads": intra, "inter_op_threads": inter})
+                logging.info(f"intra={intra:>2} inter={inter} batch={row['batch_size']:>2} → {row['latency_ms']} ms")
+                measurements.append(row)
+    return measurements
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NER 런타임 스레드/배치 자동 튜닝")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--batch-sizes", default=",".join(map(str, BATCH_SIZES)))
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--dry-run", action="store_true", help="결과를 저장하지 않고 출력만 합니다")
+    args = parser.parse_args()
+    batch_sizes = [int(b) for b in args.batch_sizes.split(",") if b]
+
+    if args.worker:
+        print(json.dumps(run_worker(batch_sizes, args.repeat)))
+        return
+
+    measurements = sweep(batch_sizes, args.repeat)
+    if not measurements:
+        print("측정 결과가 없습니다.")
+        return
+
+    best = min(measurements, key=lambda r: r["latency_ms"])
+    config = {
+        "intra_op_threads": best["intra_op_threads"],
+        "inter_op_threads": best["inter_op_threads"],
+        "batch_size": best["batch_size"],
+        "latency_ms": best["latency_ms"],
+        "cpu_count": os.cpu_count(),
+        "tuned_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    print(json.dumps(config, ensure_ascii=False, indent=2))
+
+    if not args.dry_run:
+        with open(NER_RUNTIME_PATH, "w", encoding="utf-8") as f:
+            json.dump(config, f, ensure_ascii=False, indent=2)
+        print(f"저장 완료: {NER_RUNTIME_PATH}")
+
+
+if __name__ == "__main__":
+    main()
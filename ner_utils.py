@@ -1,11 +1,54 @@
 import os
+import json
+import logging
 import torch
 from transformers import BertTokenizerFast, BertForTokenClassification
 
-# 모델 로드
 BASE_DIR = os.path.dirname(__file__)
 MODEL_PATH = os.path.join(BASE_DIR, "ner_model")
 
+# ---------------------------------------------------------------------------
+# 추론 런타임 설정 (torch 스레드 수, 배치 크기)
+# ner_tune.py 가 이 장비에서 측정한 최적값을 NER_RUNTIME_PATH 에 기록하고,
+# 환경 변수(NER_INTRA_OP_THREADS / NER_INTER_OP_THREADS / NER_BATCH_SIZE)가 있으면 그 값을 우선합니다.
+# ---------------------------------------------------------------------------
+NER_RUNTIME_PATH = os.getenv("NER_RUNTIME_PATH", os.path.join(BASE_DIR, "ner_runtime.json"))
+
+
+def load_runtime_config() -> dict:
+    config = {"intra_op_threads": None, "inter_op_threads": None, "batch_size": 16}
+    if os.path.exists(NER_RUNTIME_PATH):
+        try:
+            with open(NER_RUNTIME_PATH, "r", encoding="utf-8") as f:
+                config.update(json.load(f))
+        except Exception as e:
+            logging.warning(f"[NER 런타임 설정 로드 실패] {e}")
+    for key, env in (("intra_op_threads", "NER_INTRA_OP_THREADS"),
+                     ("inter_op_threads", "NER_INTER_OP_THREADS"),
+                     ("batch_size", "NER_BATCH_SIZE")):
+        if os.getenv(env):
+            config[key] = int(os.getenv(env))
+    return config
+
+
+RUNTIME_CONFIG = load_runtime_config()
+NER_BATCH_SIZE = max(int(RUNTIME_CONFIG["batch_size"] or 1), 1)  # 한 번의 forward 에 넣는 최대 윈도우 수
+
+# inter-op 스레드 수는 torch 병렬 작업이 시작되기 전에 한 번만 설정할 수 있으므로 모델 로드 전에 적용
+if RUNTIME_CONFIG["intra_op_threads"]:
+    torch.set_num_threads(int(RUNTIME_CONFIG["intra_op_threads"]))
+if RUNTIME_CONFIG["inter_op_threads"]:
+    try:
+        torch.set_num_interop_threads(int(RUNTIME_CONFIG["inter_op_threads"]))
+    except RuntimeError as e:
+        logging.warning(f"[NER inter-op 스레드 설정 무시] {e}")
+logging.info(
+    f"NER 런타임: intra_op={torch.get_num_threads()}, "
+    f"inter_op={torch.get_num_interop_threads()}, batch_size={NER_BATCH_SIZE}"
+)
+
+# 모델 로드
+
 tokenizer_loc = BertTokenizerFast.from_pretrained(MODEL_PATH)
 model_loc = BertForTokenClassification.from_pretrained(MODEL_PATH)
 model_loc.config.id2label = {0: "O", 1: "B-LOC", 2: "I-LOC"}
@@ -15,38 +58,85 @@ model_loc.to(device)
 model_loc.eval()
 
 
-def extract_locations(text: str) -> list:
+# 슬라이딩 윈도우 설정 (512 토큰 초과 문장 처리용)
+MAX_LENGTH = 512
+WINDOW_STRIDE = int(os.getenv("NER_WINDOW_STRIDE", "128"))  # 인접 윈도우 간 겹치는 토큰 수
+
+STOPWORDS = {"미리", "관리","우리","입산","즉시","주의",",","(",")","처리","전면","활동","이동","폭죽소리","~","진동","정리","폭동","산불","원리","합동"}
+
+
+def _window_starts(n_tokens: int, body: int, stride: int) -> list:
     """
-    입력 텍스트에서 B-LOC/I-LOC로 예측된 단어 단위 지명을 스팬으로 추출하여 리스트로 반환합니다.
-    불용어(stopwords)에 해당하는 단어가 포함된 스팬은 제외합니다.
+    n_tokens 길이의 토큰열을 body 크기 윈도우로 나눌 때 각 윈도우의 시작 위치를 반환합니다.
+    인접 윈도우는 stride 토큰만큼 겹칩니다.
     """
-    STOPWORDS = {"미리", "관리","우리","입산","즉시","주의",",","(",")","처리","전면","활동","이동","폭죽소리","~","진동","정리","폭동","산불","원리","합동"}
+    step = max(body - stride, 1)
+    starts = [0]
+    while starts[-1] + body < n_tokens:
+        starts.append(starts[-1] + step)
+    return starts
 
-    if not text:
-        return []
 
-    words = text.split()
-    encoding = tokenizer_loc(
-        words,
-        is_split_into_words=True,
-        return_tensors="pt",
-        truncation=True,
-        max_length=512
-    )
-    input_ids = encoding["input_ids"].to(device)
-    attention_mask = encoding["attention_mask"].to(device)
-    word_ids = encoding.word_ids()
+def _predict_token_labels_batch(token_id_lists: list) -> list:
+    """
+    특수 토큰이 없는 토큰 ID 열들을 겹치는 윈도우로 나누어 배치 추론으로 라벨을 예측합니다.
+    여러 문장의 윈도우를 한데 모아 NER_BATCH_SIZE 개씩 forward 하며, 겹치는 구간의 토큰은
+    윈도우 경계에서 가장 먼(문맥이 가장 충분한) 윈도우의 예측을 사용합니다.
+    """
+    body = MAX_LENGTH - 2  # [CLS], [SEP] 자리
+    stride = min(WINDOW_STRIDE, body - 1)
+
+    cls_id = tokenizer_loc.cls_token_id
+    sep_id = tokenizer_loc.sep_token_id
+    pad_id = tokenizer_loc.pad_token_id
 
+    # (문장 번호, 윈도우 시작 위치, 윈도우 토큰) 목록
+    windows = []
+    starts_per_text = []
+    for t, token_ids in enumerate(token_id_lists):
+        starts = _window_starts(len(token_ids), body, stride)
+        starts_per_text.append(starts)
+        for s in starts:
+            windows.append([cls_id] + token_ids[s:s + body] + [sep_id])
+
+    window_preds = []
     with torch.no_grad():
-        logits = model_loc(input_ids=input_ids, attention_mask=attention_mask).logits[0]
-    preds = torch.argmax(logits, dim=-1).tolist()
+        for i in range(0, len(windows), NER_BATCH_SIZE):
+            chunk = windows[i:i + NER_BATCH_SIZE]
+            width = max(len(w) for w in chunk)
+            input_ids = torch.tensor([w + [pad_id] * (width - len(w)) for w in chunk], device=device)
+            attention_mask = torch.tensor([[1] * len(w) + [0] * (width - len(w)) for w in chunk], device=device)
+            logits = model_loc(input_ids=input_ids, attention_mask=attention_mask).logits
+            window_preds.extend(torch.argmax(logits, dim=-1).tolist())
+
+    results = []
+    offset = 0
+    for token_ids, starts in zip(token_id_lists, starts_per_text):
+        preds = window_preds[offset:offset + len(starts)]
+        offset += len(starts)
+
+        labels = []
+        for pos in range(len(token_ids)):
+            best_w, best_margin = 0, -1
+            for w, s in enumerate(starts):
+                e = min(s + body, len(token_ids))
+                if s <= pos < e:
+                    margin = min(pos - s, e - 1 - pos)
+                    if margin > best_margin:
+                        best_w, best_margin = w, margin
+            # +1: 윈도우 맨 앞 [CLS] 오프셋
+            labels.append(model_loc.config.id2label[preds[best_w][pos - starts[best_w] + 1]])
+        results.append(labels)
+    return results
 
+
+def _spans_from_labels(words: list, word_ids: list, labels: list) -> list:
+    """토큰 라벨 열에서 B-LOC/I-LOC 단어 스팬을 모으고 불용어가 포함된 스팬은 제외합니다."""
     spans = []
     current = []
     prev_wid = None
 
-    for idx, wid in enumerate(word_ids):
-        label = "O" if wid is None else model_loc.config.id2label[preds[idx]]
+    for wid, label in zip(word_ids, labels):
         if wid is not None and label in ("B-LOC", "I-LOC"):
             if wid != prev_wid:
                 current.append(words[wid])
@@ -68,6 +158,44 @@ def extract_locations(text: str) -> list:
     return spans
 
 
+def extract_locations_batch(texts: list) -> list:
+    """
+    여러 텍스트의 지명 스팬을 한꺼번에 추출합니다. 반환값은 texts 와 같은 순서의 리스트의 리스트입니다.
+    모든 텍스트의 윈도우를 모아 배치 추론하므로 메시지 묶음 처리 시 문장별 호출보다 빠릅니다.
+    """
+    results = [[] for _ in texts]
+    pending = []  # (원래 인덱스, words, word_ids, token_ids)
+    for i, text in enumerate(texts):
+        words = text.split() if text else []
+        if not words:
+            continue
+        encoding = tokenizer_loc(
+            words,
+            is_split_into_words=True,
+            add_special_tokens=False
+        )
+        pending.append((i, words, encoding.word_ids(), encoding["input_ids"]))
+
+    if not pending:
+        return results
+
+    labels_list = _predict_token_labels_batch([p[3] for p in pending])
+    for (i, words, word_ids, _), labels in zip(pending, labels_list):
+        results[i] = _spans_from_labels(words, word_ids, labels)
+    return results
+
+
+def extract_locations(text: str) -> list:
+    """
+    입력 텍스트에서 B-LOC/I-LOC로 예측된 단어 단위 지명을 스팬으로 추출하여 리스트로 반환합니다.
+    512 토큰을 넘는 긴 문장은 겹치는 윈도우로 나누어 한 번의 배치 추론으로 처리하고 스팬을 병합합니다.
+    불용어(stopwords)에 해당하는 단어가 포함된 스팬은 제외합니다.
+    """
+    if not text:
+        return []
+    return extract_locations_batch([text])[0]
+
+
 def extracted_regions(text: str) -> list:
     """
     extract_locations를 호출해 모든 지명 스팬을 추출하고, 콘솔에 출력한 뒤 리스트로 반환합니다.
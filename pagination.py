@@ -0,0 +1,85 @@
+# pagination.py
+
+"""
+시간순 스트림의 커서 페이지네이션 / NDJSON 스트리밍 도우미.
+
+여러 테이블(RTD, 사용자 제보)의 스트림을 합쳐야 하므로 Cassandra paging state 하나로는 위치를 표현할 수 없어,
+커서는 "마지막으로 보낸 시각 + 그 시각에 이미 보낸 ID 목록"(keyset)을 base64 로 감싼 불투명 토큰입니다.
+각 스트림 내부는 드라이버 paging(fetch_size)으로 읽으므로, 조회 기간이 길어도 메모리는 페이지 크기만큼만 씁니다.
+
+스트림 항목은 (시각, ID 문자열, 응답 dict) 튜플이며, 각 스트림은 이미 시간순이어야 합니다.
+"""
+import json
+import heapq
+import base64
+from datetime import datetime, timezone
+
+
+def encode_cursor(last_time: datetime, ids: list) -> str:
+    raw = json.dumps({"t": last_time.isoformat(), "ids": ids}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(token: str):
+    """토큰을 (시각, 이미 보낸 ID 집합) 으로 복원합니다. 잘못된 토큰이면 ValueError."""
+    try:
+        data = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+        return datetime.fromisoformat(data["t"]), set(data["ids"])
+    except Exception as e:
+        raise ValueError(f"잘못된 커서: {e}")
+
+
+def cursor_bounds(cursor, start_time: datetime, end_time: datetime, descending: bool) -> tuple:
+    """커서 위치부터 다시 읽도록 조회 구간을 좁힙니다. (커서 시각은 포함, 이미 보낸 ID 는 skip_sent 로 제외)"""
+    if cursor is None:
+        return start_time, end_time
+    t = cursor[0].replace(tzinfo=timezone.utc) if cursor[0].tzinfo is None else cursor[0]
+    return (start_time, min(end_time, t)) if descending else (max(start_time, t), end_time)
+
+
+def skip_sent(items, cursor):
+    if cursor is None:
+        return items
+    t, sent = cursor
+    return (item for item in items if not (item[0] == t and item[1] in sent))
+
+
+def merge_streams(*streams, descending: bool = True):
+    """시간순 스트림들을 k-way 힙 병합합니다. (전체 정렬 없이 한 번에 각 스트림의 한 항목만 보유)"""
+    return heapq.merge(*streams, key=lambda item: item[0], reverse=descending)
+
+
+def take_page(items, limit: int, cursor=None) -> tuple:
+    """
+    items 에서 최대 limit 개를 꺼내 (응답 dict 목록, 다음 커서 또는 None) 을 반환합니다.
+    limit 개를 채운 뒤 항목이 더 남아 있을 때만 다음 커서를 만듭니다.
+    """
+    page = []
+    for item in items:
+        if len(page) == limit:
+            return [p[2] for p in page], _next_cursor(page, cursor)
+        page.append(item)
+    return [p[2] for p in page], None
+
+
+def ndjson_lines(items, limit: int = None, cursor=None):
+    """항목을 한 줄에 하나씩 JSON 으로 내보내고, 더 남아 있으면 마지막 줄에 next_cursor 를 보냅니다."""
+    count = 0
+    last_group = []  # 커서 계산에는 마지막 시각의 항목만 필요
+    for item in items:
+        if limit is not None and count == limit:
+            yield json.dumps({"next_cursor": _next_cursor(last_group, cursor)}, ensure_ascii=False) + "\n"
+            return
+        yield json.dumps(item[2], ensure_ascii=False) + "\n"
+        count += 1
+        if last_group and last_group[-1][0] != item[0]:
+            last_group = []
+        last_group.append(item)
+
+
+def _next_cursor(page: list, cursor) -> str:
+    last_time = page[-1][0]
+    ids = [item[1] for item in page if item[0] == last_time]
+    if cursor is not None and cursor[0] == last_time:
+        ids += list(cursor[1])
+    return encode_cursor(last_time, ids)
@@ -0,0 +1,139 @@
+# payloads.py
+
+"""
+조회 API 의 압축/간결 응답 (opt-in).
+
+기본 응답은 기존과 같이 JSONResponse(표준 json 인코더) 입니다. 요청에 compact=true 를 주면
+  - orjson 이 설치되어 있으면 orjson 으로, 없으면 공백 없는 표준 json 으로 직렬화하고,
+  - Accept-Encoding 에 따라 brotli(설치된 경우) 또는 gzip 으로 압축합니다. (COMPRESS_MIN_BYTES 미만은 압축하지 않음)
+shape=columnar 를 주면 항목 목록을 키 반복 없는 열 형식으로 바꿉니다.
+모든 응답에는 ETag(본문 해시)가 붙고, If-None-Match 가 같으면 본문 없이 304 를 돌려줍니다.
+항목이 OFFLOAD_MIN_ITEMS 개 이상인 응답은 직렬화/해시/압축을 스레드풀에서 실행해 이벤트 루프를 막지 않습니다.
+
+    {"columns": ["type", "id", ...], "rows": [["rtd", "...", ...], ...]}
+
+orjson / brotli 는 선택 의존성입니다. (pip install orjson brotli)
+"""
+import os
+import gzip
+import json
+import hashlib
+
+from fastapi.responses import JSONResponse, Response
+from starlette.concurrency import run_in_threadpool
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "5"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "4"))  # 응답마다 압축하므로 속도 위주
+OFFLOAD_MIN_ITEMS = int(os.getenv("PAYLOAD_OFFLOAD_MIN_ITEMS", "200"))  # 이 항목 수 이상이면 스레드풀에서 인코딩
+
+
+def encode_json(content) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def to_columnar(items: list) -> dict:
+    """dict 목록을 열 이름 목록 + 행 배열로 바꿉니다. (항목마다 키가 달라도 합집합 열, 없는 값은 null)"""
+    columns = []
+    seen = set()
+    for item in items:
+        for key in item:
+            if key not in seen:
+                seen.add(key)
+                columns.append(key)
+    return {"columns": columns, "rows": [[item.get(key) for key in columns] for item in items]}
+
+
+def negotiate_encoding(accept_encoding) -> str:
+    """Accept-Encoding 에서 사용할 압축 방식 ("br" / "gzip" / None)"""
+    accepted = set()
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(name.strip().lower())
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=GZIP_LEVEL)
+    return body
+
+
+def etag_of(body: bytes) -> str:
+    # 압축 방식과 무관하게 같은 내용이면 같은 값이 되도록 약한 ETag
+    return 'W/"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+def etag_matches(if_none_match, etag: str) -> bool:
+    """If-None-Match 헤더에 etag 가 있는지 (약한 비교)"""
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag.removeprefix("W/") in tags
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
+
+
+async def payload_response(content: dict, key: str, compact: bool = False, shape: str = None,
+                           accept_encoding: str = None, if_none_match: str = None, etag: str = None) -> Response:
+    """build_payload_response 를 응답 크기에 따라 이벤트 루프 또는 스레드풀에서 실행합니다."""
+    args = (content, key, compact, shape, accept_encoding, if_none_match, etag)
+    if len(content[key]) >= OFFLOAD_MIN_ITEMS:
+        return await run_in_threadpool(build_payload_response, *args)
+    return build_payload_response(*args)
+
+
+def build_payload_response(content: dict, key: str, compact: bool = False, shape: str = None,
+                           accept_encoding: str = None, if_none_match: str = None, etag: str = None) -> Response:
+    """
+    content[key] 가 항목 목록인 조회 응답을 만듭니다.
+    compact / shape 를 주지 않으면 기존 JSONResponse 와 같은 응답(+ ETag)입니다.
+    etag 를 주지 않으면 본문 해시를 사용합니다.
+    """
+    if shape == "columnar":
+        content = {**content, key: to_columnar(content[key])}
+    if compact:
+        body = encode_json(content)
+    else:
+        response = JSONResponse(content=content)
+        body = response.body
+    etag = etag or etag_of(body)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    if not compact:
+        response.headers["ETag"] = etag
+        return response
+
+    headers = {"Vary": "Accept-Encoding", "ETag": etag}
+    encoding = negotiate_encoding(accept_encoding) if len(body) >= COMPRESS_MIN_BYTES else None
+    if encoding:
+        body = compress(body, encoding)
+        headers["Content-Encoding"] = encoding
+    return Response(body, media_type="application/json", headers=headers)
@@ -1,7 +1,9 @@
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, Header
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 import uvicorn
 import logging
+import asyncio
 from cassandra.cluster import Cluster
 from cassandra.auth import PlainTextAuthProvider
 import os
@@ -15,6 +17,24 @@ from uuid import uuid4
 from fastapi import Query
 from fastapi import Body
 from fcm_sender import send_broadcast_data_message
+from report_expiry import report_visible
+from time_buckets import ensure_schema, day_of, BucketQueries, REPORT_BY_DAY_INSERT_CQL
+from event_cache import EventCache, ReportRow, first_rtd_filter
+from geo_cells import (
+    ensure_geo_schema, cell_of, cells_in_bbox, cell_count_in_bbox, valid_coordinate, radius_bbox, haversine_km,
+    CellQueries,
+    REPORT_BY_CELL_INSERT_CQL, NEARBY_MAX_PARTITIONS
+)
+from cassandra_aio import aexecute, afirst, aexecute_all
+from payloads import payload_response, etag_matches, not_modified
+from change_log import (
+    ensure_change_log_schema, change_params, encode_token, decode_token, since_position,
+    ChangeFeed, ChangeLogExpired, CHANGE_INSERT_CQL
+)
+from votes import ensure_vote_schema, is_hidden, VoteCounter
+from device_tokens import ensure_device_token_schema, DeviceTokenIndex
+from report_lookup import ensure_report_lookup_schema, ReportKeyLookup, REPORT_ID_INSERT_CQL, REPORT_ID_DELETE_CQL
+from pagination import decode_cursor, cursor_bounds, skip_sent, merge_streams, take_page, ndjson_lines
 
 # 환경 변수 로드 (.env 파일 활용)
 load_dotenv()
@@ -24,6 +44,9 @@ CASSANDRA_USER = os.getenv("CASSANDRA_USER", "andy013")
 CASSANDRA_PASS = os.getenv("CASSANDRA_PASS", "1212")
 KEYSPACE = os.getenv("CASSANDRA_KEYSPACE", "disaster_service")
 
+SEARCH_PAGE_SIZE = int(os.getenv("SEARCH_PAGE_SIZE", "100"))  # 커서 조회 시 limit 기본값
+SYNC_PAGE_SIZE = int(os.getenv("SYNC_PAGE_SIZE", "500"))  # /sync 한 번에 돌려주는 변경 수 기본값
+
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
@@ -36,6 +59,19 @@ try:
     )
     session = cluster.connect(KEYSPACE)
     logging.info("Cassandra 연결 성공")
+    ensure_schema(session)
+    ensure_geo_schema(session)
+    ensure_change_log_schema(session)
+    ensure_vote_schema(session)
+    ensure_report_lookup_schema(session)
+    ensure_device_token_schema(session)
+    buckets = BucketQueries(session)
+    event_cache = EventCache(buckets)
+    cell_queries = CellQueries(session)
+    change_feed = ChangeFeed(session)
+    vote_counter = VoteCounter(session)
+    report_keys = ReportKeyLookup(session)
+    device_tokens = DeviceTokenIndex(session)
 except Exception as e:
     logging.error(f"Cassandra 연결 실패: {e}")
     raise
@@ -44,12 +80,12 @@ app = FastAPI()
 
 
 @app.get("/")
-def read_root():
+async def read_root():
     return {"message": "Test Events API is running."}
 
 
 @app.get("/events")
-def get_test_events():
+async def get_test_events():
     """
     test_events 테이블의 모든 데이터를 조회하여 JSON으로 반환하는 엔드포인트입니다.
     """
@@ -58,7 +94,7 @@ def get_test_events():
             SELECT disaster_id, description, disaster_time, disaster_type, latitude, longitude 
             FROM test_events
         """
-        rows = session.execute(query)
+        rows = await aexecute_all(session, query)
         events = []
         for row in rows:
             event = {
@@ -76,12 +112,125 @@ def get_test_events():
         raise HTTPException(status_code=500, detail="Cassandra 조회 실패")
 
 
+# ---------------------------------------------------------------------------
+# 시간순 조회 스트림 / 커서 페이지네이션 공통
+# ---------------------------------------------------------------------------
+def history_report_item(row, now) -> dict:
+    return {
+        "report_id": str(row.report_id),
+        "report_time": row.report_at.isoformat() if row.report_at else None,
+        "middle_type": row.middle_type,
+        "small_type": row.small_type,
+        "report_location": row.report_location,
+        "report_content": row.report_content,
+        "latitude": row.report_lat,
+        "longitude": row.report_lot,
+        "visible": report_visible(row.report_at, row.visible, now),
+        "delete_vote": row.delete_vote,
+        "report_by_id": row.report_by_id
+    }
+
+
+def search_report_item(row, now) -> dict:
+    return {
+        "type": "report",
+        "id": str(row.report_id),
+        "time": row.report_at.isoformat() if row.report_at else None,
+        "report_location": row.report_location,
+        "middle_type": row.middle_type,
+        "small_type": row.small_type,
+        "content": row.report_content,
+        "report_by": row.report_by_id,
+        "latitude": row.report_lat,
+        "longitude": row.report_lot,
+        "visible": report_visible(row.report_at, row.visible, now),
+        "delete_vote": row.delete_vote
+    }
+
+
+def search_rtd_item(row, visible, vote_count) -> dict:
+    return {
+        "type": "rtd",
+        "id": str(row.id),
+        "time": row.rtd_time.isoformat() if row.rtd_time else None,
+        "rtd_loc": row.rtd_loc,
+        "rtd_details": row.rtd_details,
+        "rtd_code": row.rtd_code,
+        "regioncode": getattr(row, 'regioncode', None),
+        "latitude": getattr(row, 'latitude', None),
+        "longitude": getattr(row, 'longitude', None),
+        "vote_count": vote_count,
+        "visible": visible,
+    }
+
+
+def history_stream(user_id, start_time, end_time, now):
+    """
+    제보 내역을 최신순 (시각, ID, 응답 dict) 스트림으로 돌려줍니다.
+    범위 안의 날짜 파티션만 읽고, user_id 가 있으면 버킷 행의 report_by_id 로 거릅니다.
+    """
+    for row in buckets.report_rows(start_time, end_time):
+        if user_id and row.report_by_id != user_id:
+            continue
+        yield row.report_at, str(row.report_id), history_report_item(row, now)
+
+
+def search_stream(start_time, end_time, descending, now, rtd_loc=None, regioncode=None, rtd_code=None):
+    """
+    RTD 와 사용자 제보 날짜 버킷 스트림을 시간순으로 병합합니다.
+    필터는 비페이지 조회와 같이 첫 번째 조건(rtd_loc > regioncode > rtd_code) 하나만 버킷 행에 적용합니다.
+    """
+    rtd_filter = first_rtd_filter(rtd_loc, regioncode, rtd_code)
+
+    def rtd_stream():
+        for row in buckets.rtd_rows(start_time, end_time, descending):
+            if rtd_filter is not None and getattr(row, rtd_filter[0]) != rtd_filter[1]:
+                continue
+            visible = row.visible if row.visible is not None else True
+            yield row.rtd_time, str(row.id), search_rtd_item(row, visible, row.vote_count or 0)
+
+    def report_stream():
+        for row in buckets.report_rows(start_time, end_time, descending):
+            yield row.report_at, str(row.report_id), search_report_item(row, now)
+
+    return merge_streams(rtd_stream(), report_stream(), descending=descending)
+
+
+def paged_response(make_stream, start_time, end_time, descending, limit, cursor, format, key):
+    """
+    make_stream(start, end) 스트림을 커서 위치부터 limit 개 응답합니다.
+    format=ndjson 이면 한 줄씩 스트리밍하고, 남은 항목이 있으면 마지막 줄에 next_cursor 를 보냅니다.
+    """
+    try:
+        position = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    start, end = cursor_bounds(position, start_time, end_time, descending)
+    items = skip_sent(make_stream(start, end), position)
+
+    if format == "ndjson":
+        return StreamingResponse(ndjson_lines(items, limit, position), media_type="application/x-ndjson")
+    try:
+        page, next_cursor = take_page(items, limit or SEARCH_PAGE_SIZE, position)
+    except Exception as e:
+        logging.error(f"페이지 조회 실패: {e}")
+        raise HTTPException(status_code=500, detail="페이지 조회 실패")
+    return JSONResponse(content={key: page, "count": len(page), "next_cursor": next_cursor})
+
+
 @app.get("/userReport/history")
-def get_user_report_history(
+async def get_user_report_history(
     userId: Optional[str] = Query(None, description="제보자 ID (없으면 전체 조회)"),
     from_time: Optional[str] = None,
     to_time: Optional[str] = None,
-    days: Optional[int] = 7
+    days: Optional[int] = 7,
+    limit: Optional[int] = Query(None, ge=1, description="페이지 크기 (지정 시 커서 페이지네이션)"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    format: Optional[str] = Query("json", description="json 또는 ndjson(스트리밍)"),
+    compact: bool = Query(False, description="빠른 JSON 인코더 + Accept-Encoding 압축"),
+    shape: Optional[str] = Query(None, description="columnar: 열 형식 응답"),
+    accept_encoding: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None)
 ):
     now = datetime.utcnow().replace(tzinfo=timezone.utc)
 
@@ -98,42 +247,21 @@ def get_user_report_history(
     except ValueError:
         raise HTTPException(status_code=400, detail="시간 형식이 잘못되었습니다 (ISO 8601)")
 
-    try:
-        if userId:
-            query = """
-                SELECT * FROM user_report_by_user_time
-                WHERE report_by_id = %s AND report_at >= %s AND report_at <= %s
-                ALLOW FILTERING
-            """
-            rows = list(session.execute(query, (userId, start_time, end_time)))
-        else:
-            query = """
-                SELECT * FROM user_report_by_time
-                WHERE report_at >= %s AND report_at <= %s
-                ALLOW FILTERING
-            """
-            rows = list(session.execute(query, (start_time, end_time)))
-
-        reports = []
-        for row in rows:
-            reports.append({
-                "report_id": str(row.report_id),
-                "report_time": row.report_at.isoformat() if row.report_at else None,
-                "middle_type": row.middle_type,
-                "small_type": row.small_type,
-                "report_location": row.report_location,
-                "report_content": row.report_content,
-                "latitude": row.report_lat,
-                "longitude": row.report_lot,
-                "visible": row.visible,
-                "delete_vote": row.delete_vote,
-                "report_by_id": row.report_by_id
-            })
+    if limit is not None or cursor or format == "ndjson":
+        # 커서/스트리밍 조회는 동기 스트림을 스레드풀에서 소비
+        return await run_in_threadpool(
+            paged_response,
+            lambda start, end: history_stream(userId, start, end, now),
+            start_time, end_time, True, limit, cursor, format, "events"
+        )
 
-        # Python에서 report_time을 기준으로 내림차순 정렬
-        reports.sort(key=lambda x: x.get("report_time") or "", reverse=True)
+    try:
+        # 범위 안의 날짜 파티션만 조회 (최신순), 제보자 조건은 커서 조회와 같이 버킷 행에 적용
+        rows = await buckets.report_rows_async(start_time, end_time)
+        reports = [history_report_item(row, now) for row in rows if not userId or row.report_by_id == userId]
 
-        return JSONResponse(content={"events": reports, "count": len(reports)})
+        return await payload_response({"events": reports, "count": len(reports)}, "events",
+                                      compact, shape, accept_encoding, if_none_match)
 
     except Exception as e:
         logging.error(f"제보 내역 조회 실패: {e}")
@@ -165,11 +293,11 @@ class UserReportRequest(BaseModel):
     longitude: Optional[float] = None
 
 @app.post("/userReport")
-def create_user_report(request: UserReportRequest):
+async def create_user_report(request: UserReportRequest):
     try:
         # 사용자 존재 여부 확인
         check_query = "SELECT user_id FROM user_device WHERE user_id = %s"
-        result = session.execute(check_query, (request.userId,)).one()
+        result = await afirst(session, check_query, (request.userId,))
 
         if result is None:
             raise HTTPException(status_code=404, detail="사용자 정보가 존재하지 않습니다.")
@@ -202,7 +330,7 @@ def create_user_report(request: UserReportRequest):
             VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, true, 0, [])
         """
 
-        session.execute(insert_query, (
+        insert_original = aexecute(session, insert_query, (
             request.userId,
             report_time,
             report_id,
@@ -213,6 +341,39 @@ def create_user_report(request: UserReportRequest):
             request.latitude,
             request.longitude
         ))
+        # 날짜 버킷 조회 테이블 이중 기록 (원본과 동시에 실행)
+        insert_bucket = aexecute(session, REPORT_BY_DAY_INSERT_CQL, (
+            day_of(report_time),
+            report_time,
+            report_id,
+            request.userId,
+            middle_type,
+            small_type,
+            request.disasterPos,
+            request.reportContent,
+            request.latitude,
+            request.longitude,
+            True,
+            0
+        ))
+        writes = [insert_original, insert_bucket,
+                  aexecute(session, REPORT_ID_INSERT_CQL, (report_id, request.userId, report_time))]
+        # 좌표가 있으면 격자 셀 조회 테이블에도 기록
+        report_cell = cell_of(request.latitude, request.longitude)
+        if report_cell is not None:
+            writes.append(aexecute(session, REPORT_BY_CELL_INSERT_CQL, (
+                report_cell, day_of(report_time), report_time, report_id, request.userId,
+                middle_type, small_type, request.disasterPos, request.reportContent,
+                request.latitude, request.longitude, True, 0
+            )))
+        await asyncio.gather(*writes)
+        # 변경 로그는 조회 테이블 기록이 끝난 뒤에 (동기화가 변경을 읽었을 때 행이 있도록)
+        await aexecute(session, CHANGE_INSERT_CQL, change_params("report", "insert", report_time, report_id))
+        report_keys.put(report_id, request.userId, report_time)
+        event_cache.add_report(ReportRow(
+            day_of(report_time), report_time, report_id, request.userId, middle_type, small_type,
+            request.disasterPos, request.reportContent, request.latitude, request.longitude, True, 0
+        ))
 
         logging.info(f"New user report created: report_id={report_id}, report_time={report_time}")
 
@@ -228,7 +389,7 @@ def create_user_report(request: UserReportRequest):
             'longitude': str(request.longitude) if request.longitude is not None else '',
             'content': request.reportContent if request.reportContent else ''
         }
-        send_broadcast_data_message(data_payload)
+        await run_in_threadpool(send_broadcast_data_message, data_payload)
 
         return {"message": "제보가 성공적으로 저장 및 전파되었습니다.", "report_id": str(report_id)}
 
@@ -242,34 +403,71 @@ class VoteByIDRequest(BaseModel):
     report_id: UUID
     user_id: str
 
+def vote_count_update_cql(table: str, where: str, count_col: str, guard_col: str, hidden: bool) -> tuple:
+    """
+    투표 수 비정규화 조건부 UPDATE 두 개 (값을 올리는 문, 투표 수가 비어 있던 행용 문)
+      - IF count_col < 새 값: 동시에 투표해 작은 값이 나중에 도착해도 더 큰 값을 덮어쓰지 않음
+      - IF count_col = null AND guard_col != null: 투표 수가 없던 기존 행. guard_col 조건으로 없는 행은 만들지 않음
+    투표 수는 줄지 않으므로 숨김 기준을 넘었을 때만 visible = false 를 함께 기록합니다.
+    """
+    set_clause = f"{count_col} = %s, visible = false" if hidden else f"{count_col} = %s"
+    update = f"UPDATE {table} SET {set_clause} WHERE {where}"
+    return f"{update} IF {count_col} < %s", f"{update} IF {count_col} = null AND {guard_col} != null"
+
+
+async def write_vote_count(table: str, where: str, key: tuple, count_col: str, guard_col: str,
+                           new_count: int, hidden: bool):
+    """투표 수를 new_count 로 올립니다. 이미 같거나 큰 값이 있거나 행이 없으면 기록하지 않습니다."""
+    raise_cql, null_cql = vote_count_update_cql(table, where, count_col, guard_col, hidden)
+    result = await afirst(session, raise_cql, (new_count,) + key + (new_count,))
+    if result is not None and not result.applied and getattr(result, count_col, None) is None:
+        await aexecute(session, null_cql, (new_count,) + key)
+
+
 @app.post("/report/vote_by_id")
-def vote_to_delete_by_report_id(data: VoteByIDRequest):
+async def vote_to_delete_by_report_id(data: VoteByIDRequest):
     try:
-        # 1. 기존 데이터 조회
-        query = "SELECT report_by_id, report_at, delete_vote, vote_user_ids, visible FROM user_report WHERE report_id = %s ALLOW FILTERING"
-        row = session.execute(query, (data.report_id,)).one()
+        # 1. report_id → 원본 기본 키 조회 후 원본 파티션만 읽음 (투표자 목록은 읽지 않음)
+        report_key = await report_keys.resolve(data.report_id)
+        row = None
+        if report_key is not None:
+            query = """
+                SELECT report_by_id, report_at, visible, report_lat, report_lot
+                FROM user_report WHERE report_by_id = %s AND report_at = %s
+            """
+            row = await afirst(session, query, report_key)
 
         if not row:
             raise HTTPException(status_code=404, detail="해당 제보를 찾을 수 없습니다.")
 
-        voter_ids = row.vote_user_ids or []
-        if data.user_id in voter_ids:
+        # 2. 투표자 표시 행(IF NOT EXISTS) + counter 증가 — 중복 투표는 적용되지 않음
+        new_count = await vote_counter.vote("report", data.report_id, data.user_id)
+        if new_count is None:
             raise HTTPException(status_code=400, detail="이미 이 제보에 투표하셨습니다.")
-
-        # 2. 투표 추가 및 비활성 여부 판단
-        voter_ids.append(data.user_id)
-        new_count = (row.delete_vote or 0) + 1
-        visible_flag = False if new_count >= 10 else True
-
-        # 3. 업데이트
-        update_q = """
-            UPDATE user_report
-            SET vote_user_ids = %s,
-                delete_vote = %s,
-                visible = %s
-            WHERE report_by_id = %s AND report_at = %s
-        """
-        session.execute(update_q, (voter_ids, new_count, visible_flag, row.report_by_id, row.report_at))
+        hidden = is_hidden(new_count)
+        visible_flag = not hidden and row.visible is not False
+
+        # 3. 원본 / 날짜 버킷 / 격자 셀 조회 테이블에 투표 수 반영 (조회 시 원본 재조회 불필요, 동시에 실행)
+        #    조건부 UPDATE — 더 큰 투표 수만 기록하고, 아직 백필되지 않은 제보에 투표 수만 있는 빈 행을 만들지 않음
+        day = day_of(row.report_at)
+        writes = [
+            write_vote_count("user_report", "report_by_id = %s AND report_at = %s",
+                             (row.report_by_id, row.report_at), "delete_vote", "report_id", new_count, hidden),
+            write_vote_count("user_report_by_day", "day = %s AND report_at = %s AND report_id = %s",
+                             (day, row.report_at, data.report_id), "delete_vote", "report_by_id", new_count, hidden)
+        ]
+        report_cell = cell_of(row.report_lat, row.report_lot)
+        if report_cell is not None:
+            writes.append(write_vote_count(
+                "user_report_by_cell", "cell = %s AND day = %s AND report_at = %s AND report_id = %s",
+                (report_cell, day, row.report_at, data.report_id), "delete_vote", "report_by_id", new_count, hidden
+            ))
+        await asyncio.gather(*writes)
+        await aexecute(session, CHANGE_INSERT_CQL, change_params("report", "vote", row.report_at, data.report_id))
+        if hidden:
+            event_cache.update_report(data.report_id, delete_vote=new_count, visible=False)
+        else:
+            event_cache.update_report(data.report_id, delete_vote=new_count)
 
         return JSONResponse(content={
             "message": "투표 완료",
@@ -289,36 +487,49 @@ class RtdVoteRequest(BaseModel):
     user_id: str
 
 @app.post("/rtd/vote")
-def vote_on_rtd(data: RtdVoteRequest):
+async def vote_on_rtd(data: RtdVoteRequest):
     try:
-        # 1. Fetch current vote status
+        # 1. 항목 존재 확인 (투표자 목록은 읽지 않음)
         query = """
-            SELECT vote_count, vote_user_ids, visible
+            SELECT visible, latitude, longitude
             FROM rtd_db
             WHERE rtd_time = %s AND id = %s
         """
-        row = session.execute(query, (data.rtd_time, data.rtd_id)).one()
+        row = await afirst(session, query, (data.rtd_time, data.rtd_id))
 
         if not row:
             raise HTTPException(status_code=404, detail="해당 RTD 항목을 찾을 수 없습니다.")
 
-        voter_ids = row.vote_user_ids or []
-        if data.user_id in voter_ids:
+        # 2. 투표자 표시 행(IF NOT EXISTS) + counter 증가 — 중복 투표는 적용되지 않음
+        new_count = await vote_counter.vote("rtd", data.rtd_id, data.user_id)
+        if new_count is None:
             raise HTTPException(status_code=400, detail="이미 이 RTD 항목에 투표하셨습니다.")
-
-        # 2. Update vote count and user IDs
-        voter_ids.append(data.user_id)
-        new_count = (row.vote_count or 0) + 1
-        visible_flag = False if new_count >= 10 else True # 10표 이상이면 visible = False
-
-        logging.info(f"RTD Vote - Before update: rtd_id={data.rtd_id}, current_vote_count={row.vote_count}, new_count={new_count}, visible_flag={visible_flag}")
-
-        update_query = """
-            UPDATE rtd_db
-            SET vote_count = %s, vote_user_ids = %s, visible = %s
-            WHERE rtd_time = %s AND id = %s
-        """
-        session.execute(update_query, (new_count, voter_ids, visible_flag, data.rtd_time, data.rtd_id))
+        hidden = is_hidden(new_count)  # VOTE_HIDE_THRESHOLD 표 이상이면 visible = False
+        visible_flag = not hidden and row.visible is not False
+
+        logging.info(f"RTD Vote: rtd_id={data.rtd_id}, new_count={new_count}, visible_flag={visible_flag}")
+
+        # 3. 원본 / 날짜 버킷 / 격자 셀 조회 테이블에 투표 수 반영 (동시에 실행) + 프로세스 내 조회 캐시 갱신
+        #    조건부 UPDATE — 더 큰 투표 수만 기록하고, 아직 백필되지 않은 항목에 투표 수만 있는 빈 행을 만들지 않음
+        day = day_of(data.rtd_time)
+        writes = [
+            write_vote_count("rtd_db", "rtd_time = %s AND id = %s",
+                             (data.rtd_time, data.rtd_id), "vote_count", "rtd_code", new_count, hidden),
+            write_vote_count("rtd_by_day", "day = %s AND rtd_time = %s AND id = %s",
+                             (day, data.rtd_time, data.rtd_id), "vote_count", "rtd_code", new_count, hidden)
+        ]
+        rtd_cell = cell_of(row.latitude, row.longitude)
+        if rtd_cell is not None:
+            writes.append(write_vote_count(
+                "rtd_by_cell", "cell = %s AND day = %s AND rtd_time = %s AND id = %s",
+                (rtd_cell, day, data.rtd_time, data.rtd_id), "vote_count", "rtd_code", new_count, hidden
+            ))
+        await asyncio.gather(*writes)
+        await aexecute(session, CHANGE_INSERT_CQL, change_params("rtd", "vote", data.rtd_time, data.rtd_id))
+        if hidden:
+            event_cache.update_rtd(data.rtd_time, data.rtd_id, vote_count=new_count, visible=False)
+        else:
+            event_cache.update_rtd(data.rtd_time, data.rtd_id, vote_count=new_count)
 
         return JSONResponse(content={
             "message": "RTD 투표 완료",
@@ -332,7 +543,7 @@ def vote_on_rtd(data: RtdVoteRequest):
         logging.error(f"RTD 투표 실패: {e}")
         raise HTTPException(status_code=500, detail="RTD 투표 실패")
 @app.get("/report/user_history")
-def get_reports_by_user(
+async def get_reports_by_user(
     user_id: str = Query(..., description="제보자 ID"),
     limit: int = 50
 ):
@@ -345,7 +556,7 @@ def get_reports_by_user(
             WHERE report_by_id = %s
             LIMIT %s
         """
-        rows = list(session.execute(query, (user_id, limit)))
+        rows = await aexecute_all(session, query, (user_id, limit))
 
         results = []
         for row in rows:
@@ -358,7 +569,7 @@ def get_reports_by_user(
                 "report_content": row.report_content,
                 "latitude": row.report_lat,
                 "longitude": row.report_lot,
-                "visible": row.visible,
+                "visible": report_visible(row.report_at, row.visible),
                 "delete_vote": row.delete_vote,
                 "vote_id": row.vote_id,
             })
@@ -376,17 +587,20 @@ class DeleteReportRequest(BaseModel):
     user_id: str
 
 @app.delete("/report/delete")
-def delete_user_report(data: DeleteReportRequest = Body(...)):
+async def delete_user_report(data: DeleteReportRequest = Body(...)):
     from cassandra.query import BatchStatement, SimpleStatement
     try:
-        # 1. 삭제할 제보의 모든 필드 조회
-        query = """
-            SELECT report_id, report_by_id, report_at, delete_vote, middle_type, small_type,
-                   report_content, report_lat, report_location, report_lot, visible, vote_user_ids
-            FROM user_report
-            WHERE report_id = %s ALLOW FILTERING
-        """
-        report_to_delete = session.execute(query, (data.report_id,)).one()
+        # 1. report_id → 원본 기본 키 조회 후 삭제할 제보의 모든 필드 조회
+        report_key = await report_keys.resolve(data.report_id)
+        report_to_delete = None
+        if report_key is not None:
+            query = """
+                SELECT report_id, report_by_id, report_at, delete_vote, middle_type, small_type,
+                       report_content, report_lat, report_location, report_lot, visible, vote_user_ids
+                FROM user_report
+                WHERE report_by_id = %s AND report_at = %s
+            """
+            report_to_delete = await afirst(session, query, report_key)
 
         if not report_to_delete:
             raise HTTPException(status_code=404, detail="해당 제보를 찾을 수 없습니다.")
@@ -427,9 +641,28 @@ def delete_user_report(data: DeleteReportRequest = Body(...)):
         # 5. user_report 테이블에서 삭제
         delete_original_query = "DELETE FROM user_report WHERE report_by_id = %s AND report_at = %s"
         batch.add(SimpleStatement(delete_original_query), (report_to_delete.report_by_id, report_to_delete.report_at))
+        delete_bucket_query = "DELETE FROM user_report_by_day WHERE day = %s AND report_at = %s AND report_id = %s"
+        batch.add(SimpleStatement(delete_bucket_query), (
+            day_of(report_to_delete.report_at), report_to_delete.report_at, report_to_delete.report_id
+        ))
+        report_cell = cell_of(report_to_delete.report_lat, report_to_delete.report_lot)
+        if report_cell is not None:
+            delete_cell_query = (
+                "DELETE FROM user_report_by_cell WHERE cell = %s AND day = %s AND report_at = %s AND report_id = %s"
+            )
+            batch.add(SimpleStatement(delete_cell_query), (
+                report_cell, day_of(report_to_delete.report_at), report_to_delete.report_at, report_to_delete.report_id
+            ))
+
+        batch.add(SimpleStatement(REPORT_ID_DELETE_CQL), (report_to_delete.report_id,))
+        batch.add(SimpleStatement(CHANGE_INSERT_CQL), change_params(
+            "report", "delete", report_to_delete.report_at, report_to_delete.report_id
+        ))
 
         # 6. 배치 실행
-        session.execute(batch)
+        await aexecute(session, batch)
+        report_keys.discard(report_to_delete.report_id)
+        event_cache.remove_report(report_to_delete.report_id)
 
         return {"message": "제보가 성공적으로 삭제(아카이빙)되었습니다."}
 
@@ -439,14 +672,21 @@ def delete_user_report(data: DeleteReportRequest = Body(...)):
         logging.error(f"제보 삭제(아카이빙) 실패: {e}")
         raise HTTPException(status_code=500, detail="제보 삭제(아카이빙) 실패")
 @app.get("/rtd/search")
-def search_rtd(
+async def search_rtd(
     rtd_loc: Optional[str] = None,
     regioncode: Optional[int] = None,
     rtd_code: Optional[int] = None,
     from_time: Optional[str] = None,
     to_time: Optional[str] = None,
     days: Optional[int] = 1,
-    sort: Optional[str] = Query("desc", description="정렬 순서: asc 또는 desc")
+    sort: Optional[str] = Query("desc", description="정렬 순서: asc 또는 desc"),
+    limit: Optional[int] = Query(None, ge=1, description="페이지 크기 (지정 시 커서 페이지네이션)"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    format: Optional[str] = Query("json", description="json 또는 ndjson(스트리밍)"),
+    compact: bool = Query(False, description="빠른 JSON 인코더 + Accept-Encoding 압축"),
+    shape: Optional[str] = Query(None, description="columnar: 열 형식 응답"),
+    accept_encoding: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None)
 ):
     now = datetime.utcnow().replace(tzinfo=timezone.utc)
 
@@ -463,86 +703,42 @@ def search_rtd(
     except ValueError:
         raise HTTPException(status_code=400, detail="시간 형식이 잘못되었습니다 (ISO 8601)")
 
-    rtd_results = []
-    report_results = []
-
-    try:
-        # === 1) RTD 데이터 조회 ===
-        if rtd_loc:
-            rtd_query = """
-                SELECT * FROM rtd_by_loc_time
-                WHERE rtd_loc = %s AND rtd_time >= %s AND rtd_time <= %s
-                ALLOW FILTERING
-            """
-            rtd_rows = session.execute(rtd_query, (rtd_loc, start_time, end_time))
-        elif regioncode:
-            rtd_query = """
-                SELECT * FROM rtd_by_region_time
-                WHERE regioncode = %s AND rtd_time >= %s AND rtd_time <= %s
-                ALLOW FILTERING
-            """
-            rtd_rows = session.execute(rtd_query, (regioncode, start_time, end_time))
-        elif rtd_code is not None:
-            rtd_query = """
-                SELECT * FROM rtd_by_code_time
-                WHERE rtd_code = %s AND rtd_time >= %s AND rtd_time <= %s
-                ALLOW FILTERING
-            """
-            rtd_rows = session.execute(rtd_query, (rtd_code, start_time, end_time))
-        else:
-            rtd_query = """
-                SELECT * FROM rtd_by_code_time
-                WHERE rtd_time >= %s AND rtd_time <= %s
-                ALLOW FILTERING
-            """
-            rtd_rows = session.execute(rtd_query, (start_time, end_time))
-
-        for row in rtd_rows:
-            # rtd_db에서 최신 visible 상태 조회
-            rtd_db_query = "SELECT visible FROM rtd_db WHERE rtd_time = %s AND id = %s"
-            rtd_db_row = session.execute(rtd_db_query, (row.rtd_time, row.id)).one()
-
-            current_visible = True # 기본값은 True
-            if rtd_db_row and hasattr(rtd_db_row, 'visible'):
-                current_visible = rtd_db_row.visible
-
-            rtd_results.append({
-                "type": "rtd",
-                "id": str(row.id),
-                "time": row.rtd_time.isoformat() if row.rtd_time else None,
-                "rtd_loc": row.rtd_loc,
-                "rtd_details": row.rtd_details,
-                "rtd_code": row.rtd_code,
-                "regioncode": getattr(row, 'regioncode', None),
-                "latitude": getattr(row, 'latitude', None),
-                "longitude": getattr(row, 'longitude', None),
-                "vote_count": getattr(row, 'vote_count', 0),
-                "visible": current_visible, # rtd_db에서 조회한 visible 값 사용
-            })
+    # 커서/스트리밍 조회: 날짜 버킷 스트림을 힙 병합하여 페이지 크기만큼만 메모리에 유지 (스레드풀에서 소비)
+    if limit is not None or cursor or format == "ndjson":
+        descending = sort != "asc"
+        return await run_in_threadpool(
+            paged_response,
+            lambda start, end: search_stream(start, end, descending, now, rtd_loc, regioncode, rtd_code),
+            start_time, end_time, descending, limit, cursor, format, "results"
+        )
 
-        # === 2) user_report 테이블 조회 ===
-        report_query = """
-            SELECT * FROM user_report_by_time
-            WHERE report_at >= %s AND report_at <= %s
-            ALLOW FILTERING
-        """
-        report_rows = session.execute(report_query, (start_time, end_time))
+    # 최근 EVENT_CACHE_DAYS 일 안의 조회는 프로세스 내 이벤트 캐시에서 응답
+    cached = await event_cache.search(start_time, end_time, sort != "asc", rtd_loc, regioncode, rtd_code)
+    if cached is not None:
+        results = [
+            search_rtd_item(row, row.visible if row.visible is not None else True, row.vote_count or 0)
+            if kind == "rtd" else search_report_item(row, now)
+            for kind, row in cached
+        ]
+        return await payload_response({"count": len(results), "results": results}, "results",
+                                      compact, shape, accept_encoding, if_none_match)
+
+    async def fetch_rtd() -> list:
+        # 범위 안의 날짜 파티션만 조회하고, 필터는 커서 조회(search_stream)와 같이 첫 번째 조건 하나만 버킷 행에 적용
+        # 투표 상태(visible/vote_count)는 투표 시 버킷 행에도 함께 기록되므로 그대로 사용
+        rtd_filter = first_rtd_filter(rtd_loc, regioncode, rtd_code)
+        rtd_rows = await buckets.rtd_rows_async(start_time, end_time, descending=(sort != "asc"))
+        return [search_rtd_item(row, row.visible if row.visible is not None else True, row.vote_count or 0)
+                for row in rtd_rows
+                if rtd_filter is None or getattr(row, rtd_filter[0]) == rtd_filter[1]]
+
+    async def fetch_reports() -> list:
+        report_rows = await buckets.report_rows_async(start_time, end_time, descending=(sort != "asc"))
+        return [search_report_item(row, now) for row in report_rows]
 
-        for row in report_rows:
-            report_results.append({
-                "type": "report",
-                "id": str(row.report_id),
-                "time": row.report_at.isoformat() if row.report_at else None,
-                "report_location": row.report_location,
-                "middle_type": row.middle_type,
-                "small_type": row.small_type,
-                "content": row.report_content,
-                "report_by": row.report_by_id,
-                "latitude": row.report_lat,
-                "longitude": row.report_lot,
-                "visible": row.visible,
-                "delete_vote": row.delete_vote
-            })
+    try:
+        # === 1) RTD / 2) user_report 조회를 동시에 실행 ===
+        rtd_results, report_results = await asyncio.gather(fetch_rtd(), fetch_reports())
 
         # === 3) 통합 정렬 ===
         merged_results = rtd_results + report_results
@@ -553,16 +749,162 @@ def search_rtd(
             reverse=(sort != "asc")  # asc일 때만 오름차순, 나머지는 최신순
         )
 
-        return JSONResponse(content={
+        return await payload_response({
             "count": len(sorted_results),
             "results": sorted_results
-        })
+        }, "results", compact, shape, accept_encoding, if_none_match)
 
     except Exception as e:
         logging.error(f"검색 오류: {e}")
         raise HTTPException(status_code=500, detail="rtd/search 통합 검색 실패")
 
 
+@app.get("/rtd/nearby")
+async def search_nearby(
+    min_lat: Optional[float] = None,
+    min_lon: Optional[float] = None,
+    max_lat: Optional[float] = None,
+    max_lon: Optional[float] = None,
+    lat: Optional[float] = Query(None, description="반경 검색 중심 위도"),
+    lon: Optional[float] = Query(None, description="반경 검색 중심 경도"),
+    radius_km: Optional[float] = Query(None, gt=0, description="반경(km)"),
+    from_time: Optional[str] = None,
+    to_time: Optional[str] = None,
+    days: Optional[int] = 1,
+    sort: Optional[str] = Query("desc", description="정렬 순서: asc 또는 desc"),
+    compact: bool = Query(False, description="빠른 JSON 인코더 + Accept-Encoding 압축"),
+    shape: Optional[str] = Query(None, description="columnar: 열 형식 응답"),
+    accept_encoding: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    사각형 영역(min_lat, min_lon, max_lat, max_lon) 또는 중심 + 반경(lat, lon, radius_km) 안의
+    RTD / 사용자 제보를 조회합니다. 영역을 덮는 격자 셀의 날짜 파티션만 읽고 정확한 영역으로 다시 거릅니다.
+    """
+    now = datetime.utcnow().replace(tzinfo=timezone.utc)
+    try:
+        if from_time and to_time:
+            start_time = datetime.fromisoformat(from_time).astimezone(timezone.utc)
+            end_time = datetime.fromisoformat(to_time).astimezone(timezone.utc)
+        else:
+            end_time = now + timedelta(seconds=1)
+            start_time = now - timedelta(days=days)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="시간 형식이 잘못되었습니다 (ISO 8601)")
+
+    # 좌표가 없는 행(inside 의 p_lat/p_lon 이 None)은 영역 밖으로 봅니다.
+    if None not in (lat, lon, radius_km):
+        if not valid_coordinate(lat, lon):
+            raise HTTPException(status_code=400, detail="좌표 범위가 잘못되었습니다 (위도 -90~90, 경도 -180~180)")
+        bbox = radius_bbox(lat, lon, radius_km)
+
+        def inside(p_lat, p_lon):
+            return p_lat is not None and p_lon is not None and haversine_km(lat, lon, p_lat, p_lon) <= radius_km
+    elif None not in (min_lat, min_lon, max_lat, max_lon):
+        if not (valid_coordinate(min_lat, min_lon) and valid_coordinate(max_lat, max_lon)):
+            raise HTTPException(status_code=400, detail="좌표 범위가 잘못되었습니다 (위도 -90~90, 경도 -180~180)")
+        if min_lat > max_lat or min_lon > max_lon:
+            raise HTTPException(status_code=400, detail="영역 좌표가 잘못되었습니다 (min > max)")
+        bbox = (min_lat, min_lon, max_lat, max_lon)
+
+        def inside(p_lat, p_lon):
+            return (p_lat is not None and p_lon is not None
+                    and min_lat <= p_lat <= max_lat and min_lon <= p_lon <= max_lon)
+    else:
+        raise HTTPException(status_code=400, detail="min_lat/min_lon/max_lat/max_lon 또는 lat/lon/radius_km 가 필요합니다")
+
+    # 셀 목록을 만들기 전에 파티션 수를 계산해 너무 넓은 요청을 거절
+    if cell_queries.partition_count(cell_count_in_bbox(*bbox), start_time, end_time) > NEARBY_MAX_PARTITIONS:
+        raise HTTPException(status_code=400, detail="조회 영역 또는 기간이 너무 넓습니다")
+    cells = cells_in_bbox(*bbox)
+
+    try:
+        rtd_rows, report_rows = await asyncio.gather(
+            cell_queries.rtd_rows(cells, start_time, end_time),
+            cell_queries.report_rows(cells, start_time, end_time)
+        )
+        results = [
+            search_rtd_item(row, row.visible if row.visible is not None else True, row.vote_count or 0)
+            for row in rtd_rows if inside(row.latitude, row.longitude)
+        ] + [
+            search_report_item(row, now)
+            for row in report_rows if inside(row.report_lat, row.report_lot)
+        ]
+        results.sort(key=lambda x: x.get("time"), reverse=(sort != "asc"))
+        return await payload_response({"count": len(results), "results": results}, "results",
+                                      compact, shape, accept_encoding, if_none_match)
+    except Exception as e:
+        logging.error(f"주변 검색 오류: {e}")
+        raise HTTPException(status_code=500, detail="rtd/nearby 검색 실패")
+
+
+@app.get("/sync")
+async def sync_events(
+    since: Optional[str] = Query(None, description="처음 동기화: 이 시각(ISO 8601) 이후의 변경"),
+    token: Optional[str] = Query(None, description="이전 응답의 next_token"),
+    limit: int = Query(SYNC_PAGE_SIZE, ge=1, le=5000),
+    compact: bool = Query(False, description="빠른 JSON 인코더 + Accept-Encoding 압축"),
+    accept_encoding: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    since 또는 token 이후에 생기거나 바뀐 RTD / 사용자 제보를 변경 순서대로 돌려줍니다.
+    삭제된 이벤트는 {"type", "id", "op": "delete"} 로 내려갑니다. has_more 가 true 면 next_token 으로 이어서 요청합니다.
+    ETag 는 next_token 이므로, 변경이 없을 때 이전 ETag 를 If-None-Match 로 보내면 304 를 받습니다.
+    """
+    try:
+        if token:
+            position = decode_token(token)
+        elif since:
+            position = since_position(datetime.fromisoformat(since))
+        else:
+            raise HTTPException(status_code=400, detail="since 또는 token 이 필요합니다")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        changes, has_more = await change_feed.changes_after(position, limit)
+    except ChangeLogExpired:
+        raise HTTPException(status_code=410, detail="변경 로그 보관 기간이 지났습니다. /rtd/search 로 전체를 다시 받으세요.")
+    except Exception as e:
+        logging.error(f"변경 로그 조회 실패: {e}")
+        raise HTTPException(status_code=500, detail="sync 실패")
+
+    next_token = encode_token(changes[-1].change_id if changes else position)
+    etag = f'"{next_token}"'
+    if not changes and etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    try:
+        now = datetime.utcnow().replace(tzinfo=timezone.utc)
+        items = []
+        for (kind, event_id), (change, row) in (await change_feed.current_rows(changes)).items():
+            if row is None:
+                # 삭제되었거나 조회 테이블에 없는 이벤트는 앱에서 지우도록 delete 로 전달
+                items.append({"type": kind, "id": str(event_id), "op": "delete"})
+                continue
+            if kind == "rtd":
+                item = search_rtd_item(row, row.visible if row.visible is not None else True, row.vote_count or 0)
+            else:
+                item = search_report_item(row, now)
+            item["op"] = change.op
+            items.append(item)
+    except Exception as e:
+        logging.error(f"변경 이벤트 조회 실패: {e}")
+        raise HTTPException(status_code=500, detail="sync 실패")
+
+    return await payload_response(
+        {"changes": items, "count": len(items), "next_token": next_token, "has_more": has_more},
+        "changes", compact, None, accept_encoding, if_none_match, etag
+    )
+
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """이벤트 캐시 적중률 / 마지막 적재 후 경과 시간(staleness)"""
+    return JSONResponse(content=event_cache.stats())
+
+
 # 사용자 디바이스 요청 모델
 class UserDeviceRequest(BaseModel):
     user_id: str
@@ -573,30 +915,32 @@ class DeleteDeviceRequest(BaseModel):
 
 # 디바이스 등록 API
 @app.post("/devices/register")
-def register_device(data: UserDeviceRequest):
+async def register_device(data: UserDeviceRequest):
     logging.info(f"device register data: {data}")
     try:
         # user_id 중복 확인
         check_user_query = "SELECT * FROM user_device WHERE user_id = %s"
-        existing_user = session.execute(check_user_query, (data.user_id,)).one()
+        existing_user = await afirst(session, check_user_query, (data.user_id,))
         if existing_user:
             return JSONResponse(
                 status_code=400,
                 content={"message": f"이미 등록된 user_id입니다: {data.user_id}"}
             )
 
-        # device_token 중복 확인 (중복이면 실패 처리)
-        check_token_query = "SELECT user_id FROM user_device WHERE device_token = %s ALLOW FILTERING"
-        duplicate = session.execute(check_token_query, (data.device_token,)).one()
-        if duplicate:
+        # device_token 선점 (역색인 IF NOT EXISTS — 다른 사용자가 가진 토큰이면 실패 처리)
+        if await device_tokens.claim(data.device_token, data.user_id) is not None:
             return JSONResponse(
                 status_code=400,
                 content={"message": f"이미 다른 사용자에 등록된 device_token입니다: {data.device_token}"}
             )
 
-        # 디바이스 등록
+        # 디바이스 등록 (실패하면 선점한 토큰 해제)
         insert_query = "INSERT INTO user_device (user_id, device_token) VALUES (%s, %s)"
-        session.execute(insert_query, (data.user_id, data.device_token))
+        try:
+            await aexecute(session, insert_query, (data.user_id, data.device_token))
+        except Exception:
+            await device_tokens.release(data.device_token, data.user_id)
+            raise
 
         return {"message": "사용자 디바이스 정보가 등록되었습니다."}
     except Exception as e:
@@ -605,29 +949,34 @@ def register_device(data: UserDeviceRequest):
 
 # 디바이스 토큰 수정 API
 @app.put("/devices/update")
-def update_device_token(data: UserDeviceRequest):
+async def update_device_token(data: UserDeviceRequest):
     try:
         # user_id 존재 확인
         check_user_query = "SELECT * FROM user_device WHERE user_id = %s"
-        user = session.execute(check_user_query, (data.user_id,)).one()
+        user = await afirst(session, check_user_query, (data.user_id,))
         if not user:
             return JSONResponse(
                 status_code=404,
                 content={"message": f"존재하지 않는 user_id입니다: {data.user_id}"}
             )
 
-        # device_token 중복 검사
-        check_token_query = "SELECT user_id FROM user_device WHERE device_token = %s ALLOW FILTERING"
-        duplicate = session.execute(check_token_query, (data.device_token,)).one()
-        if duplicate and duplicate.user_id != data.user_id:
+        # 새 device_token 선점 (역색인 IF NOT EXISTS — 다른 사용자가 가진 토큰이면 실패 처리)
+        if await device_tokens.claim(data.device_token, data.user_id) is not None:
             return JSONResponse(
                 status_code=400,
                 content={"message": f"이미 다른 사용자에 등록된 device_token입니다: {data.device_token}"}
             )
 
-        # 토큰 업데이트
+        # 토큰 업데이트 후 이전 토큰 해제 (업데이트가 실패하면 새로 선점한 토큰 해제)
         update_query = "UPDATE user_device SET device_token = %s WHERE user_id = %s"
-        session.execute(update_query, (data.device_token, data.user_id))
+        try:
+            await aexecute(session, update_query, (data.device_token, data.user_id))
+        except Exception:
+            if data.device_token != user.device_token:
+                await device_tokens.release(data.device_token, data.user_id)
+            raise
+        if user.device_token and user.device_token != data.device_token:
+            await device_tokens.release(user.device_token, data.user_id)
 
         return {"message": "디바이스 토큰이 성공적으로 수정되었습니다."}
     except Exception as e:
@@ -636,14 +985,14 @@ def update_device_token(data: UserDeviceRequest):
 
 # 디바이스 조회 API (전체 또는 특정 사용자)
 @app.get("/devices")
-def get_devices(user_id: Optional[str] = Query(None, description="user_id로 필터링")):
+async def get_devices(user_id: Optional[str] = Query(None, description="user_id로 필터링")):
     try:
         if user_id:
             query = "SELECT * FROM user_device WHERE user_id = %s"
-            rows = session.execute(query, (user_id,))
+            rows = await aexecute_all(session, query, (user_id,))
         else:
             query = "SELECT * FROM user_device"
-            rows = session.execute(query)
+            rows = await aexecute_all(session, query)
 
         results = []
         for row in rows:
@@ -659,23 +1008,24 @@ def get_devices(user_id: Optional[str] = Query(None, description="user_id로 필
 
 # 디바이스 삭제 API
 @app.post("/devices/delete")
-def delete_device(data: DeleteDeviceRequest):
+async def delete_device(data: DeleteDeviceRequest):
     try:
-        # device_token으로 user_id 찾기
-        find_query = "SELECT user_id FROM user_device WHERE device_token = %s ALLOW FILTERING"
-        row = session.execute(find_query, (data.device_token,)).one()
+        # device_token으로 user_id 찾기 (역색인) 후 기기 행의 토큰이 같은지 확인
+        user_id_to_delete = await device_tokens.owner(data.device_token)
+        row = None
+        if user_id_to_delete is not None:
+            row = await afirst(session, "SELECT device_token FROM user_device WHERE user_id = %s", (user_id_to_delete,))
 
-        if not row:
+        if not row or row.device_token != data.device_token:
             return JSONResponse(
                 status_code=404,
                 content={"message": "삭제할 디바이스 토큰을 찾을 수 없습니다."}
             )
 
-        user_id_to_delete = row.user_id
-
-        # user_id를 사용하여 레코드 삭제
+        # user_id를 사용하여 레코드 삭제 후 토큰 해제
         delete_query = "DELETE FROM user_device WHERE user_id = %s"
-        session.execute(delete_query, (user_id_to_delete,))
+        await aexecute(session, delete_query, (user_id_to_delete,))
+        await device_tokens.release(data.device_token, user_id_to_delete)
 
         logging.info(f"디바이스가 성공적으로 삭제되었습니다: {data.device_token}")
         return {"message": "디바이스가 성공적으로 삭제되었습니다."}
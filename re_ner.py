@@ -1,107 +1,301 @@
+"""
+rtd_db 의 재난문자(rtd_code = 21) 행에 대해 지역명/행정코드/좌표를 다시 계산하는 백필 작업입니다.
+
+각 단계는 별도 스레드에서 동시에 실행되고 크기가 제한된 queue 로 연결됩니다.
+  1) 페이지 단위 읽기 (fetch_size = PAGE_SIZE)
+  2) 페이지 전체 본문에 대한 배치 주소 추출 (정규식 → 배치 NER)
+  3) 페이지 내 중복을 제거한 주소의 지오코딩/행정코드 동시 조회
+  4) execute_async 로 UPDATE 동시 실행 (진행 중 요청 수 제한), 이어서 행마다 event_changes(op=update) 기록
+
+한 페이지의 UPDATE 가 모두 성공하면 다음 페이지의 paging state 를 체크포인트 파일에 기록합니다.
+실패한 UPDATE 는 WRITE_RETRIES 번 다시 시도하고, 그래도 실패하면 체크포인트를 남긴 채 작업을 중단합니다.
+어느 단계든 오류가 나면 모든 단계가 멈추고(큐 대기도 중단), 다시 실행하면 실패한 페이지부터 이어서 진행합니다.
+지오코딩 요청 간격은 RE_NER_GEOCODE_INTERVAL 로 따로 설정합니다. (자체 운영 Nominatim 이면 0)
+중단된 작업은 같은 명령으로 다시 실행하면 마지막으로 완료된 페이지 다음부터 이어서 진행하며,
+--restart 옵션을 주면 체크포인트를 무시하고 처음부터 다시 시작합니다.
+"""
+import os
+import json
+import time
+import queue
+import argparse
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
 from cassandra.auth import PlainTextAuthProvider
 from cassandra.cluster import Cluster
+from cassandra_async import write_many
 from cassandra.query import SimpleStatement
-from ner_utils import extracted_regions
-from main import geocoding, get_regioncode
-from address_utils import extract_best_address
+from main import resolve_location, RateLimiter, NOMINATIM_MIN_INTERVAL
+from address_utils import extract_best_addresses
+from time_buckets import day_of, rtd_by_day_params
+from geo_cells import cell_of, rtd_by_cell_params
+from change_log import change_params, CHANGE_INSERT_CQL
 
 logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(levelname)s - %(message)s')
 
-auth = PlainTextAuthProvider(username="andy013", password="1212")
-cluster = Cluster(["127.0.0.1"], port=9042, auth_provider=auth)
-session = cluster.connect("disaster_service")
-
-select_q = SimpleStatement(
-    "SELECT rtd_time, id, rtd_details FROM rtd_db "
-    "WHERE rtd_code = 21 ALLOW FILTERING"
-)
-rows = session.execute(select_q)
-
-update_full = session.prepare("""
-    UPDATE rtd_db
-       SET rtd_loc    = ?,
-           regioncode = ?,
-           latitude   = ?,
-           longitude  = ?
-     WHERE rtd_time   = ?
-       AND id         = ?
-""")
-update_null = session.prepare("""
-    UPDATE rtd_db
-       SET regioncode = ?,
-           latitude   = ?,
-           longitude  = ?
-     WHERE rtd_time   = ?
-       AND id         = ?
-""")
-
-count = 0
-for row in rows:
-    record_id = row.id
-    rtd_time  = row.rtd_time
-
-    # 1) content 추출
-    content = next((d.split("content:",1)[1].strip()
-                    for d in row.rtd_details
-                    if d.startswith("content:")),
-                   None)
-
-    if not content:
-        logging.warning(f"[{record_id}] content 누락 → 좌표만 None 업데이트")
-        session.execute(update_null, (None, None, None, rtd_time, record_id))
-        count += 1
-        continue
-
-    # 2) 상세주소 우선 추출 시도
-    best_addr = extract_best_address(content)
-    if best_addr:
-        logging.info(f"[{record_id}] 문장: {content!r}")
-        logging.info(f"[{record_id}] 상세주소 추출됨: {best_addr!r}")
-
-        geo = geocoding(best_addr)
-        lat = float(geo.get("lat")) if geo.get("lat") else None
-        lon = float(geo.get("lng")) if geo.get("lng") else None
-        region_cd = get_regioncode(best_addr)
-        rtd_loc = best_addr
-
-        session.execute(
-            update_full,
-            (rtd_loc, region_cd, lat, lon, rtd_time, record_id)
+PAGE_SIZE = int(os.getenv("RE_NER_PAGE_SIZE", "200"))
+RESOLVE_WORKERS = int(os.getenv("RE_NER_RESOLVE_WORKERS", "8"))
+WRITE_CONCURRENCY = int(os.getenv("RE_NER_WRITE_CONCURRENCY", "64"))
+CHECKPOINT_PATH = os.getenv("RE_NER_CHECKPOINT_PATH", "re_ner_checkpoint.json")
+WRITE_RETRIES = int(os.getenv("RE_NER_WRITE_RETRIES", "2"))
+GEOCODE_INTERVAL = float(os.getenv("RE_NER_GEOCODE_INTERVAL", str(NOMINATIM_MIN_INTERVAL)))
+QUEUE_POLL_SEC = 0.5
+
+_DONE = object()  # 단계 간 종료 신호
+
+
+# ---------------------------------------------------------------------------
+# 체크포인트
+# ---------------------------------------------------------------------------
+def load_checkpoint() -> dict:
+    if os.path.exists(CHECKPOINT_PATH):
+        with open(CHECKPOINT_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+
+def save_checkpoint(paging_state, processed: int):
+    data = {
+        "paging_state": paging_state.hex() if paging_state else None,
+        "processed": processed,
+        "updated_at": datetime.now().isoformat()
+    }
+    tmp_path = CHECKPOINT_PATH + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, CHECKPOINT_PATH)
+
+
+def extract_content(rtd_details) -> str | None:
+    return next((d.split("content:", 1)[1].strip()
+                 for d in (rtd_details or [])
+                 if d.startswith("content:")),
+                None)
+
+
+# ---------------------------------------------------------------------------
+# 파이프라인 단계
+# ---------------------------------------------------------------------------
+class ReNerJob:
+    def __init__(self, session, paging_state=None, processed=0):
+        self.session = session
+        self.start_state = paging_state
+        self.processed = processed
+        self.failed = 0
+        self.stop_event = threading.Event()
+        self.errors = []
+        self.limiter = RateLimiter(GEOCODE_INTERVAL)
+
+        self.update_full = session.prepare("""
+            UPDATE rtd_db
+               SET rtd_loc    = ?,
+                   regioncode = ?,
+                   latitude   = ?,
+                   longitude  = ?
+             WHERE rtd_time   = ?
+               AND id         = ?
+        """)
+        self.update_null = session.prepare("""
+            UPDATE rtd_db
+               SET regioncode = ?,
+                   latitude   = ?,
+                   longitude  = ?
+             WHERE rtd_time   = ?
+               AND id         = ?
+        """)
+        # 날짜 버킷 조회 테이블(rtd_by_day)은 원본 행 값으로 행 전체를 기록
+        # (부분 UPDATE 는 아직 백필되지 않은 항목에 rtd_code / rtd_details 가 빈 행을 만듦)
+        self.bucket_insert = session.prepare("""
+            INSERT INTO rtd_by_day (
+              day, rtd_time, id, rtd_code, rtd_loc, rtd_details,
+              regioncode, latitude, longitude, visible, vote_count
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """)
+        # 격자 셀 조회 테이블(rtd_by_cell): 좌표가 바뀌어 셀이 달라지면 이전 셀의 행을 지우고 새 셀에 기록
+        # (투표 상태 visible / vote_count 도 원본 행 값으로 함께 옮김)
+        self.cell_insert = session.prepare("""
+            INSERT INTO rtd_by_cell (
+              cell, day, rtd_time, id, rtd_code, rtd_loc, rtd_details,
+              regioncode, latitude, longitude, visible, vote_count
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """)
+        self.cell_delete = session.prepare(
+            "DELETE FROM rtd_by_cell WHERE cell = ? AND day = ? AND rtd_time = ? AND id = ?"
         )
-        logging.info(f"[{record_id}] 업데이트 완료: {rtd_loc}")
+        # 델타 동기화용 변경 로그 (페이지의 다른 UPDATE 가 모두 끝난 뒤 기록)
+        self.change_insert = SimpleStatement(CHANGE_INSERT_CQL)
+
+        self.pages_q = queue.Queue(maxsize=2)
+        self.addr_q = queue.Queue(maxsize=2)
+        self.write_q = queue.Queue(maxsize=2)
 
+    def _put(self, q, item) -> bool:
+        """큐가 가득 차 있어도 중단 신호가 오면 포기합니다. (하위 단계가 죽었을 때 상위 단계가 막히지 않도록)"""
+        while not self.stop_event.is_set():
+            try:
+                q.put(item, timeout=QUEUE_POLL_SEC)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q):
+        """다음 항목. 중단 신호가 오면 _DONE"""
+        while not self.stop_event.is_set():
+            try:
+                return q.get(timeout=QUEUE_POLL_SEC)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _stage(self, target, out_q):
+        """단계 실행 래퍼: 예외가 나면 전체를 중단시키고, 끝나면 다음 단계에 종료 신호를 보냅니다."""
+        try:
+            target()
+        except Exception as e:
+            logging.error(f"[re_ner] {target.__name__} 단계 오류: {e}", exc_info=True)
+            self.errors.append(e)
+            self.stop_event.set()
+        finally:
+            if out_q is not None:
+                self._put(out_q, _DONE)
+
+    def read_pages(self):
+        stmt = SimpleStatement(
+            "SELECT rtd_time, id, rtd_loc, rtd_details, latitude, longitude, visible, vote_count FROM rtd_db "
+            "WHERE rtd_code = 21 ALLOW FILTERING",
+            fetch_size=PAGE_SIZE
+        )
+        state = self.start_state
+        while not self.stop_event.is_set():
+            result = self.session.execute(stmt, paging_state=state)
+            rows = list(result.current_rows)
+            state = result.paging_state
+            if not self._put(self.pages_q, (rows, state)) or state is None:
+                break
+
+    def extract_addresses(self):
+        while (item := self._get(self.pages_q)) is not _DONE:
+            rows, next_state = item
+            contents = [extract_content(row.rtd_details) for row in rows]
+            addresses = extract_best_addresses(contents)
+            self._put(self.addr_q, (rows, addresses, next_state))
+
+    def resolve_regions(self):
+        with ThreadPoolExecutor(max_workers=RESOLVE_WORKERS) as pool:
+            while (item := self._get(self.addr_q)) is not _DONE:
+                rows, addresses, next_state = item
+                unique = list({a for a in addresses if a})
+                resolved = dict(zip(unique, pool.map(lambda a: resolve_location(a, self.limiter), unique)))
+
+                full_params, null_params, bucket_params, cell_params, cell_deletes = [], [], [], [], []
+                for row, addr in zip(rows, addresses):
+                    if addr:
+                        region_cd, lat, lon = resolved[addr]
+                        full_params.append((addr, region_cd, lat, lon, row.rtd_time, row.id))
+                        new_row = (21, row.rtd_time, row.id, addr, row.rtd_details, region_cd, lat, lon)
+                        new_cell = rtd_by_cell_params(*new_row)
+                    else:
+                        null_params.append((None, None, None, row.rtd_time, row.id))
+                        new_row = (21, row.rtd_time, row.id, row.rtd_loc, row.rtd_details, None, None, None)
+                        new_cell = None
+                    bucket_params.append(rtd_by_day_params(*new_row) + (row.visible, row.vote_count))
+                    if new_cell is not None:
+                        cell_params.append(new_cell + (row.visible, row.vote_count))
+                    old_cell = cell_of(row.latitude, row.longitude)
+                    if old_cell is not None and old_cell != (new_cell[0] if new_cell else None):
+                        cell_deletes.append((old_cell, day_of(row.rtd_time), row.rtd_time, row.id))
+                self._put(self.write_q, (full_params, null_params, bucket_params, cell_params, cell_deletes,
+                                         next_state))
+
+    def write_updates(self):
+        started = time.time()
+        done_in_run = 0
+        while (item := self._get(self.write_q)) is not _DONE:
+            full_params, null_params, bucket_params, cell_params, cell_deletes, next_state = item
+            for stmt, params in ((self.update_full, full_params), (self.update_null, null_params),
+                                 (self.bucket_insert, bucket_params),
+                                 (self.cell_insert, cell_params), (self.cell_delete, cell_deletes)):
+                self._write_page(stmt, params)
+            self._write_page(self.change_insert, [change_params("rtd", "update", p[-2], p[-1])
+                                                  for p in full_params + null_params])
+
+            page_rows = len(full_params) + len(null_params)
+            self.processed += page_rows
+            done_in_run += page_rows
+            save_checkpoint(next_state, self.processed)
+
+            elapsed = time.time() - started
+            rate = done_in_run / elapsed if elapsed > 0 else 0.0
+            logging.info(f"[re_ner] 누적 {self.processed}건 처리 (이번 실행 {done_in_run}건, {rate:.1f} rows/sec)")
+
+    def _write_page(self, stmt, params: list):
+        """
+        params 를 모두 기록합니다. 실패한 행만 WRITE_RETRIES 번 다시 시도하고,
+        그래도 남으면 예외를 던져 체크포인트가 이 페이지를 넘어가지 않게 합니다.
+        """
+        for attempt in range(WRITE_RETRIES + 1):
+            if not params:
+                return
+            results = write_many(self.session, stmt, params, concurrency=WRITE_CONCURRENCY)
+            failed = [(p, result) for (success, result), p in zip(results, params) if not success]
+            for p, result in failed:
+                rec_id = p[3] if stmt is self.cell_insert else p[2] if stmt is self.bucket_insert else p[-1]
+                logging.error(f"[{rec_id}] UPDATE 실패 (시도 {attempt + 1}): {result}")
+            params = [p for p, _ in failed]
+        if params:
+            self.failed += len(params)
+            raise RuntimeError(f"UPDATE {len(params)}건 실패 — 이 페이지부터 다시 실행해야 합니다")
+
+    def run(self) -> bool:
+        stages = [
+            threading.Thread(target=self._stage, args=(self.read_pages, self.pages_q), daemon=True),
+            threading.Thread(target=self._stage, args=(self.extract_addresses, self.addr_q), daemon=True),
+            threading.Thread(target=self._stage, args=(self.resolve_regions, self.write_q), daemon=True),
+            threading.Thread(target=self._stage, args=(self.write_updates, None), daemon=True),
+        ]
+        for t in stages:
+            t.start()
+        for t in stages:
+            t.join()
+        return not self.errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="재난문자 RTD 지역/좌표 재계산 (재개 가능)")
+    parser.add_argument("--restart", action="store_true", help="체크포인트를 무시하고 처음부터 실행")
+    args = parser.parse_args()
+
+    auth = PlainTextAuthProvider(username="andy013", password="1212")
+    cluster = Cluster(["127.0.0.1"], port=9042, auth_provider=auth)
+    session = cluster.connect("disaster_service")
+
+    checkpoint = {} if args.restart else load_checkpoint()
+    paging_state = bytes.fromhex(checkpoint["paging_state"]) if checkpoint.get("paging_state") else None
+    processed = checkpoint.get("processed", 0) if paging_state else 0
+    if paging_state:
+        logging.info(f"체크포인트에서 재개합니다 (이미 처리: {processed}건)")
+
+    started = time.time()
+    job = ReNerJob(session, paging_state, processed)
+    ok = job.run()
+    elapsed = time.time() - started
+
+    if ok:
+        if os.path.exists(CHECKPOINT_PATH):
+            os.remove(CHECKPOINT_PATH)
+        logging.info(f"총 {job.processed}건 업데이트 완료. (실패 {job.failed}건, {elapsed:.1f}초)")
+        print(f"총 {job.processed}건 업데이트 완료.")
     else:
-        # 3) fallback: ner_utils.extracted_regions
-        regions = extracted_regions(content)
-        if regions:
-            logging.info(f"[{record_id}] 문장: {content!r}")
-            logging.info(f"[{record_id}] extracted_regions: {regions}")
-
-            primary_loc = regions[0]
-            geo = geocoding(primary_loc)
-            lat = float(geo.get("lat")) if geo.get("lat") else None
-            lon = float(geo.get("lng")) if geo.get("lng") else None
-            region_cd = get_regioncode(primary_loc)
-
-            session.execute(
-                update_full,
-                (primary_loc, region_cd, lat, lon, rtd_time, record_id)
-            )
-            logging.info(f"[{record_id}] fallback 업데이트: {primary_loc}")
-
-        else:
-            logging.warning(f"[{record_id}] 지명 미추출 → 좌표만 None 업데이트")
-            session.execute(
-                update_null,
-                (None, None, None, rtd_time, record_id)
-            )
-
-    count += 1
-
-logging.info(f"총 {count}건 업데이트 완료.")
-print(f"총 {count}건 업데이트 완료.")
-
-session.shutdown()
-cluster.shutdown()
+        logging.error(f"작업이 중단되었습니다. 다시 실행하면 {CHECKPOINT_PATH} 에서 이어서 진행합니다.")
+
+    session.shutdown()
+    cluster.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# recent_ids.py
+
+"""
+최근에 저장한 레코드 ID 를 기억하는 LRU 캐시입니다.
+
+수집기의 레코드 ID 는 내용으로 만든 결정적 uuid5 이므로 같은 레코드를 다시 INSERT 해도
+결과가 같습니다(멱등). 그래서 LWT(IF NOT EXISTS) 대신 일반 INSERT 를 하고,
+"새 레코드인가?"(= 알림을 보낼 것인가)는 이 캐시로 판단합니다.
+
+캐시는 JSON 파일에 저장되어 재시작 후에도 최근 ID 로 같은 알림이 반복되지 않게 합니다.
+add() 는 flush_interval 마다 저장하고, 알림을 보내는 쪽은 알림 전에 flush() 를 호출합니다.
+캐시는 최근 capacity 개만 기억하므로 캐시에 없다고 신규로 단정하지 말고 저장소에서 한 번 더 확인해야 합니다.
+"""
+import os
+import json
+import time
+import atexit
+import logging
+import threading
+from collections import OrderedDict
+
+RECENT_ID_CAPACITY = int(os.getenv("RECENT_ID_CAPACITY", "50000"))
+RECENT_ID_FLUSH_INTERVAL = float(os.getenv("RECENT_ID_FLUSH_INTERVAL", "30"))
+
+
+class RecentIdCache:
+    def __init__(self, path: str = None, capacity: int = RECENT_ID_CAPACITY,
+                 flush_interval: float = RECENT_ID_FLUSH_INTERVAL):
+        self.path = path
+        self.capacity = max(capacity, 1)
+        self.flush_interval = flush_interval
+        self._ids = OrderedDict()
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._last_flush = time.time()
+        self.load()
+        if self.path:
+            atexit.register(self.flush)
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for key in json.load(f)[-self.capacity:]:
+                    self._ids[key] = None
+        except Exception as e:
+            logging.warning(f"[최근 ID 캐시 로드 실패] {e}")
+
+    def __contains__(self, key) -> bool:
+        key = str(key)
+        with self._lock:
+            if key in self._ids:
+                self._ids.move_to_end(key)
+                return True
+            return False
+
+    def add(self, key) -> bool:
+        """key 를 기록합니다. 처음 보는 key 이면 True 를 반환합니다."""
+        key = str(key)
+        with self._lock:
+            if key in self._ids:
+                self._ids.move_to_end(key)
+                return False
+            self._ids[key] = None
+            if len(self._ids) > self.capacity:
+                self._ids.popitem(last=False)
+            self._dirty = True
+        self.maybe_flush()
+        return True
+
+    def discard(self, key):
+        with self._lock:
+            self._ids.pop(str(key), None)
+            self._dirty = True
+
+    def maybe_flush(self):
+        if self.path and time.time() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            snapshot = list(self._ids.keys())
+            self._dirty = False
+            self._last_flush = time.time()
+        try:
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logging.warning(f"[최근 ID 캐시 저장 실패] {e}")
+
+    def __len__(self):
+        return len(self._ids)
@@ -0,0 +1,129 @@
+# report_expiry.py
+
+"""
+사용자 제보 노출 기간(REPORT_VISIBLE_DAYS) 만료 처리.
+
+report_visible() 은 읽기 경로에서 작성 시각(report_at)으로 노출 여부를 바로 계산합니다.
+API 는 이 값을 사용하므로 만료 처리에 백그라운드 스캔이 필요하지 않습니다.
+
+ReportDeactivator 는 노출 기간이 지난 제보의 저장된 visible 플래그를 false 로 맞춰 두는
+보조(fallback) 일괄 작업입니다. (플래그만 보는 기존 행/클라이언트용)
+  - 마지막으로 처리한 시각(cutoff)을 체크포인트 파일에 기록하고, 다음 실행에서는
+    그 이후 ~ 새 cutoff 구간만 날짜 버킷(user_report_by_day) 파티션 단위로 읽습니다.
+    (매일 실행하면 새로 만료된 24시간 분량만 스캔)
+  - 갱신은 user_report / user_report_by_day 파티션 단위 prepared UPDATE 를 execute_async 로 동시 실행합니다.
+    prepared 문은 routing key 를 알고 있으므로 TokenAwarePolicy 가 해당 파티션의 replica 로 바로 보냅니다.
+  - 체크포인트가 없는 최초 실행은 cutoff 이전 DEACTIVATE_INITIAL_DAYS 일을 같은 방식(날짜 파티션 단위)으로 처리합니다.
+    (ALLOW FILTERING 전체 스캔 없음. 그보다 오래된 제보도 report_visible() 로 이미 숨겨짐)
+"""
+import os
+import json
+import logging
+from datetime import datetime, timezone, timedelta
+
+from time_buckets import day_of
+
+REPORT_VISIBLE_DAYS = int(os.getenv("REPORT_VISIBLE_DAYS", "3"))
+DEACTIVATE_CHECKPOINT_PATH = os.getenv("DEACTIVATE_CHECKPOINT_PATH", "deactivate_checkpoint.json")
+DEACTIVATE_FETCH_SIZE = int(os.getenv("DEACTIVATE_FETCH_SIZE", "500"))
+DEACTIVATE_INITIAL_DAYS = int(os.getenv("DEACTIVATE_INITIAL_DAYS", "365"))  # 체크포인트가 없을 때 처리할 과거 일수
+
+
+def report_cutoff(now: datetime = None) -> datetime:
+    """이 시각 이전에 작성된 제보는 노출 기간이 지난 것으로 봅니다."""
+    return (now or datetime.now(timezone.utc)) - timedelta(days=REPORT_VISIBLE_DAYS)
+
+
+def report_visible(report_at: datetime, visible=True, now: datetime = None) -> bool:
+    """
+    읽기 시점에 계산한 제보 노출 여부입니다.
+    저장된 visible 플래그(투표로 숨김 등)가 참이고, 작성 시각이 노출 기간 안이어야 보입니다.
+    일괄 비활성화 작업이 아직 돌지 않은 행도 기간이 지나면 바로 숨겨집니다.
+    """
+    if visible is False or report_at is None:
+        return False
+    if report_at.tzinfo is None:  # 드라이버는 UTC naive datetime 을 돌려줌
+        report_at = report_at.replace(tzinfo=timezone.utc)
+    return report_at >= report_cutoff(now)
+
+
+class ReportDeactivator:
+    def __init__(self, session, writer, checkpoint_path: str = DEACTIVATE_CHECKPOINT_PATH):
+        self.session = session
+        self.writer = writer
+        self.checkpoint_path = checkpoint_path
+
+        self.select_slice = session.prepare("""
+            SELECT report_by_id, report_at, report_id, visible
+            FROM user_report_by_day
+            WHERE day = ? AND report_at >= ? AND report_at < ?
+        """)
+        self.select_slice.fetch_size = DEACTIVATE_FETCH_SIZE
+        self.update_stmt = session.prepare(
+            "UPDATE user_report SET visible = false WHERE report_by_id = ? AND report_at = ?"
+        )
+        # 읽은 뒤 삭제된 제보의 버킷 행이 visible 만 가진 빈 행으로 다시 생기지 않도록 IF EXISTS
+        self.update_bucket_stmt = session.prepare(
+            "UPDATE user_report_by_day SET visible = false WHERE day = ? AND report_at = ? AND report_id = ? IF EXISTS"
+        )
+
+    # ---------------- 체크포인트 ----------------
+    def load_checkpoint(self):
+        if not os.path.exists(self.checkpoint_path):
+            return None
+        try:
+            with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+                return datetime.fromisoformat(json.load(f)["processed_until"])
+        except Exception as e:
+            logging.warning(f"[제보 비활성화 체크포인트 로드 실패] {e}")
+            return None
+
+    def save_checkpoint(self, processed_until: datetime):
+        data = {"processed_until": processed_until.isoformat(), "updated_at": datetime.now().isoformat()}
+        tmp_path = self.checkpoint_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    # ---------------- 처리 ----------------
+    def _deactivate(self, rows) -> tuple:
+        """visible 인 행만 UPDATE 합니다. 반환값: (성공, 실패)"""
+        rows = [row for row in rows if row.visible]
+        if not rows:
+            return 0, 0
+        result = self.writer.write_many(
+            self.update_stmt, [(row.report_by_id, row.report_at) for row in rows], keep_results=False
+        )
+        bucket_result = self.writer.write_many(
+            self.update_bucket_stmt, [(day_of(row.report_at), row.report_at, row.report_id) for row in rows],
+            keep_results=False
+        )
+        for params, e in (result.errors + bucket_result.errors)[:5]:
+            logging.error(f"[제보 비활성화 실패] {params}: {e}")
+        return result.succeeded, result.failed + bucket_result.failed
+
+    def run(self, now: datetime = None) -> int:
+        """만료된 제보를 비활성화하고 처리 건수를 반환합니다."""
+        cutoff = report_cutoff(now)
+        start = self.load_checkpoint()
+
+        if start is None:
+            start = cutoff - timedelta(days=DEACTIVATE_INITIAL_DAYS)
+            logging.info(f"[제보 비활성화] 체크포인트 없음 → {start} ~ {cutoff} 날짜 파티션 처리")
+        elif start.tzinfo is None:
+            start = start.replace(tzinfo=timezone.utc)
+        updated = 0
+        while start < cutoff:
+            # 날짜 버킷 경계(다음 UTC 자정) 또는 cutoff 까지를 한 조각으로 처리
+            next_day = datetime.combine(day_of(start) + timedelta(days=1), datetime.min.time(), timezone.utc)
+            end = min(next_day, cutoff)
+            ok, failed = self._deactivate(self.session.execute(self.select_slice, (day_of(start), start, end)))
+            updated += ok
+            if failed:
+                logging.error(f"[제보 비활성화] {start} ~ {end} 구간 실패 {failed}건 → 다음 실행에서 재시도")
+                break
+            self.save_checkpoint(end)
+            start = end
+
+        logging.info(f"[제보 비활성화] 완료: {updated}건 처리 (처리 완료 시각: {start})")
+        return updated
@@ -0,0 +1,76 @@
+# report_lookup.py
+
+"""
+report_id → (report_by_id, report_at) 조회 테이블과 프로세스 내 LRU.
+
+user_report 의 기본 키는 (report_by_id, report_at) 이라 report_id 로 찾으려면 ALLOW FILTERING 전체 스캔이 필요했습니다.
+create_user_report 가 user_report_by_report_id 에 키를 함께 기록하고, 투표/삭제는 이 테이블을 한 번 읽어
+원본 행의 기본 키를 얻은 뒤 원본 파티션만 읽습니다.
+
+제보의 키는 바뀌지 않으므로 LRU 항목은 삭제될 때만 지웁니다. (없는 report_id 는 캐시하지 않음)
+기존 제보는 backfill_indexes.py report_ids 로 채웁니다.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+from cassandra_aio import afirst
+
+REPORT_LOOKUP_CACHE_SIZE = int(os.getenv("REPORT_LOOKUP_CACHE_SIZE", "50000"))
+
+SCHEMA_CQL = [
+    """
+    CREATE TABLE IF NOT EXISTS user_report_by_report_id (
+        report_id uuid PRIMARY KEY,
+        report_by_id text,
+        report_at timestamp
+    )
+    """,
+]
+
+REPORT_ID_INSERT_CQL = """
+    INSERT INTO user_report_by_report_id (report_id, report_by_id, report_at)
+    VALUES (%s,%s,%s)
+    """
+
+REPORT_ID_DELETE_CQL = "DELETE FROM user_report_by_report_id WHERE report_id = %s"
+
+
+def ensure_report_lookup_schema(session):
+    for cql in SCHEMA_CQL:
+        session.execute(cql)
+
+
+class ReportKeyLookup:
+    def __init__(self, session, capacity: int = REPORT_LOOKUP_CACHE_SIZE):
+        self.session = session
+        self.capacity = max(capacity, 1)
+        self._cache = OrderedDict()  # report_id -> (report_by_id, report_at)
+        self._lock = threading.Lock()
+        self.select_stmt = session.prepare(
+            "SELECT report_by_id, report_at FROM user_report_by_report_id WHERE report_id = ?"
+        )
+
+    def put(self, report_id, report_by_id: str, report_at):
+        with self._lock:
+            self._cache[report_id] = (report_by_id, report_at)
+            self._cache.move_to_end(report_id)
+            while len(self._cache) > self.capacity:
+                self._cache.popitem(last=False)
+
+    def discard(self, report_id):
+        with self._lock:
+            self._cache.pop(report_id, None)
+
+    async def resolve(self, report_id):
+        """report_id 의 (report_by_id, report_at). 없으면 None"""
+        with self._lock:
+            key = self._cache.get(report_id)
+            if key is not None:
+                self._cache.move_to_end(report_id)
+                return key
+        row = await afirst(self.session, self.select_stmt, (report_id,))
+        if row is None:
+            return None
+        self.put(report_id, row.report_by_id, row.report_at)
+        return row.report_by_id, row.report_at
@@ -0,0 +1,165 @@
+# safekorea_client.py
+
+"""
+국민재난안전포털(safekorea) 재난문자 목록을 브라우저 없이 HTTP 로 가져오는 클라이언트입니다.
+
+disasterMsgList.jsp 페이지는 화면을 그릴 때 DisasterSmsList.do 데이터 엔드포인트를 호출하므로
+같은 요청을 직접 보내 JSON 을 받습니다. 엔드포인트가 HTML 을 돌려주는 경우에는 lxml 로
+목록 테이블을 파싱합니다. 파싱 함수는 네트워크와 분리되어 있어 저장해 둔 응답(fixture)으로 검증할 수 있습니다.
+Selenium 대체 경로(extract_rows_script / extract_rows_legacy)는 webdriver_pool.py 에 있습니다.
+
+반환하는 행(dict)의 키:
+    message_id(int), emergency_level, ntype, location, issued_at(str, "%Y/%m/%d %H:%M:%S"), content
+"""
+import os
+import json
+import logging
+from datetime import datetime, timedelta
+
+import requests
+from lxml import html as lxml_html
+
+SAFEKOREA_LIST_URL = 'https://www.safekorea.go.kr/idsiSFK/neo/sfk/cs/sfc/dis/disasterMsgList.jsp?menuSeq=603'
+SAFEKOREA_DATA_URL = os.getenv(
+    "SAFEKOREA_DATA_URL",
+    "https://www.safekorea.go.kr/idsiSFK/sfk/cs/sua/web/DisasterSmsList.do"
+)
+SAFEKOREA_PAGE_UNIT = int(os.getenv("SAFEKOREA_PAGE_UNIT", "10"))
+SAFEKOREA_TIMEOUT = float(os.getenv("SAFEKOREA_TIMEOUT", "5"))
+
+# 화면의 요소 ID(disasterSms_tr_{idx}_{필드})와 JSON 필드명이 같으며, 일부 필드는 별칭으로도 내려옵니다.
+FIELD_ALIASES = {
+    "message_id": ("MD101_SN",),
+    "emergency_level": ("EMRGNCY_STEP_NM",),
+    "ntype": ("DSSTR_SE_NM",),
+    "location": ("MSG_LOC", "RCV_AREA_NM", "RCPTN_RGN_NM"),
+    "issued_at": ("CREATE_DT", "CREAT_DT", "REGIST_DT"),
+    "content": ("MSG_CN",),
+}
+HTML_FIELDS = {
+    "message_id": "MD101_SN",
+    "emergency_level": "EMRGNCY_STEP_NM",
+    "ntype": "DSSTR_SE_NM",
+    "location": "MSG_LOC",
+    "issued_at": "CREATE_DT",
+}
+
+
+def _pick(item: dict, key: str) -> str:
+    for name in FIELD_ALIASES[key]:
+        value = item.get(name)
+        if value is not None:
+            return str(value).strip()
+    return ""
+
+
+def parse_messages_json(payload) -> list:
+    """DisasterSmsList.do JSON 응답(dict 또는 문자열)을 행 목록으로 변환합니다."""
+    if isinstance(payload, (str, bytes)):
+        payload = json.loads(payload)
+
+    items = payload.get("disasterSmsList")
+    if items is None:
+        raise ValueError("응답에 disasterSmsList 가 없습니다.")
+
+    rows = []
+    for item in items:
+        try:
+            msg_id = int(_pick(item, "message_id"))
+        except ValueError:
+            logging.error(f"message_id 파싱 오류: {item}")
+            continue
+        rows.append({
+            "message_id": msg_id,
+            "emergency_level": _pick(item, "emergency_level"),
+            "ntype": _pick(item, "ntype"),
+            "location": _pick(item, "location"),
+            "issued_at": _pick(item, "issued_at"),
+            "content": _pick(item, "content"),
+        })
+    return rows
+
+
+def parse_messages_html(text: str) -> list:
+    """disasterMsgList 목록 테이블 HTML 을 행 목록으로 변환합니다. (Selenium 추출과 같은 요소 ID 사용)"""
+    doc = lxml_html.fromstring(text)
+    rows = []
+    for tr in doc.xpath('//table[contains(@class, "boardList_table")]//tbody/tr[starts-with(@id, "disasterSms_tr_")]'):
+        row_id = tr.get("id", "")
+        if not row_id.endswith("_apiData1"):
+            continue
+        idx = row_id[len("disasterSms_tr_"):-len("_apiData1")]
+
+        def cell(field):
+            found = tr.xpath(f'.//*[@id="disasterSms_tr_{idx}_{field}"]')
+            return found[0] if found else None
+
+        try:
+            values = {key: cell(field).text_content().strip() for key, field in HTML_FIELDS.items()}
+            content_el = cell("MSG_CN")
+            values["content"] = (content_el.get("title") or content_el.text_content()).strip()
+            values["message_id"] = int(values["message_id"])
+        except Exception as e:
+            logging.error(f"필드 추출 오류 (row {row_id}): {e}")
+            continue
+        rows.append(values)
+    return rows
+
+
+class SafeKoreaClient:
+    """
+    재난문자 목록 HTTP 클라이언트. 요청/파싱 실패 시 예외를 올려 호출자가 Selenium 으로 대체할 수 있게 합니다.
+    safekorea 전용 헤더를 쓰므로 다른 요청과 공유하지 않는 자체 세션을 사용합니다.
+    """
+
+    def __init__(self):
+        self.session = requests.Session()
+        self.session.headers.update({
+            "User-Agent": "Mozilla/5.0 (X11; Linux x86_64)",
+            "Referer": SAFEKOREA_LIST_URL,
+            "X-Requested-With": "XMLHttpRequest",
+        })
+
+    def build_request_body(self) -> dict:
+        today = datetime.now()
+        return {
+            "searchInfo": {
+                "pageIndex": "1",
+                "pageUnit": str(SAFEKOREA_PAGE_UNIT),
+                "pageSize": str(SAFEKOREA_PAGE_UNIT),
+                "firstIndex": "1",
+                "lastIndex": "1",
+                "searchSj": "",
+                "searchBgnDe": (today - timedelta(days=1)).strftime("%Y-%m-%d"),
+                "searchEndDe": today.strftime("%Y-%m-%d"),
+            }
+        }
+
+    def fetch(self) -> list:
+        """
+        최근 재난문자 목록. 응답 형식이 예상과 다르거나 행을 하나도 파싱하지 못하면 ValueError 를 올립니다.
+        (JSON 의 빈 disasterSmsList 는 정상 응답으로 보고 [] 를 반환)
+        """
+        resp = self.session.post(
+            SAFEKOREA_DATA_URL,
+            json=self.build_request_body(),
+            timeout=SAFEKOREA_TIMEOUT
+        )
+        resp.raise_for_status()
+        content_type = resp.headers.get("Content-Type", "")
+        text = resp.text.lstrip()
+        if "json" in content_type or text.startswith("{"):
+            payload = json.loads(text)
+            if not isinstance(payload, dict):
+                raise ValueError(f"예상하지 못한 JSON 응답: {text[:200]}")
+            rows = parse_messages_json(payload)
+            if payload["disasterSmsList"] and not rows:
+                raise ValueError("JSON 응답에서 재난문자 행을 파싱하지 못했습니다.")
+            return rows
+        if "html" not in content_type and not text.startswith("<"):
+            raise ValueError(f"예상하지 못한 응답 형식 ({content_type}): {text[:200]}")
+        rows = parse_messages_html(text)
+        if not rows:
+            raise ValueError("HTML 응답에서 재난문자 목록 행을 찾지 못했습니다.")
+        return rows
+
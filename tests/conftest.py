@@ -0,0 +1,7 @@
+import os
+import sys
+
+# 저장소 루트의 모듈(main.py 와 같은 위치)을 테스트에서 import 할 수 있게 합니다.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta
+
+from adaptive_poller import AdaptivePoller, KST
+
+
+def test_quiet_polls_back_off_up_to_the_max():
+    poller = AdaptivePoller(min_interval=10, max_interval=60, backoff=2.0)
+    assert poller.interval == 10
+    assert [poller.record([]) for _ in range(4)] == [20, 40, 60, 60]
+    assert poller.quiet_streak == 4
+
+
+def test_new_messages_reset_to_the_min_interval():
+    poller = AdaptivePoller(min_interval=10, max_interval=600, backoff=3.0)
+    poller.record([])
+    poller.record([])
+    assert poller.interval == 90
+
+    issued_at = datetime.now(KST).replace(tzinfo=None) - timedelta(seconds=30)
+    assert poller.record([issued_at]) == 10
+    assert poller.quiet_streak == 0
+    assert poller.record([]) == 30
+
+
+def test_backoff_below_one_never_shrinks_the_interval():
+    poller = AdaptivePoller(min_interval=10, max_interval=60, backoff=0.5)
+    assert poller.record([]) == 10
+
+
+def test_detection_latency_metrics():
+    poller = AdaptivePoller(min_interval=10, max_interval=60)
+    now = datetime.now(KST).replace(tzinfo=None)
+    poller.record([now - timedelta(seconds=40), now - timedelta(seconds=20)])
+    # 발송 시각이 수집 시각보다 늦게 찍혀도 음수 지연은 0 으로
+    poller.record([now + timedelta(seconds=5)])
+
+    metrics = poller.metrics()
+    assert metrics["polls"] == 2
+    assert metrics["detection_latency_last"] == 0.0
+    assert 40 <= metrics["detection_latency_max"] < 45
+    assert 20 <= metrics["detection_latency_avg"] < 25
+
+
+def test_set_bounds_clamps_the_current_interval():
+    poller = AdaptivePoller(min_interval=10, max_interval=600)
+    for _ in range(5):
+        poller.record([])
+    assert poller.interval == 320
+    poller.set_bounds(5, 100)
+    assert poller.interval == 100
+    poller.set_bounds(200, 100)  # max 가 min 보다 작으면 min 으로
+    assert (poller.min_interval, poller.max_interval, poller.interval) == (200, 200, 200)
@@ -0,0 +1,96 @@
+import threading
+
+from cassandra_async import AsyncWriter
+
+
+class FakeFuture:
+    def __init__(self):
+        self.callback = None
+        self.errback = None
+
+    def add_callbacks(self, callback, errback):
+        self.callback = callback
+        self.errback = errback
+
+
+class FakeSession:
+    """
+    execute_async 호출을 쌓아 두었다가, 동시에 진행 중인 요청이 limit 개가 되면(또는 마지막 요청이면)
+    역순으로 완료시켜 입력 순서와 완료 순서가 다른 상황을 만듭니다.
+    params 가 "fail" 이면 오류로, "raise" 이면 execute_async 자체가 예외를 던집니다.
+    """
+
+    def __init__(self, limit: int, total: int):
+        self.limit = limit
+        self.total = total
+        self.calls = 0
+        self.pending = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def execute_async(self, statement, params):
+        self.calls += 1
+        if params == "raise":
+            raise RuntimeError("execute_async 실패")
+        future = FakeFuture()
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            self.pending.append((future, params))
+        if len(self.pending) >= self.limit or self.calls == self.total:
+            threading.Timer(0.01, self.complete_all).start()
+        return future
+
+    def complete_all(self):
+        with self._lock:
+            batch, self.pending = self.pending, []
+        for future, params in reversed(batch):
+            with self._lock:
+                self.in_flight -= 1
+            if params == "fail":
+                future.errback(RuntimeError("쓰기 실패"))
+            else:
+                future.callback(f"ok:{params}")
+
+
+def test_results_follow_input_order():
+    params = [f"p{i}" for i in range(10)]
+    session = FakeSession(limit=4, total=len(params))
+    result = AsyncWriter(session, concurrency=4).write_many("stmt", params)
+    assert list(result) == [(True, f"ok:{p}") for p in params]
+    assert (result.succeeded, result.failed, len(result)) == (10, 0, 10)
+
+
+def test_in_flight_requests_are_bounded_by_concurrency():
+    params = [f"p{i}" for i in range(20)]
+    session = FakeSession(limit=3, total=len(params))
+    AsyncWriter(session, concurrency=3).write_many("stmt", params)
+    assert session.calls == 20
+    assert session.max_in_flight == 3
+
+
+def test_errors_are_captured_with_their_params():
+    params = ["p0", "fail", "p2", "raise", "p4"]
+    session = FakeSession(limit=2, total=len(params))
+    result = AsyncWriter(session, concurrency=2).write_many("stmt", params)
+
+    outcomes = list(result)
+    assert [success for success, _ in outcomes] == [True, False, True, False, True]
+    assert isinstance(outcomes[1][1], RuntimeError)
+    assert (result.succeeded, result.failed) == (3, 2)
+    assert sorted(p for p, _ in result.errors) == ["fail", "raise"]
+
+
+def test_keep_results_false_only_counts():
+    params = ["p0", "fail", "p2"]
+    session = FakeSession(limit=3, total=len(params))
+    result = AsyncWriter(session, concurrency=8).write_many("stmt", iter(params), keep_results=False)
+    assert list(result) == []
+    assert (result.succeeded, result.failed, len(result)) == (2, 1, 3)
+    assert [p for p, _ in result.errors] == ["fail"]
+
+
+def test_empty_input_returns_immediately():
+    result = AsyncWriter(FakeSession(limit=1, total=0), concurrency=4).write_many("stmt", [])
+    assert list(result) == [] and len(result) == 0
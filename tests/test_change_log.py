@@ -0,0 +1,77 @@
+import asyncio
+from uuid import uuid4
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("cassandra")
+
+from cassandra.util import uuid_from_time, datetime_from_uuid1
+import change_log
+from change_log import change_params, encode_token, decode_token, since_position
+
+
+def test_token_round_trip():
+    change_id = uuid_from_time(datetime.now(timezone.utc))
+    token = encode_token(change_id)
+    assert "=" not in token
+    assert decode_token(token) == change_id
+
+
+def test_decode_rejects_garbage_and_non_timeuuid():
+    with pytest.raises(ValueError):
+        decode_token("!!!")
+    with pytest.raises(ValueError):
+        decode_token(encode_token(uuid4()))
+
+
+def test_since_position_orders_before_changes_at_that_time():
+    since = datetime(2025, 7, 16, 12, 0, tzinfo=timezone.utc)
+    position = since_position(since)
+    later = uuid_from_time(since.timestamp() + 0.001)
+    assert position.time < later.time
+    # naive 시각은 UTC 로 봄
+    assert since_position(since.replace(tzinfo=None)) == position
+
+
+def test_change_params():
+    event_time, event_id = datetime(2025, 7, 16, 12, 0), uuid4()
+    day, change_id, kind, op, t, e = change_params("rtd", "insert", event_time, event_id)
+    assert (kind, op, t, e) == ("rtd", "insert", event_time, event_id)
+    assert change_id.version == 1
+    assert day == datetime_from_uuid1(change_id).date()
+
+
+def test_changes_after_stops_at_safety_lag(monkeypatch):
+    Change = namedtuple("Change", ["change_id", "kind", "op", "event_time", "event_id"])
+    now = datetime.now(timezone.utc)
+    stored = [Change(uuid_from_time(now - timedelta(seconds=s)), "rtd", "insert", now, uuid4()) for s in (60, 30, 1)]
+    calls = []
+
+    async def fake_aexecute(session, stmt, params):
+        day, after, upper, limit = params
+        calls.append(params)
+        rows = [c for c in stored
+                if datetime_from_uuid1(c.change_id).date() == day
+                and after.time < c.change_id.time < upper.time]
+        return rows[:limit]
+
+    class FakeSession:
+        def prepare(self, cql):
+            return cql
+
+    monkeypatch.setattr(change_log, "aexecute", fake_aexecute)
+    monkeypatch.setattr(change_log, "CHANGE_SYNC_SAFETY_LAG", 10)
+    feed = change_log.ChangeFeed(FakeSession())
+
+    changes, has_more = asyncio.run(feed.changes_after(since_position(now - timedelta(minutes=5)), 10))
+    # 1초 전 변경은 아직 늦게 보이는 변경이 있을 수 있는 구간이므로 다음 동기화로 미룸
+    assert [c.change_id for c in changes] == [stored[0].change_id, stored[1].change_id]
+    assert not has_more
+    assert all(params[2].time < uuid_from_time(now).time for params in calls)
+
+    # 위치가 안전 구간 안이면 조회하지 않음
+    calls.clear()
+    assert asyncio.run(feed.changes_after(since_position(now - timedelta(seconds=5)), 10)) == ([], False)
+    assert calls == []
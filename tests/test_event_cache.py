@@ -0,0 +1,113 @@
+import asyncio
+from uuid import uuid4
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+
+from event_cache import EventCache, ReportRow, first_rtd_filter
+
+RtdRow = namedtuple("RtdRow", ["rtd_time", "id", "rtd_code", "regioncode", "rtd_loc", "visible", "vote_count"])
+
+
+class FakeBuckets:
+    def __init__(self, rtd_rows):
+        self.rtd = rtd_rows
+        self.reads = 0
+        self.gate = None  # 설정하면 적재가 이 이벤트를 기다림
+
+    async def rtd_rows_async(self, start, end, descending=True):
+        self.reads += 1
+        if self.gate is not None:
+            await self.gate.wait()
+        return list(self.rtd)
+
+    async def report_rows_async(self, start, end, descending=True):
+        return []
+
+
+def recent(minutes: int) -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(minutes=minutes)
+
+
+async def settle(cache):
+    """진행 중인 백그라운드 적재가 끝날 때까지 기다림"""
+    task = cache._refresh_task
+    if task is not None:
+        await task
+
+
+def window():
+    now = datetime.now(timezone.utc)
+    return now - timedelta(hours=1), now + timedelta(seconds=1)
+
+
+def test_first_rtd_filter_precedence():
+    assert first_rtd_filter("서울", 11, 21) == ("rtd_loc", "서울")
+    assert first_rtd_filter(None, 11, 21) == ("regioncode", 11)
+    assert first_rtd_filter("", None, 0) == ("rtd_code", 0)
+    assert first_rtd_filter() is None
+
+
+def test_first_load_misses_then_serves_snapshot():
+    async def run():
+        cache = EventCache(FakeBuckets([RtdRow(recent(5), uuid4(), 21, 11, "서울", True, 0)]))
+        assert await cache.search(*window()) is None
+        await settle(cache)
+        rows = await cache.search(*window())
+        assert [kind for kind, _ in rows] == ["rtd"]
+        assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+    asyncio.run(run())
+
+
+def test_stale_snapshot_is_served_while_refreshing():
+    async def run():
+        buckets = FakeBuckets([RtdRow(recent(5), uuid4(), 21, 11, "서울", True, 0)])
+        cache = EventCache(buckets, max_staleness=10, max_serve_staleness=60)
+        await cache.search(*window())
+        await settle(cache)
+        buckets.gate = asyncio.Event()
+        cache._loaded_at -= 20  # 재적재 기준을 넘김
+        rows = await cache.search(*window())
+        assert len(rows) == 1  # 이전 스냅샷으로 즉시 응답
+        task = cache._refresh_task
+        assert task is not None
+        await asyncio.sleep(0.01)
+        await cache.search(*window())
+        assert cache._refresh_task is task  # 재적재는 한 번만 시작
+        assert buckets.reads == 2
+        buckets.gate.set()
+        await settle(cache)
+        assert not cache.stats()["refreshing"]
+    asyncio.run(run())
+
+
+def test_only_first_filter_is_applied():
+    async def run():
+        rows = [
+            RtdRow(recent(3), uuid4(), 21, 11, "서울", True, 0),
+            RtdRow(recent(2), uuid4(), 22, 11, "서울", True, 0),
+            RtdRow(recent(1), uuid4(), 21, 26, "부산", True, 0),
+        ]
+        cache = EventCache(FakeBuckets(rows))
+        await cache.search(*window())
+        await settle(cache)
+        # rtd_loc 가 있으면 rtd_code 는 무시 (Cassandra 조회 경로와 같음)
+        found = await cache.search(*window(), rtd_loc="서울", rtd_code=21)
+        assert {row.id for _, row in found} == {rows[0].id, rows[1].id}
+        found = await cache.search(*window(), rtd_code=21)
+        assert {row.id for _, row in found} == {rows[0].id, rows[2].id}
+    asyncio.run(run())
+
+
+def test_added_report_is_stored_as_naive_utc():
+    async def run():
+        cache = EventCache(FakeBuckets([]))
+        await cache.search(*window())
+        await settle(cache)
+        report_at = datetime.now(timezone(timedelta(hours=9)))
+        report_id = uuid4()
+        cache.add_report(ReportRow(None, report_at, report_id, "u", "m", "s", "loc", "c", None, None, True, 0))
+        found = await cache.search(*window())
+        assert found[0][1].report_at == report_at.astimezone(timezone.utc).replace(tzinfo=None)
+        cache.remove_report(report_id)
+        assert await cache.search(*window()) == []
+    asyncio.run(run())
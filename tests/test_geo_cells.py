@@ -0,0 +1,75 @@
+import math
+from uuid import uuid4
+from datetime import datetime
+
+import pytest
+
+from geo_cells import (
+    cell_of, cells_in_bbox, cell_count_in_bbox, valid_coordinate, radius_bbox, haversine_km, rtd_by_cell_params,
+    CellQueries,
+)
+
+
+def test_cell_of():
+    assert cell_of(37.5665, 126.978) == "375:1269"
+    assert cell_of(-0.05, -0.05) == "-1:-1"
+    assert cell_of(None, 126.978) is None
+
+
+def test_cells_in_bbox_covers_corners():
+    cells = cells_in_bbox(37.45, 126.85, 37.65, 127.05)
+    assert len(cells) == 3 * 3
+    assert cell_of(37.45, 126.85) in cells
+    assert cell_of(37.65, 127.05) in cells
+
+
+def test_cell_count_matches_cells_without_building_them():
+    bbox = (37.45, 126.85, 37.65, 127.05)
+    assert cell_count_in_bbox(*bbox) == len(cells_in_bbox(*bbox))
+    assert cell_count_in_bbox(-90, -180, 90, 180) == 1801 * 3601
+
+
+def test_partition_count_uses_day_span():
+    start = datetime(2025, 7, 14, 23, 0)
+    assert CellQueries.partition_count(9, start, datetime(2025, 7, 16, 1, 0)) == 27
+    assert CellQueries.partition_count(9, start, datetime(2125, 7, 16)) > 9 * 36000
+
+
+def test_valid_coordinate():
+    assert valid_coordinate(37.5, 127.0)
+    assert valid_coordinate(-90, 180)
+    assert not valid_coordinate(91, 127.0)
+    assert not valid_coordinate(37.5, -181)
+    assert not valid_coordinate(None, 127.0)
+
+
+def test_radius_bbox_is_clamped_near_poles():
+    min_lat, min_lon, max_lat, max_lon = radius_bbox(89.9, 179.9, 50)
+    assert max_lat == 90.0 and max_lon == 180.0
+    assert min_lat >= -90.0 and min_lon >= -180.0
+
+
+def test_radius_bbox_contains_circle():
+    lat, lon, radius = 37.5665, 126.978, 5.0
+    min_lat, min_lon, max_lat, max_lon = radius_bbox(lat, lon, radius)
+    for bearing in range(0, 360, 30):
+        # 반경 경계 위의 점이 사각형 안에 있어야 함
+        dlat = radius / 111.32 * math.cos(math.radians(bearing))
+        dlon = radius / (111.32 * math.cos(math.radians(lat))) * math.sin(math.radians(bearing))
+        assert min_lat <= lat + dlat <= max_lat
+        assert min_lon <= lon + dlon <= max_lon
+
+
+def test_haversine_km():
+    assert haversine_km(37.5665, 126.978, 37.5665, 126.978) == 0
+    # 서울시청 → 부산시청 약 325km
+    assert haversine_km(37.5665, 126.978, 35.1796, 129.0756) == pytest.approx(325, abs=5)
+
+
+def test_rtd_by_cell_params():
+    t, rec_id = datetime(2025, 7, 16, 5, 0), uuid4()
+    params = rtd_by_cell_params(21, t, rec_id, "서울", ["d"], 11, 37.5665, 126.978)
+    assert params[0] == "375:1269"
+    assert params[1] == t.date()
+    assert params[2:] == (t, rec_id, 21, "서울", ["d"], 11, 37.5665, 126.978)
+    assert rtd_by_cell_params(21, t, rec_id, "서울", ["d"]) is None
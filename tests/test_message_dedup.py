@@ -0,0 +1,106 @@
+import json
+
+from message_dedup import HighWaterMarkDedup
+
+
+class Lookup:
+    """DB 조회 대신 쓰는 가짜 lookup. 호출된 ID 를 기록합니다."""
+
+    def __init__(self, stored=()):
+        self.stored = set(stored)
+        self.calls = []
+
+    def __call__(self, msg_id):
+        self.calls.append(msg_id)
+        return msg_id in self.stored
+
+
+def committed(path, ids, window_size=5, lookup=None):
+    dedup = HighWaterMarkDedup(path=str(path), window_size=window_size, lookup=lookup)
+    for msg_id in ids:
+        dedup.mark(msg_id)
+    dedup.commit()
+    return dedup
+
+
+def test_first_run_checks_every_id_against_the_db(tmp_path):
+    lookup = Lookup(stored={100})
+    dedup = HighWaterMarkDedup(path=str(tmp_path / "state.json"), lookup=lookup)
+    assert dedup.is_new(100) is False
+    assert dedup.is_new(101) is True
+    assert lookup.calls == [100, 101]
+
+
+def test_ids_above_high_water_are_new_without_lookup(tmp_path):
+    lookup = Lookup()
+    dedup = committed(tmp_path / "state.json", [10, 11, 12], lookup=lookup)
+    assert dedup.is_new(13) is True
+    assert dedup.is_new(12) is False  # 윈도우에 있음
+    assert lookup.calls == []
+
+
+def test_ids_below_the_window_are_old(tmp_path):
+    lookup = Lookup()
+    dedup = committed(tmp_path / "state.json", [10, 11, 12], lookup=lookup)
+    assert dedup.is_new(9) is False
+    assert dedup.stats["old"] == 1
+    assert lookup.calls == []
+
+
+def test_gap_inside_the_window_falls_back_to_lookup(tmp_path):
+    lookup = Lookup(stored={11})
+    dedup = committed(tmp_path / "state.json", [10, 12], lookup=lookup)
+    assert dedup.is_new(11) is False
+    assert lookup.calls == [11]
+    # DB 에 있던 ID 도 commit 후에는 윈도우에서 바로 판별
+    dedup.commit()
+    assert dedup.is_new(11) is False
+    assert lookup.calls == [11]
+
+
+def test_window_evicts_oldest_ids(tmp_path):
+    dedup = committed(tmp_path / "state.json", [1, 2, 3, 4, 5, 6, 7], window_size=5)
+    assert list(dedup.window) == [3, 4, 5, 6, 7]
+    assert dedup.high_water == 7
+    assert dedup.is_new(2) is False  # 윈도우보다 오래됨
+    assert dedup.stats["old"] == 1
+
+
+def test_marks_apply_only_on_commit(tmp_path):
+    dedup = committed(tmp_path / "state.json", [10])
+    dedup.mark(11)
+    # 폴링 중에는 시작 시점 상태로 판별
+    assert dedup.is_new(11) is True
+    dedup.commit()
+    assert dedup.is_new(11) is False
+    assert dedup.high_water == 11
+
+
+def test_state_reloads_after_restart(tmp_path):
+    path = tmp_path / "state.json"
+    committed(path, [20, 21, 22], window_size=5)
+    assert json.loads(path.read_text()) == {"high_water": 22, "window": [20, 21, 22]}
+
+    lookup = Lookup()
+    restarted = HighWaterMarkDedup(path=str(path), window_size=5, lookup=lookup)
+    assert restarted.high_water == 22
+    assert restarted.is_new(21) is False
+    assert restarted.is_new(23) is True
+    assert lookup.calls == []
+
+
+def test_reload_keeps_only_the_newest_ids_when_the_window_shrinks(tmp_path):
+    path = tmp_path / "state.json"
+    committed(path, [1, 2, 3, 4, 5], window_size=5)
+    restarted = HighWaterMarkDedup(path=str(path), window_size=2)
+    assert list(restarted.window) == [4, 5]
+
+
+def test_broken_state_file_is_treated_as_first_run(tmp_path):
+    path = tmp_path / "state.json"
+    path.write_text("{broken")
+    lookup = Lookup()
+    dedup = HighWaterMarkDedup(path=str(path), lookup=lookup)
+    assert dedup.high_water is None
+    assert dedup.is_new(5) is True
+    assert lookup.calls == [5]
@@ -0,0 +1,143 @@
+import sys
+import json
+import importlib
+from types import SimpleNamespace
+
+import pytest
+
+torch = pytest.importorskip("torch")
+transformers = pytest.importorskip("transformers")
+
+CLS, SEP, PAD = 101, 102, 0
+OTHER, LOC_B, LOC_I = 5, 7, 8  # 스텁 모델이 O / B-LOC / I-LOC 로 예측하는 토큰 ID
+
+
+class StubTokenizer:
+    cls_token_id = CLS
+    sep_token_id = SEP
+    pad_token_id = PAD
+
+
+class StubModel:
+    """토큰 ID 로 라벨을 정하되, 윈도우의 첫/마지막 실제 토큰은 문맥이 부족한 것처럼 항상 O 로 예측합니다."""
+
+    def __init__(self):
+        self.config = SimpleNamespace(id2label={}, label2id={})
+        self.batches = []
+
+    def to(self, device):
+        return self
+
+    def eval(self):
+        return self
+
+    def __call__(self, input_ids, attention_mask):
+        self.batches.append(input_ids.shape[0])
+        logits = torch.zeros(*input_ids.shape, 3)
+        for b, (ids, mask) in enumerate(zip(input_ids.tolist(), attention_mask.tolist())):
+            last = sum(mask) - 2  # [SEP] 바로 앞 토큰
+            for pos, token_id in enumerate(ids):
+                label = {LOC_B: 1, LOC_I: 2}.get(token_id, 0)
+                if pos in (1, last):
+                    label = 0
+                logits[b, pos, label] = 1.0
+        return SimpleNamespace(logits=logits)
+
+
+@pytest.fixture(scope="module")
+def ner():
+    """모델 파일 없이 스텁 토크나이저/모델로 ner_utils 를 불러옵니다."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(transformers.BertTokenizerFast, "from_pretrained", lambda *args, **kwargs: StubTokenizer())
+        mp.setattr(transformers.BertForTokenClassification, "from_pretrained", lambda *args, **kwargs: StubModel())
+        mp.delitem(sys.modules, "ner_utils", raising=False)
+        module = importlib.import_module("ner_utils")
+    yield module
+    sys.modules.pop("ner_utils", None)
+
+
+@pytest.fixture
+def small_windows(ner, monkeypatch):
+    # 윈도우 본문 8 토큰, 겹침 4 토큰, 배치 2 윈도우
+    monkeypatch.setattr(ner, "MAX_LENGTH", 10)
+    monkeypatch.setattr(ner, "WINDOW_STRIDE", 4)
+    monkeypatch.setattr(ner, "NER_BATCH_SIZE", 2)
+    ner.model_loc.batches.clear()
+    return ner
+
+
+def expected_labels(token_ids: list) -> list:
+    return [{LOC_B: "B-LOC", LOC_I: "I-LOC"}.get(t, "O") for t in token_ids]
+
+
+def test_window_starts_overlap_by_stride_and_cover_the_tail(ner):
+    assert ner._window_starts(1, 8, 4) == [0]
+    assert ner._window_starts(8, 8, 4) == [0]
+    assert ner._window_starts(9, 8, 4) == [0, 4]
+    starts = ner._window_starts(25, 8, 4)
+    assert starts == [0, 4, 8, 12, 16, 20]
+    assert starts[-1] + 8 >= 25
+
+
+def test_window_starts_always_advance(ner):
+    # stride 가 본문 이상이어도 한 토큰씩은 전진
+    assert ner._window_starts(4, 2, 5) == [0, 1, 2]
+
+
+def test_labels_merge_across_windows_from_the_most_central_window(small_windows):
+    # 지명 토큰이 여러 윈도우 경계(4, 8, 11, 12, 15, 16 …)에 걸쳐 있음
+    tokens = [OTHER, OTHER, OTHER, LOC_B, LOC_I, LOC_I, OTHER, OTHER, LOC_B, LOC_I, OTHER, LOC_B, OTHER,
+              OTHER, LOC_B, LOC_I, LOC_I, LOC_I, OTHER, OTHER, OTHER, OTHER, LOC_B, OTHER, OTHER]
+    assert small_windows._predict_token_labels_batch([tokens]) == [expected_labels(tokens)]
+    assert small_windows.model_loc.batches == [2, 2, 2]
+
+
+def test_windows_of_several_texts_share_batches(small_windows):
+    long_text = [OTHER] * 3 + [LOC_B, LOC_I] * 10 + [OTHER] * 2  # 25 토큰 → 윈도우 6개
+    short_text = [OTHER, LOC_B, LOC_I, OTHER]  # 윈도우 1개
+    results = small_windows._predict_token_labels_batch([long_text, short_text])
+    assert results == [expected_labels(long_text), expected_labels(short_text)]
+    assert small_windows.model_loc.batches == [2, 2, 2, 1]
+
+
+def test_spans_from_labels_joins_words_and_drops_stopwords(ner):
+    words = ["서울특별시", "강남구", "주의", "지역", "역삼동"]
+    word_ids = [0, 0, 1, 2, 3, 4, None]
+    labels = ["B-LOC", "I-LOC", "I-LOC", "O", "O", "B-LOC", "B-LOC"]
+    assert ner._spans_from_labels(words, word_ids, labels) == ["서울특별시 강남구", "역삼동"]
+    # 불용어 "주의" 가 들어간 스팬은 제외
+    assert ner._spans_from_labels(words, [2, 3], ["B-LOC", "I-LOC"]) == []
+
+
+@pytest.fixture
+def runtime_env(monkeypatch):
+    for env in ("NER_INTRA_OP_THREADS", "NER_INTER_OP_THREADS", "NER_BATCH_SIZE"):
+        monkeypatch.delenv(env, raising=False)
+    return monkeypatch
+
+
+def test_runtime_config_reads_json(ner, tmp_path, runtime_env):
+    path = tmp_path / "ner_runtime.json"
+    path.write_text(json.dumps({"intra_op_threads": 4, "inter_op_threads": 2, "batch_size": 32}))
+    runtime_env.setattr(ner, "NER_RUNTIME_PATH", str(path))
+    assert ner.load_runtime_config() == {"intra_op_threads": 4, "inter_op_threads": 2, "batch_size": 32}
+
+
+def test_runtime_config_env_overrides_json(ner, tmp_path, runtime_env):
+    path = tmp_path / "ner_runtime.json"
+    path.write_text(json.dumps({"intra_op_threads": 4, "inter_op_threads": 2, "batch_size": 32}))
+    runtime_env.setattr(ner, "NER_RUNTIME_PATH", str(path))
+    runtime_env.setenv("NER_BATCH_SIZE", "8")
+    runtime_env.setenv("NER_INTRA_OP_THREADS", "6")
+    assert ner.load_runtime_config() == {"intra_op_threads": 6, "inter_op_threads": 2, "batch_size": 8}
+
+
+def test_runtime_config_defaults_when_json_missing_or_broken(ner, tmp_path, runtime_env):
+    defaults = {"intra_op_threads": None, "inter_op_threads": None, "batch_size": 16}
+    runtime_env.setattr(ner, "NER_RUNTIME_PATH", str(tmp_path / "missing.json"))
+    assert ner.load_runtime_config() == defaults
+
+    broken = tmp_path / "broken.json"
+    broken.write_text("{not json")
+    runtime_env.setattr(ner, "NER_RUNTIME_PATH", str(broken))
+    assert ner.load_runtime_config() == defaults
@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from pagination import (
+    encode_cursor, decode_cursor, cursor_bounds, skip_sent, merge_streams, take_page, ndjson_lines,
+)
+
+T0 = datetime(2025, 7, 16, 12, 0, tzinfo=timezone.utc)
+
+
+def item(minutes: int, item_id: str):
+    t = T0 + timedelta(minutes=minutes)
+    return t, item_id, {"id": item_id, "time": t.isoformat()}
+
+
+def test_cursor_round_trip():
+    token = encode_cursor(T0, ["a", "b"])
+    assert decode_cursor(token) == (T0, {"a", "b"})
+
+
+def test_decode_invalid_cursor_raises():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_cursor_bounds_narrow_the_window():
+    start, end = T0 - timedelta(days=1), T0 + timedelta(days=1)
+    cursor = (T0, {"a"})
+    assert cursor_bounds(None, start, end, True) == (start, end)
+    assert cursor_bounds(cursor, start, end, True) == (start, T0)
+    assert cursor_bounds(cursor, start, end, False) == (T0, end)
+    # 드라이버가 돌려준 naive 시각은 UTC 로 봄
+    assert cursor_bounds((T0.replace(tzinfo=None), set()), start, end, True) == (start, T0)
+
+
+def test_merge_streams_keeps_time_order():
+    rtd = [item(3, "r3"), item(1, "r1")]
+    reports = [item(2, "u2"), item(0, "u0")]
+    merged = [i[1] for i in merge_streams(iter(rtd), iter(reports), descending=True)]
+    assert merged == ["r3", "u2", "r1", "u0"]
+
+
+def test_pages_resume_without_duplicates_on_equal_times():
+    # 같은 시각에 여러 항목이 있어도 커서로 이어받으면 빠지거나 겹치지 않음
+    stream = [item(5, "a"), item(4, "b"), item(4, "c"), item(4, "d"), item(3, "e")]
+
+    def read(cursor):
+        start, end = cursor_bounds(cursor, T0, T0 + timedelta(hours=1), True)
+        items = (i for i in stream if start <= i[0] <= end)
+        return take_page(skip_sent(items, cursor), 2, cursor)
+
+    seen, cursor = [], None
+    while True:
+        page, token = read(cursor)
+        seen += [p["id"] for p in page]
+        if token is None:
+            break
+        cursor = decode_cursor(token)
+    assert seen == ["a", "b", "c", "d", "e"]
+
+
+def test_take_page_without_more_items_has_no_cursor():
+    page, token = take_page(iter([item(1, "a"), item(0, "b")]), 2)
+    assert [p["id"] for p in page] == ["a", "b"]
+    assert token is None
+
+
+def test_ndjson_lines_appends_next_cursor():
+    lines = list(ndjson_lines(iter([item(2, "a"), item(1, "b"), item(0, "c")]), limit=2))
+    assert len(lines) == 3
+    assert all(line.endswith("\n") for line in lines)
+    assert '"next_cursor"' in lines[-1]
@@ -0,0 +1,96 @@
+import gzip
+import json
+import asyncio
+import threading
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+import payloads
+from payloads import (
+    payload_response, build_payload_response, to_columnar, negotiate_encoding, etag_of, etag_matches,
+    COMPRESS_MIN_BYTES,
+)
+
+
+def events(n: int) -> dict:
+    return {"events": [{"id": str(i), "type": "rtd", "note": "x" * 20} for i in range(n)], "count": n}
+
+
+def test_to_columnar_uses_union_of_keys():
+    assert to_columnar([{"a": 1}, {"b": 2, "a": 3}]) == {"columns": ["a", "b"], "rows": [[1, None], [3, 2]]}
+
+
+def test_negotiate_encoding():
+    assert negotiate_encoding(None) is None
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+    assert negotiate_encoding("gzip;q=0") is None
+    assert negotiate_encoding("identity") is None
+
+
+def test_etag_matches_weak_comparison():
+    etag = etag_of(b"{}")
+    assert etag.startswith('W/"')
+    assert etag_matches(etag, etag)
+    assert etag_matches(etag.removeprefix("W/") + ", \"other\"", etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
+
+
+def test_default_response_is_plain_json_with_etag():
+    response = build_payload_response(events(2), "events")
+    assert json.loads(response.body) == events(2)
+    assert response.headers["ETag"] == etag_of(response.body)
+    assert "Content-Encoding" not in response.headers
+
+
+def test_compact_response_is_compressed_above_threshold():
+    content = events(COMPRESS_MIN_BYTES // 10)
+    response = build_payload_response(content, "events", compact=True, accept_encoding="gzip")
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert json.loads(gzip.decompress(response.body)) == content
+
+
+def test_compact_small_response_is_not_compressed():
+    response = build_payload_response(events(1), "events", compact=True, accept_encoding="gzip")
+    assert "Content-Encoding" not in response.headers
+    assert json.loads(response.body) == events(1)
+
+
+def test_columnar_shape():
+    response = build_payload_response(events(2), "events", shape="columnar")
+    body = json.loads(response.body)
+    assert body["events"]["columns"] == ["id", "type", "note"]
+    assert len(body["events"]["rows"]) == 2
+
+
+def test_if_none_match_returns_304():
+    etag = build_payload_response(events(3), "events").headers["ETag"]
+    response = build_payload_response(events(3), "events", if_none_match=etag)
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.body == b""
+
+
+def test_large_payloads_are_encoded_off_the_event_loop(monkeypatch):
+    threads = []
+    original = payloads.build_payload_response
+
+    def recording(*args):
+        threads.append(threading.current_thread())
+        return original(*args)
+
+    monkeypatch.setattr(payloads, "build_payload_response", recording)
+
+    async def run():
+        small = await payload_response(events(1), "events")
+        large = await payload_response(events(payloads.OFFLOAD_MIN_ITEMS), "events")
+        return small, large
+
+    small, large = asyncio.run(run())
+    assert json.loads(large.body)["count"] == payloads.OFFLOAD_MIN_ITEMS
+    assert threads[0] is threading.main_thread()
+    assert threads[1] is not threading.main_thread()
@@ -0,0 +1,76 @@
+import json
+from uuid import uuid4
+
+from recent_ids import RecentIdCache
+
+
+def test_add_reports_new_keys_once():
+    cache = RecentIdCache(capacity=10)
+    key = uuid4()
+    assert cache.add(key) is True
+    assert cache.add(key) is False
+    assert key in cache
+    assert str(key) in cache  # 키는 문자열로 기록
+
+
+def test_lru_evicts_the_least_recently_used_key():
+    cache = RecentIdCache(capacity=3)
+    for key in ("a", "b", "c"):
+        cache.add(key)
+    assert "a" in cache  # 조회하면 최근 사용으로 이동
+    cache.add("d")
+    assert "b" not in cache
+    assert ["a" in cache, "c" in cache, "d" in cache] == [True, True, True]
+    assert len(cache) == 3
+
+
+def test_discard_removes_the_key():
+    cache = RecentIdCache(capacity=3)
+    cache.add("a")
+    cache.discard("a")
+    cache.discard("missing")
+    assert "a" not in cache
+    assert cache.add("a") is True
+
+
+def test_flush_writes_keys_in_lru_order(tmp_path):
+    path = tmp_path / "recent.json"
+    cache = RecentIdCache(path=str(path), capacity=10, flush_interval=3600)
+    cache.add("a")
+    cache.add("b")
+    assert not path.exists()  # flush_interval 전에는 저장하지 않음
+    cache.flush()
+    assert json.loads(path.read_text()) == ["a", "b"]
+
+
+def test_add_flushes_after_the_interval(tmp_path):
+    path = tmp_path / "recent.json"
+    cache = RecentIdCache(path=str(path), capacity=10, flush_interval=0)
+    cache.add("a")
+    assert json.loads(path.read_text()) == ["a"]
+
+
+def test_flush_without_changes_does_not_rewrite(tmp_path):
+    path = tmp_path / "recent.json"
+    cache = RecentIdCache(path=str(path), capacity=10, flush_interval=3600)
+    cache.add("a")
+    cache.flush()
+    path.write_text(json.dumps(["external"]))
+    cache.flush()
+    assert json.loads(path.read_text()) == ["external"]
+
+
+def test_reload_keeps_the_newest_keys_up_to_capacity(tmp_path):
+    path = tmp_path / "recent.json"
+    path.write_text(json.dumps(["a", "b", "c", "d"]))
+    cache = RecentIdCache(path=str(path), capacity=2)
+    assert "a" not in cache and "b" not in cache
+    assert "c" in cache and "d" in cache
+    assert cache.add("d") is False
+
+
+def test_broken_file_starts_empty(tmp_path):
+    path = tmp_path / "recent.json"
+    path.write_text("[broken")
+    cache = RecentIdCache(path=str(path), capacity=2)
+    assert len(cache) == 0
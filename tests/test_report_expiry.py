@@ -0,0 +1,32 @@
+from datetime import datetime, timedelta, timezone
+
+from report_expiry import REPORT_VISIBLE_DAYS, report_cutoff, report_visible
+
+NOW = datetime(2025, 7, 16, 12, 0, tzinfo=timezone.utc)
+CUTOFF = NOW - timedelta(days=REPORT_VISIBLE_DAYS)
+
+
+def test_cutoff_is_visible_days_before_now():
+    assert report_cutoff(NOW) == CUTOFF
+
+
+def test_report_at_the_cutoff_is_still_visible():
+    assert report_visible(CUTOFF, now=NOW) is True
+    assert report_visible(CUTOFF - timedelta(microseconds=1), now=NOW) is False
+
+
+def test_recent_report_is_visible():
+    assert report_visible(NOW - timedelta(hours=1), now=NOW) is True
+
+
+def test_naive_report_at_is_treated_as_utc():
+    naive_cutoff = CUTOFF.replace(tzinfo=None)
+    assert report_visible(naive_cutoff, now=NOW) is True
+    assert report_visible(naive_cutoff - timedelta(seconds=1), now=NOW) is False
+
+
+def test_stored_flag_and_missing_time_hide_the_report():
+    assert report_visible(NOW, visible=False, now=NOW) is False
+    assert report_visible(None, now=NOW) is False
+    # 플래그가 없는(None) 기존 행은 시각으로만 판단
+    assert report_visible(NOW, visible=None, now=NOW) is True
@@ -0,0 +1,105 @@
+import os
+import json
+
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("lxml")
+
+from conftest import FIXTURES_DIR
+from safekorea_client import SafeKoreaClient, parse_messages_html, parse_messages_json
+
+
+def read_fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+EXPECTED_ROWS = [
+    {
+        "message_id": 218934,
+        "emergency_level": "안전안내",
+        "ntype": "호우",
+        "location": "서울특별시 강남구",
+        "issued_at": "2025/07/16 14:22:05",
+        "content": "[강남구청] 오늘 14시 호우경보 발효. 저지대 침수 우려 지역 주민은 안전한 곳으로 대피 바랍니다.",
+    },
+    {
+        "message_id": 218933,
+        "emergency_level": "긴급재난",
+        "ntype": "지진",
+        "location": "경상북도 경주시",
+        "issued_at": "2025/07/16 14:01:47",
+        "content": "[기상청] 07-16 14:01 경북 경주시 남남서쪽 9km 지역 규모3.2 지진 발생",
+    },
+]
+
+
+class FakeResponse:
+    def __init__(self, text: str, content_type: str, status_code: int = 200):
+        self.text = text
+        self.headers = {"Content-Type": content_type}
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+def client_returning(response: FakeResponse) -> SafeKoreaClient:
+    client = SafeKoreaClient()
+    client.session.post = lambda *args, **kwargs: response
+    return client
+
+
+def test_parse_json_fixture_uses_aliases_and_skips_bad_ids():
+    assert parse_messages_json(read_fixture("safekorea_list.json")) == EXPECTED_ROWS
+
+
+def test_parse_json_without_list_raises():
+    with pytest.raises(ValueError):
+        parse_messages_json({"rtnResult": {"resultCode": "9"}})
+
+
+def test_parse_html_fixture_matches_json():
+    assert parse_messages_html(read_fixture("safekorea_list.html")) == EXPECTED_ROWS
+
+
+def test_fetch_json():
+    client = client_returning(FakeResponse(read_fixture("safekorea_list.json"), "application/json;charset=UTF-8"))
+    assert client.fetch() == EXPECTED_ROWS
+
+
+def test_fetch_html():
+    client = client_returning(FakeResponse(read_fixture("safekorea_list.html"), "text/html;charset=UTF-8"))
+    assert client.fetch() == EXPECTED_ROWS
+
+
+def test_fetch_empty_json_list_is_not_an_error():
+    client = client_returning(FakeResponse(json.dumps({"disasterSmsList": []}), "application/json"))
+    assert client.fetch() == []
+
+
+def test_fetch_html_without_rows_raises():
+    client = client_returning(FakeResponse(read_fixture("safekorea_error.html"), "text/html"))
+    with pytest.raises(ValueError):
+        client.fetch()
+
+
+def test_fetch_json_with_only_unparsable_rows_raises():
+    payload = {"disasterSmsList": [{"MD101_SN": "", "MSG_CN": "일련번호 없음"}]}
+    client = client_returning(FakeResponse(json.dumps(payload), "application/json"))
+    with pytest.raises(ValueError):
+        client.fetch()
+
+
+def test_fetch_unexpected_payload_raises():
+    client = client_returning(FakeResponse("OK", "text/plain"))
+    with pytest.raises(ValueError):
+        client.fetch()
+
+
+def test_client_does_not_share_session_headers():
+    first, second = SafeKoreaClient(), SafeKoreaClient()
+    assert first.session is not second.session
+    assert first.session.headers["Referer"] == second.session.headers["Referer"]
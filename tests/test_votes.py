@@ -0,0 +1,85 @@
+import asyncio
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+import votes
+from votes import VOTE_INCREMENT_CQL, VOTE_MARKER_CQL, VoteCounter, is_hidden
+
+
+class FakeSession:
+    """prepare 는 CQL 문자열을 그대로 돌려주고, 실행은 Cassandra 대신 메모리의 표시 행/counter 로 처리합니다."""
+
+    def __init__(self, fail_increment: bool = False):
+        self.fail_increment = fail_increment
+        self.markers = set()
+        self.counts = {}
+        self.executed = []
+
+    def prepare(self, cql):
+        return cql
+
+    def run(self, stmt, params):
+        self.executed.append(stmt)
+        if stmt == VOTE_MARKER_CQL:
+            key = params[:3]
+            applied = key not in self.markers
+            self.markers.add(key)
+            return [SimpleNamespace(applied=applied)]
+        if stmt == VOTE_INCREMENT_CQL:
+            if self.fail_increment:
+                raise RuntimeError("counter 쓰기 실패")
+            self.counts[params] = self.counts.get(params, 0) + 1
+            return []
+        if stmt.startswith("DELETE FROM event_votes"):
+            self.markers.discard(tuple(params))
+            return []
+        if stmt.startswith("SELECT votes"):
+            return [SimpleNamespace(votes=self.counts[params])] if params in self.counts else []
+        raise AssertionError(stmt)
+
+
+@pytest.fixture
+def session(monkeypatch):
+    fake = FakeSession()
+
+    async def aexecute(session, stmt, params):
+        return session.run(stmt, params)
+
+    async def afirst(session, stmt, params):
+        rows = session.run(stmt, params)
+        return rows[0] if rows else None
+
+    monkeypatch.setattr(votes, "aexecute", aexecute)
+    monkeypatch.setattr(votes, "afirst", afirst)
+    return fake
+
+
+def test_vote_counts_each_user_once(session):
+    counter = VoteCounter(session)
+    event_id = uuid4()
+    assert asyncio.run(counter.vote("rtd", event_id, "u1")) == 1
+    assert asyncio.run(counter.vote("rtd", event_id, "u2")) == 2
+    assert asyncio.run(counter.vote("rtd", event_id, "u1")) is None
+    assert asyncio.run(counter.count("rtd", event_id)) == 2
+    assert asyncio.run(counter.count("report", event_id)) == 0
+
+
+def test_failed_increment_removes_the_marker(session):
+    counter = VoteCounter(session)
+    event_id = uuid4()
+    session.fail_increment = True
+    with pytest.raises(RuntimeError):
+        asyncio.run(counter.vote("report", event_id, "u1"))
+    assert session.markers == set()
+    assert session.executed[-1].startswith("DELETE FROM event_votes")
+
+    # 표시 행이 지워졌으므로 같은 사용자가 다시 투표할 수 있음
+    session.fail_increment = False
+    assert asyncio.run(counter.vote("report", event_id, "u1")) == 1
+
+
+def test_hide_threshold():
+    assert is_hidden(votes.VOTE_HIDE_THRESHOLD) is True
+    assert is_hidden(votes.VOTE_HIDE_THRESHOLD - 1) is False
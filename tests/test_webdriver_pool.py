@@ -0,0 +1,65 @@
+import pytest
+
+pytest.importorskip("selenium")
+
+from webdriver_pool import WebDriverPool
+
+
+class FakeDriver:
+    def __init__(self, healthy: bool = True):
+        self.healthy = healthy
+        self.quit_called = False
+
+    def execute_script(self, script):
+        if not self.healthy:
+            raise RuntimeError("no response")
+        return 1
+
+    def quit(self):
+        self.quit_called = True
+
+
+def test_failed_creation_returns_slot():
+    calls = []
+
+    def factory():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("chromedriver 시작 실패")
+        return FakeDriver()
+
+    pool = WebDriverPool(factory, size=1, acquire_timeout=0.1)
+    with pytest.raises(RuntimeError):
+        with pool.acquire():
+            pass
+    assert pool.stats()["created"] == 0
+    with pool.acquire() as driver:
+        assert isinstance(driver, FakeDriver)
+
+
+def test_failed_replacement_returns_slot():
+    drivers = [FakeDriver()]
+
+    def factory():
+        if drivers:
+            return drivers.pop()
+        raise RuntimeError("chromedriver 시작 실패")
+
+    pool = WebDriverPool(factory, size=1, acquire_timeout=0.1)
+    with pool.acquire() as driver:
+        first = driver
+    first.healthy = False
+    with pytest.raises(RuntimeError):
+        with pool.acquire():
+            pass
+    assert first.quit_called
+    assert pool.stats()["created"] == 0
+
+
+def test_acquire_times_out_when_pool_is_busy():
+    pool = WebDriverPool(FakeDriver, size=1, acquire_timeout=0.1)
+    with pool.acquire():
+        with pytest.raises(TimeoutError):
+            with pool.acquire():
+                pass
+    assert pool.stats() == {"size": 1, "created": 1, "idle": 1}
@@ -0,0 +1,157 @@
+# time_buckets.py
+
+"""
+일(day) 단위 버킷 조회 테이블.
+
+rtd_by_code_time / user_report_by_time 에 대한 시간 범위 조회(ALLOW FILTERING)는 클러스터 전체를 스캔합니다.
+아래 테이블은 UTC 날짜를 파티션 키로 두어, 시간 범위 조회가 범위 안의 날짜 파티션만 읽도록 합니다.
+
+  rtd_by_day         : PRIMARY KEY ((day), rtd_time, id)        -- rtd_time DESC
+  user_report_by_day : PRIMARY KEY ((day), report_at, report_id) -- report_at DESC
+
+쓰기는 원본 테이블(rtd_db / user_report)과 함께 이중 기록(dual-write)하고, 투표 상태(visible 등)도
+투표 시 함께 갱신하므로 버킷 행만으로 응답을 만들 수 있습니다. (visible 이 null 이면 보이는 상태)
+기존 데이터는 `python backfill_indexes.py buckets` 로 채웁니다.
+"""
+import os
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+
+from cassandra_aio import aexecute_all
+
+BUCKET_FANOUT = int(os.getenv("BUCKET_FANOUT", "8"))  # 동시에 조회할 날짜 파티션 수
+BUCKET_FETCH_SIZE = int(os.getenv("BUCKET_FETCH_SIZE", "500"))
+
+SCHEMA_CQL = [
+    """
+    CREATE TABLE IF NOT EXISTS rtd_by_day (
+        day date,
+        rtd_time timestamp,
+        id uuid,
+        rtd_code int,
+        rtd_loc text,
+        rtd_details list<text>,
+        regioncode bigint,
+        latitude double,
+        longitude double,
+        visible boolean,
+        vote_count int,
+        PRIMARY KEY ((day), rtd_time, id)
+    ) WITH CLUSTERING ORDER BY (rtd_time DESC, id ASC)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS user_report_by_day (
+        day date,
+        report_at timestamp,
+        report_id uuid,
+        report_by_id text,
+        middle_type text,
+        small_type text,
+        report_location text,
+        report_content text,
+        report_lat double,
+        report_lot double,
+        visible boolean,
+        delete_vote int,
+        PRIMARY KEY ((day), report_at, report_id)
+    ) WITH CLUSTERING ORDER BY (report_at DESC, report_id ASC)
+    """,
+]
+
+RTD_BY_DAY_INSERT_CQL = """
+    INSERT INTO rtd_by_day (
+      day, rtd_time, id, rtd_code, rtd_loc, rtd_details,
+      regioncode, latitude, longitude
+    ) VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s)
+    """
+
+REPORT_BY_DAY_INSERT_CQL = """
+    INSERT INTO user_report_by_day (
+      day, report_at, report_id, report_by_id, middle_type, small_type,
+      report_location, report_content, report_lat, report_lot, visible, delete_vote
+    ) VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
+    """
+
+
+def ensure_schema(session):
+    """버킷 테이블이 없으면 생성합니다. (IF NOT EXISTS 이므로 여러 번 호출해도 안전)"""
+    for cql in SCHEMA_CQL:
+        session.execute(cql)
+
+
+def day_of(ts: datetime) -> date:
+    """타임스탬프가 속한 UTC 날짜 버킷. (naive datetime 은 드라이버와 같이 UTC 로 간주)"""
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc)
+    return ts.date()
+
+
+def days_between(start: datetime, end: datetime, descending: bool = False) -> list:
+    """start ~ end 구간에 걸친 날짜 버킷 목록"""
+    first, last = day_of(start), day_of(end)
+    days = [first + timedelta(days=i) for i in range((last - first).days + 1)]
+    return days[::-1] if descending else days
+
+
+def rtd_by_day_params(rtd_code, rtd_time, rec_id, rtd_loc, rtd_details,
+                      regioncode=None, latitude=None, longitude=None) -> tuple:
+    """rtd_db INSERT 파라미터 순서 그대로 받아 rtd_by_day INSERT 파라미터로 변환"""
+    return (day_of(rtd_time), rtd_time, rec_id, rtd_code, rtd_loc, rtd_details,
+            regioncode, latitude, longitude)
+
+
+class BucketQueries:
+    """날짜 버킷 테이블 조회. 범위 안의 날짜 파티션에만 BUCKET_FANOUT 개씩 동시에 질의합니다."""
+
+    def __init__(self, session, fanout: int = BUCKET_FANOUT):
+        self.session = session
+        self.fanout = max(fanout, 1)
+        self._stmts = {}
+        for table, ts_col in (("rtd_by_day", "rtd_time"), ("user_report_by_day", "report_at")):
+            for order in ("DESC", "ASC"):
+                stmt = session.prepare(
+                    f"SELECT * FROM {table} WHERE day = ? AND {ts_col} >= ? AND {ts_col} <= ? "
+                    f"ORDER BY {ts_col} {order}"
+                )
+                stmt.fetch_size = BUCKET_FETCH_SIZE
+                self._stmts[(table, order == "DESC")] = stmt
+
+    def _scan(self, table: str, start: datetime, end: datetime, descending: bool):
+        stmt = self._stmts[(table, descending)]
+        days = days_between(start, end, descending)
+        # 다음 몇 개 파티션은 미리 비동기로 요청해 두고, 시간 순서대로 소비
+        pending = [self.session.execute_async(stmt, (d, start, end)) for d in days[:self.fanout]]
+        next_day = len(pending)
+        while pending:
+            rows = pending.pop(0).result()
+            if next_day < len(days):
+                pending.append(self.session.execute_async(stmt, (days[next_day], start, end)))
+                next_day += 1
+            yield from rows
+
+    def rtd_rows(self, start: datetime, end: datetime, descending: bool = True):
+        """start ~ end 의 RTD 행을 시간 순서대로 돌려줍니다."""
+        return self._scan("rtd_by_day", start, end, descending)
+
+    def report_rows(self, start: datetime, end: datetime, descending: bool = True):
+        """start ~ end 의 사용자 제보 행을 시간 순서대로 돌려줍니다."""
+        return self._scan("user_report_by_day", start, end, descending)
+
+    async def _scan_async(self, table: str, start: datetime, end: datetime, descending: bool) -> list:
+        stmt = self._stmts[(table, descending)]
+        limiter = asyncio.Semaphore(self.fanout)
+
+        async def read_day(day):
+            async with limiter:
+                return await aexecute_all(self.session, stmt, (day, start, end))
+
+        pages = await asyncio.gather(*(read_day(d) for d in days_between(start, end, descending)))
+        return [row for rows in pages for row in rows]
+
+    async def rtd_rows_async(self, start: datetime, end: datetime, descending: bool = True) -> list:
+        """rtd_rows 의 asyncio 버전 (이벤트 루프를 막지 않음)"""
+        return await self._scan_async("rtd_by_day", start, end, descending)
+
+    async def report_rows_async(self, start: datetime, end: datetime, descending: bool = True) -> list:
+        """report_rows 의 asyncio 버전 (이벤트 루프를 막지 않음)"""
+        return await self._scan_async("user_report_by_day", start, end, descending)
@@ -0,0 +1,84 @@
+# votes.py
+
+"""
+RTD / 사용자 제보 투표 집계.
+
+기존에는 vote_user_ids 리스트 전체를 읽어 Python 에서 추가한 뒤 다시 쓰는 방식이라
+동시에 투표하면 서로의 갱신을 덮어쓰고, 투표 한 번의 비용이 투표자 수에 비례했습니다.
+
+  - event_votes: 투표자마다 한 행 (INSERT IF NOT EXISTS). 같은 사용자의 두 번째 투표는 적용되지 않으므로 중복 투표가 막힙니다.
+  - event_vote_counts: counter 컬럼으로 원자적 증가. 투표 수는 이 값만 읽으면 되므로 투표자 수와 무관하게 일정한 비용입니다.
+  - 표시 행 기록 후 증가가 실패하면 표시 행을 지우고 예외를 올립니다. (투표가 기록되지 않은 채 재투표가 막히지 않도록)
+
+원본/조회 테이블의 vote_count / delete_vote 는 응답 조회용 비정규화 값입니다. (집계 기준은 event_vote_counts)
+동시에 투표해도 작은 값이 나중에 기록되지 않도록 조건부 UPDATE(IF 값 < 새 값)로 더 큰 값만 씁니다.
+투표 수는 줄지 않으므로, 기준(VOTE_HIDE_THRESHOLD)을 넘겼을 때만 visible = false 를 기록하고 true 로 되돌리지 않습니다.
+"""
+import os
+from datetime import datetime, timezone
+
+from cassandra_aio import aexecute, afirst
+
+VOTE_HIDE_THRESHOLD = int(os.getenv("VOTE_HIDE_THRESHOLD", "10"))  # 이 표 수 이상이면 숨김
+
+SCHEMA_CQL = [
+    """
+    CREATE TABLE IF NOT EXISTS event_votes (
+        kind text,
+        event_id uuid,
+        user_id text,
+        voted_at timestamp,
+        PRIMARY KEY ((kind, event_id), user_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS event_vote_counts (
+        kind text,
+        event_id uuid,
+        votes counter,
+        PRIMARY KEY ((kind, event_id))
+    )
+    """,
+]
+
+VOTE_MARKER_CQL = "INSERT INTO event_votes (kind, event_id, user_id, voted_at) VALUES (?, ?, ?, ?) IF NOT EXISTS"
+VOTE_INCREMENT_CQL = "UPDATE event_vote_counts SET votes = votes + 1 WHERE kind = ? AND event_id = ?"
+
+
+def ensure_vote_schema(session):
+    for cql in SCHEMA_CQL:
+        session.execute(cql)
+
+
+def is_hidden(vote_count: int) -> bool:
+    return vote_count >= VOTE_HIDE_THRESHOLD
+
+
+class VoteCounter:
+    def __init__(self, session):
+        self.session = session
+        self.marker_stmt = session.prepare(VOTE_MARKER_CQL)
+        self.increment_stmt = session.prepare(VOTE_INCREMENT_CQL)
+        self.unmark_stmt = session.prepare("DELETE FROM event_votes WHERE kind = ? AND event_id = ? AND user_id = ?")
+        self.count_stmt = session.prepare("SELECT votes FROM event_vote_counts WHERE kind = ? AND event_id = ?")
+
+    async def vote(self, kind: str, event_id, user_id: str):
+        """
+        user_id 의 투표를 한 번만 반영하고 반영 후 투표 수를 반환합니다. 이미 투표했으면 None.
+        kind: "rtd" | "report"
+        """
+        marker = await afirst(self.session, self.marker_stmt,
+                              (kind, event_id, user_id, datetime.now(timezone.utc)))
+        if marker is None or not marker.applied:
+            return None
+        try:
+            await aexecute(self.session, self.increment_stmt, (kind, event_id))
+        except Exception:
+            # 표시 행만 남으면 집계되지 않은 투표가 중복 투표로 막히므로 되돌림
+            await aexecute(self.session, self.unmark_stmt, (kind, event_id, user_id))
+            raise
+        return await self.count(kind, event_id)
+
+    async def count(self, kind: str, event_id) -> int:
+        row = await afirst(self.session, self.count_stmt, (kind, event_id))
+        return row.votes if row is not None and row.votes is not None else 0
@@ -0,0 +1,231 @@
+# webdriver_pool.py
+
+"""
+headless Chrome WebDriver 를 여러 작업이 나눠 쓰기 위한 작은 풀입니다.
+
+- 최대 size 개까지 필요할 때만 드라이버를 만듭니다.
+- 빌려줄 때마다 간단한 스크립트 실행으로 상태를 확인하고, 응답이 없으면 새로 만듭니다.
+- 한 드라이버가 max_pages 페이지를 처리하면 종료 후 새로 만들어 메모리 누수를 막습니다.
+- 드라이버 생성이 실패하면 자리를 반납하고, 빈 드라이버를 acquire_timeout 초까지만 기다립니다. (넘으면 TimeoutError)
+
+재난문자 목록을 드라이버로 읽는 추출 함수(HTTP 수집 실패 시 대체 경로)도 여기에 둡니다.
+
+사용 예:
+    with pool.acquire() as driver:
+        driver.get(url)
+"""
+import re
+import json
+import time
+import queue
+import logging
+import threading
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from safekorea_client import SAFEKOREA_LIST_URL, parse_messages_json
+
+
+def create_chrome_driver(driver_path: str = '/usr/local/bin/chromedriver'):
+    """재난문자 수집용 headless Chrome 드라이버를 만듭니다."""
+    chrome_options = Options()
+    chrome_options.add_argument('--headless')
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
+    driver.set_page_load_timeout(30)
+    return driver
+
+
+class WebDriverPool:
+    # 대기 중에도 주기적으로 깨어나 생성 실패 등으로 비게 된 자리를 다시 확인합니다.
+    WAIT_POLL_SEC = 1.0
+
+    def __init__(self, factory, size: int = 1, max_pages: int = 50, acquire_timeout: float = 60):
+        """
+        factory: 새 WebDriver 를 만들어 반환하는 함수
+        size: 동시에 유지할 최대 드라이버 수
+        max_pages: 드라이버 하나가 처리할 최대 페이지 수 (넘으면 재생성)
+        acquire_timeout: 모든 드라이버가 사용 중일 때 기다리는 최대 시간(초)
+        """
+        self.factory = factory
+        self.size = max(size, 1)
+        self.max_pages = max(max_pages, 1)
+        self.acquire_timeout = acquire_timeout
+        self._idle = queue.Queue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _new_entry(self) -> dict:
+        driver = self.factory()
+        logging.info("WebDriver 생성")
+        return {"driver": driver, "pages": 0}
+
+    @staticmethod
+    def _quit(entry: dict):
+        try:
+            entry["driver"].quit()
+        except Exception as e:
+            logging.warning(f"WebDriver 종료 오류: {e}")
+
+    @staticmethod
+    def _is_healthy(entry: dict) -> bool:
+        try:
+            return entry["driver"].execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def _create_in_slot(self) -> dict:
+        """이미 확보한 자리(_created)에 드라이버를 만듭니다. 실패하면 자리를 반납합니다."""
+        try:
+            return self._new_entry()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    def _take(self) -> dict:
+        deadline = time.monotonic() + self.acquire_timeout
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            with self._lock:
+                if self._created < self.size:
+                    self._created += 1
+                    create = True
+                else:
+                    create = False
+            if create:
+                return self._create_in_slot()
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"{self.acquire_timeout}초 동안 사용 가능한 WebDriver 가 없습니다.")
+            try:
+                return self._idle.get(timeout=min(remaining, self.WAIT_POLL_SEC))
+            except queue.Empty:
+                continue
+
+    @contextmanager
+    def acquire(self):
+        if self._closed:
+            raise RuntimeError("WebDriverPool 이 종료되었습니다.")
+
+        entry = self._take()
+        if entry["pages"] > 0 and not self._is_healthy(entry):
+            logging.warning("응답 없는 WebDriver 교체")
+            self._quit(entry)
+            entry = self._create_in_slot()
+
+        broken = False
+        try:
+            yield entry["driver"]
+        except Exception:
+            broken = not self._is_healthy(entry)
+            raise
+        finally:
+            entry["pages"] += 1
+            if broken or entry["pages"] >= self.max_pages or self._closed:
+                logging.info(f"WebDriver 재생성 (처리 페이지 {entry['pages']}개)")
+                self._quit(entry)
+                with self._lock:
+                    self._created -= 1
+            else:
+                self._idle.put(entry)
+
+    def stats(self) -> dict:
+        return {"size": self.size, "created": self._created, "idle": self._idle.qsize()}
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                entry = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._quit(entry)
+            with self._lock:
+                self._created -= 1
+
+
+# ---------------------------------------------------------------------------
+# 재난문자 목록 추출 (HTTP 수집 실패 시 대체 경로)
+# ---------------------------------------------------------------------------
+ROWS_READY_SELECTOR = "table.boardList_table tbody tr[id$='_apiData1']"
+
+# 목록 테이블 전체를 브라우저 안에서 한 번에 읽어 JSON 배열 문자열로 돌려주는 스크립트.
+# 필드명은 DisasterSmsList.do JSON 과 같게 맞춰 parse_messages_json 으로 그대로 변환합니다.
+EXTRACT_ROWS_SCRIPT = """
+var rows = document.querySelectorAll("table.boardList_table tbody tr");
+var out = [];
+for (var i = 0; i < rows.length; i++) {
+    var m = /^disasterSms_tr_(\\d+)_apiData1$/.exec(rows[i].id || "");
+    if (!m) continue;
+    var prefix = "disasterSms_tr_" + m[1] + "_";
+    var text = function (field) {
+        var el = document.getElementById(prefix + field);
+        return el ? el.innerText.trim() : null;
+    };
+    var cn = document.getElementById(prefix + "MSG_CN");
+    out.push({
+        MD101_SN: text("MD101_SN"),
+        EMRGNCY_STEP_NM: text("EMRGNCY_STEP_NM"),
+        DSSTR_SE_NM: text("DSSTR_SE_NM"),
+        MSG_LOC: text("MSG_LOC"),
+        CREATE_DT: text("CREATE_DT"),
+        MSG_CN: cn ? (cn.getAttribute("title") || "").trim() : null
+    });
+}
+return JSON.stringify(out);
+"""
+
+
+def extract_rows_script(driver, timeout: float = 20) -> list:
+    """
+    목록 행이 나타날 때까지 명시적으로 기다린 뒤 execute_script 한 번으로 테이블 전체를 읽습니다.
+    WebDriver 왕복 횟수가 행 수와 무관하게 일정합니다.
+    """
+    driver.get(SAFEKOREA_LIST_URL)
+    WebDriverWait(driver, timeout).until(
+        EC.presence_of_element_located((By.CSS_SELECTOR, ROWS_READY_SELECTOR))
+    )
+    items = json.loads(driver.execute_script(EXTRACT_ROWS_SCRIPT))
+    return parse_messages_json({"disasterSmsList": items})
+
+
+def extract_rows_legacy(driver) -> list:
+    """고정 대기 후 행마다 find_element 를 여섯 번 호출하는 기존 추출 방식 (비교/호환용)"""
+    driver.get(SAFEKOREA_LIST_URL)
+    time.sleep(5)
+
+    fetched = []
+    rows = driver.find_elements(By.CSS_SELECTOR, "table.boardList_table tbody tr")
+    for row in rows:
+        row_id = row.get_attribute('id')
+        try:
+            idx = re.search(r'disasterSms_tr_(\d+)_apiData1', row_id).group(1)
+        except:
+            continue
+
+        try:
+            fetched.append({
+                "message_id": int(row.find_element(By.ID, f"disasterSms_tr_{idx}_MD101_SN").text.strip()),
+                "emergency_level": row.find_element(By.ID, f"disasterSms_tr_{idx}_EMRGNCY_STEP_NM").text.strip(),
+                "ntype": row.find_element(By.ID, f"disasterSms_tr_{idx}_DSSTR_SE_NM").text.strip(),
+                "location": row.find_element(By.ID, f"disasterSms_tr_{idx}_MSG_LOC").text.strip(),
+                "issued_at": row.find_element(By.ID, f"disasterSms_tr_{idx}_CREATE_DT").text.strip(),
+                "content": row.find_element(By.ID, f"disasterSms_tr_{idx}_MSG_CN").get_attribute("title").strip(),
+            })
+        except Exception as e:
+            logging.error(f"필드 추출 오류 (row {row_id}): {e}")
+            continue
+    return fetched